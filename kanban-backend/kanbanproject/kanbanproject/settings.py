@@ -41,10 +41,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework'
 ]
 
 MIDDLEWARE = [
+    'tasks.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,6 +92,37 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Cache used for serialized board and task documents, and how long they live.
+TASKS_CACHE_ALIAS = 'default'
+TASKS_CACHE_TIMEOUT = 300
+
+# Board change events: tasks.events.InProcessBroker reaches subscribers of
+# the same process, tasks.events.PostgresBroker those of every process.
+TASKS_EVENTS_BACKEND = env('TASKS_EVENTS_BACKEND', default='tasks.events.InProcessBroker')
+
+# orjson-backed JSON, byte for byte the same as DRF's JSONRenderer output.
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'tasks.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'tasks.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
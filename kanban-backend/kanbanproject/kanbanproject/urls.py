@@ -17,7 +17,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from tasks.metrics import metrics
+
 urlpatterns = [
     path("tasks/", include("tasks.urls")),
+    path("metrics", metrics, name="metrics"),
     path('admin/', admin.site.urls),
 ]
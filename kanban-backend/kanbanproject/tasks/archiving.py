@@ -0,0 +1,137 @@
+"""
+Archiving finished tasks.
+
+Tasks whose subtasks are all done, and that weren't modified for
+ARCHIVE_AGE, are moved with their subtasks out of the live tables into
+ArchivedTask and ArchivedSubtask by the `archive_tasks` command, so the
+board endpoints and the indexes they scan only hold live tasks. Archived
+tasks keep their ids; they have read endpoints of their own and can be
+restored, which moves them back to the end of their column.
+
+Rows move with one DELETE ... RETURNING feeding an INSERT per table, the
+subtasks first, as deleting a task cascades to its subtasks. The triggers
+of the live tables record the tombstones and column task counts as they
+do for any delete or insert.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Max, Min
+from django.utils import timezone
+
+from .cache import board_cache, task_cache
+from .events import publish
+from .models import ArchivedSubtask, ArchivedTask, Board, Subtask, Task
+from .ranking import append_rank
+
+# Finished tasks are archived once unmodified for this long.
+ARCHIVE_AGE = timedelta(days=getattr(settings, 'TASKS_ARCHIVE_AFTER_DAYS', 90))
+# Range of task ids archived per transaction, along with their subtasks.
+ARCHIVE_BATCH_SIZE = getattr(settings, 'TASKS_ARCHIVE_BATCH_SIZE', 1_000)
+
+TASK_COLUMNS = 'id, title, description, column_id, total_subtasks, completed_subtasks, subtask_titles, created_at'
+SUBTASK_COLUMNS = 'id, title, task_id, status, created_at, last_modified'
+
+ARCHIVE_SUBTASKS_SQL = f"""
+WITH moved AS (
+    DELETE FROM {Subtask._meta.db_table} WHERE task_id = ANY(%(ids)s)
+    RETURNING {SUBTASK_COLUMNS}
+)
+INSERT INTO {ArchivedSubtask._meta.db_table} ({SUBTASK_COLUMNS})
+SELECT {SUBTASK_COLUMNS} FROM moved
+"""
+
+ARCHIVE_TASKS_SQL = f"""
+WITH moved AS (
+    DELETE FROM {Task._meta.db_table} WHERE id = ANY(%(ids)s)
+    RETURNING {TASK_COLUMNS}, last_modified
+)
+INSERT INTO {ArchivedTask._meta.db_table} ({TASK_COLUMNS}, last_modified, archived_at)
+SELECT {TASK_COLUMNS}, last_modified, %(now)s FROM moved
+"""
+
+RESTORE_SUBTASKS_SQL = f"""
+WITH moved AS (
+    DELETE FROM {ArchivedSubtask._meta.db_table} WHERE task_id = %(id)s
+    RETURNING {SUBTASK_COLUMNS}
+)
+INSERT INTO {Subtask._meta.db_table} ({SUBTASK_COLUMNS})
+SELECT {SUBTASK_COLUMNS} FROM moved
+"""
+
+# Restored tasks count as modified, so clients syncing changes get them.
+RESTORE_TASK_SQL = f"""
+WITH moved AS (
+    DELETE FROM {ArchivedTask._meta.db_table} WHERE id = %(id)s
+    RETURNING {TASK_COLUMNS}
+)
+INSERT INTO {Task._meta.db_table} ({TASK_COLUMNS}, rank, last_modified)
+SELECT {TASK_COLUMNS}, %(rank)s, %(now)s FROM moved
+"""
+
+
+def archivable_tasks(cutoff):
+    """Live tasks with all of their subtasks done, unmodified since `cutoff`."""
+    return Task.objects.filter(
+        total_subtasks__gt=0, completed_subtasks=F('total_subtasks'), last_modified__lt=cutoff
+    )
+
+
+def archive(tasks: list[tuple[int, int]]):
+    """Move live tasks, given as (id, board id) pairs, with their subtasks into the archive tables."""
+    task_ids = [task_id for task_id, _ in tasks]
+    archived = {}
+    for task_id, board_id in tasks:
+        archived.setdefault(board_id, []).append(task_id)
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(ARCHIVE_SUBTASKS_SQL, {'ids': task_ids})
+            cursor.execute(ARCHIVE_TASKS_SQL, {'ids': task_ids, 'now': timezone.now()})
+        Board.objects.filter(pk__in=archived).touch()
+        for board_id, board_task_ids in archived.items():
+            publish(board_id, 'tasks.archived', tasks=board_task_ids)
+    board_cache.invalidate(*archived)
+    task_cache.invalidate(*task_ids)
+
+
+def archive_batch(cutoff, after: int, last: int) -> list[int]:
+    """
+    Archive the archivable tasks with ids in (`after`, `last`], in one
+    transaction. Tasks locked by a write are left for the next run.
+    Returns the ids of the archived tasks.
+    """
+    with transaction.atomic():
+        tasks = list(
+            archivable_tasks(cutoff).filter(pk__gt=after, pk__lte=last)
+            .select_for_update(of=('self',), skip_locked=True)
+            .order_by('id').values_list('id', 'column__board_id')
+        )
+        if tasks:
+            archive(tasks)
+    return [task_id for task_id, _ in tasks]
+
+
+def archive_tasks(age: timedelta = ARCHIVE_AGE, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Archive every archivable task, batch by batch. Returns how many were archived."""
+    cutoff = timezone.now() - age
+    ids = Task.all_objects.aggregate(first=Min('id'), last=Max('id'))
+    if ids['last'] is None:
+        return 0
+    total = 0
+    # Batches cover fixed ranges of ids rather than a number of matches,
+    # so each is a bounded primary key scan however few tasks qualify.
+    for after in range(ids['first'] - 1, ids['last'], batch_size):
+        total += len(archive_batch(cutoff, after, after + batch_size))
+    return total
+
+
+def restore_task(task: ArchivedTask) -> bool:
+    """
+    Move an archived task and its subtasks back to the end of its column.
+    Returns False if it was restored in the meantime.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(RESTORE_SUBTASKS_SQL, {'id': task.id})
+        cursor.execute(RESTORE_TASK_SQL, {'id': task.id, 'rank': append_rank(task.column_id), 'now': timezone.now()})
+        return cursor.rowcount == 1
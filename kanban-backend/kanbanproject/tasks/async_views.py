@@ -0,0 +1,155 @@
+"""
+Async versions of the read endpoints, served under /tasks/async/. Under
+ASGI they wait on the database from the event loop instead of holding a
+worker thread, and answer with the same documents, validators and cache
+entries as their DRF counterparts' JSON format.
+
+Also the board event feed, which must be served through ASGI.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from .cache import board_cache, task_cache
+from .events import HEARTBEAT_INTERVAL, encode_event, get_broker
+from .fieldsets import fields_key, fields_variant, loaded_fields, prefetch_documents, requested_fields, sparse_queryset
+from .models import Board, Task
+from .pagination import KeysetPagination, estimated_count
+from .renderers import FastJSONRenderer
+from .serializers import BoardSerializer, BoardProgressSerializer, TaskSerializer
+from .snapshots import board_snapshot
+from .views import task_version
+from .constants import BOARD_NOT_FOUND, TASK_NOT_FOUND
+
+
+def json_response(data, status_code: int = status.HTTP_200_OK):
+    # Rendered by the same renderer as the DRF views, so the bytes match.
+    return HttpResponse(FastJSONRenderer().render(data), status=status_code, content_type='application/json')
+
+def error_response(error: APIException):
+    # The body DRF's exception handler gives the same error.
+    data = error.detail if isinstance(error.detail, (list, dict)) else {'detail': error.detail}
+    return json_response(data, error.status_code)
+
+async def conditional_get(request, etag: str, last_modified, get_response):
+    """See views.conditional_get; `get_response` is a coroutine function."""
+    timestamp = int(last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp) or await get_response()
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(timestamp)
+    return response
+
+@require_GET
+async def boards(request):
+    paginator = KeysetPagination()
+    try:
+        fields = requested_fields(request.GET, BoardSerializer) or dict.fromkeys(('id', 'name'))
+        queryset = sparse_queryset(Board.objects.all(), BoardSerializer, fields, required=('last_modified',))
+        page = paginator.get_page_queryset(queryset, Request(request))
+    except APIException as error:
+        return error_response(error)
+    if paginator.count_requested:
+        paginator.count = await sync_to_async(estimated_count)(Board)
+
+    boards = paginator.set_page([board async for board in page])
+    await sync_to_async(prefetch_documents)(boards, BoardSerializer, fields)
+    serializer = BoardSerializer(boards, many=True, fields=fields)
+    return json_response(paginator.get_paginated_data(serializer.data))
+
+@require_GET
+async def board_detail(request, id: int):
+    try:
+        board = await Board.objects.aget(pk=id)
+    except Board.DoesNotExist:
+        return json_response({'error': BOARD_NOT_FOUND}, status.HTTP_404_NOT_FOUND)
+
+    summary = request.GET.get('view') == 'summary'
+    try:
+        fields = requested_fields(request.GET, BoardProgressSerializer if summary else BoardSerializer)
+    except APIException as error:
+        return error_response(error)
+
+    if summary:
+        variant, get_response = fields_variant('summary-json', fields), lambda: get_board_summary(board, fields)
+    elif fields is None and request.GET.get('snapshot') in ('1', 'true'):
+        variant, get_response = 'snapshot', lambda: get_board_snapshot(board.id)
+    else:
+        variant, get_response = fields_variant('json', fields), lambda: get_board(board, fields)
+    etag = quote_etag(f'board-{board.id}-{board.version}-{variant}')
+    return await conditional_get(request, etag, board.last_modified, get_response)
+
+async def get_board(board: Board, fields: dict | None = None):
+    async def serialize():
+        await sync_to_async(prefetch_documents)([board], BoardSerializer, fields)
+        return BoardSerializer(board, fields=fields).data
+
+    variant = '' if fields is None else fields_key(fields)
+    return json_response(await board_cache.aget_or_set(board.id, board.version, serialize, variant))
+
+async def get_board_summary(board: Board, fields: dict | None = None):
+    await sync_to_async(prefetch_documents)([board], BoardProgressSerializer, fields)
+    return json_response(BoardProgressSerializer(board, fields=fields).data)
+
+async def get_board_snapshot(id: int):
+    snapshot = await sync_to_async(board_snapshot)(id)
+    if snapshot is None:
+        return json_response({'error': BOARD_NOT_FOUND}, status.HTTP_404_NOT_FOUND)
+    return HttpResponse(snapshot, content_type='application/json')
+
+@require_GET
+async def task_detail(request, id: int):
+    try:
+        fields = requested_fields(request.GET, TaskSerializer)
+    except APIException as error:
+        return error_response(error)
+    try:
+        task = await Task.objects.only(*loaded_fields(TaskSerializer, fields), 'last_modified').aget(pk=id)
+    except Task.DoesNotExist:
+        return json_response({'error': TASK_NOT_FOUND}, status.HTTP_404_NOT_FOUND)
+
+    etag = quote_etag(f"task-{task.id}-{task_version(task)}-{fields_variant('json', fields)}")
+    return await conditional_get(request, etag, task.last_modified, lambda: get_task(task, fields))
+
+async def get_task(task: Task, fields: dict | None = None):
+    async def serialize():
+        await sync_to_async(prefetch_documents)([task], TaskSerializer, fields)
+        return TaskSerializer(task, fields=fields).data
+
+    variant = '' if fields is None else fields_key(fields)
+    return json_response(await task_cache.aget_or_set(task.id, task_version(task), serialize, variant))
+
+@require_GET
+async def board_events(request, id: int):
+    if not await Board.objects.filter(pk=id).aexists():
+        return json_response({'error': BOARD_NOT_FOUND}, status.HTTP_404_NOT_FOUND)
+
+    response = StreamingHttpResponse(board_event_stream(id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep proxies from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+async def board_event_stream(board_id: int):
+    broker = get_broker()
+    subscription = broker.subscribe(board_id)
+    try:
+        # Tells the client the subscription is in place.
+        yield ': subscribed\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_INTERVAL)
+            except TimeoutError:
+                yield ': heartbeat\n\n'
+                continue
+            yield encode_event(event)
+            if event['type'] == 'board.deleted':
+                return
+    finally:
+        broker.unsubscribe(subscription)
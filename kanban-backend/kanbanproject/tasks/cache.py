@@ -0,0 +1,84 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+CACHE_ALIAS = getattr(settings, 'TASKS_CACHE_ALIAS', 'default')
+CACHE_TIMEOUT = getattr(settings, 'TASKS_CACHE_TIMEOUT', 300)
+
+
+class DocumentCache:
+    """
+    Read-through cache of serialized documents. Entries are stored per id
+    together with the version they were built from; a lookup with any
+    other version is a miss, so a missed invalidation can never serve a
+    stale document.
+
+    A document can have variants, such as sparse fieldsets, cached under
+    their own keys. Only the full document is invalidated, the variants
+    are superseded by their version or expire.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @property
+    def cache(self):
+        return caches[CACHE_ALIAS]
+
+    def key(self, id: int, variant: str = '') -> str:
+        key = f'tasks:{self.prefix}:{id}'
+        return f'{key}:{variant}' if variant else key
+
+    def count(self, counter: str):
+        with self.lock:
+            self.counters[counter] += 1
+
+    def get_or_set(self, id: int, version, build, variant: str = ''):
+        """Return the document for `id` at `version`, building and storing it on a miss."""
+        entry = self.cache.get(self.key(id, variant))
+        if entry is not None and entry[0] == version:
+            self.count('hits')
+            return entry[1]
+
+        self.count('misses')
+        if entry is not None:
+            # Superseded by a newer version.
+            self.count('evictions')
+        document = build()
+        self.cache.set(self.key(id, variant), (version, document), CACHE_TIMEOUT)
+        return document
+
+    async def aget_or_set(self, id: int, version, abuild, variant: str = ''):
+        """Like get_or_set, with a coroutine function building the document."""
+        entry = await self.cache.aget(self.key(id, variant))
+        if entry is not None and entry[0] == version:
+            self.count('hits')
+            return entry[1]
+
+        self.count('misses')
+        if entry is not None:
+            self.count('evictions')
+        document = await abuild()
+        await self.cache.aset(self.key(id, variant), (version, document), CACHE_TIMEOUT)
+        return document
+
+    def invalidate(self, *ids: int):
+        for id in ids:
+            if self.cache.delete(self.key(id)):
+                self.count('evictions')
+
+    def stats(self) -> dict:
+        with self.lock:
+            return dict(self.counters)
+
+    def reset_stats(self):
+        with self.lock:
+            for counter in self.counters:
+                self.counters[counter] = 0
+
+
+board_cache = DocumentCache('board')
+task_cache = DocumentCache('task')
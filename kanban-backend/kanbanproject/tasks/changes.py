@@ -0,0 +1,100 @@
+"""
+Incremental sync of a board: the rows written and the ids removed since a
+cursor. Clients apply the removals before the rows, since a task that
+left a board and came back has both a tombstone and a newer row.
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
+
+from .constants import INVALID_CURSOR, UNKNOWN_FIELD
+from .fieldsets import FIELDS_QUERY_PARAM, check_fields, parse_fields, sparse_queryset
+from .models import Board, Column, Task, Subtask, Tombstone
+from .pagination import decode_cursor, encode_cursor
+from .serializers import BoardChangeSerializer, ColumnChangeSerializer, TaskChangeSerializer, SubtaskChangeSerializer
+
+# Rows written by transactions still in flight when a cursor is handed out
+# carry earlier timestamps, so cursors point this far back.
+CHANGES_OVERLAP = timedelta(seconds=5)
+# Older cursors get the whole board, and older tombstones can be purged.
+TOMBSTONE_RETENTION = timedelta(days=getattr(settings, 'TASKS_TOMBSTONE_RETENTION_DAYS', 30))
+# The sections of the changes a `fields` parameter selects from.
+CHANGE_SERIALIZERS = {
+    'board': BoardChangeSerializer,
+    'columns': ColumnChangeSerializer,
+    'tasks': TaskChangeSerializer,
+    'subtasks': SubtaskChangeSerializer,
+}
+
+
+def encode_changes_cursor(since: datetime) -> str:
+    return encode_cursor({'t': since.isoformat()})
+
+
+def decode_changes_cursor(cursor: str) -> datetime:
+    payload = decode_cursor(cursor)
+    try:
+        since = datetime.fromisoformat(payload['t'])
+    except (TypeError, KeyError, ValueError):
+        raise NotFound(INVALID_CURSOR)
+    if since.tzinfo is None:
+        raise NotFound(INVALID_CURSOR)
+    return since
+
+
+def requested_change_fields(query_params) -> dict | None:
+    """
+    Field tree of the `fields` parameter of the changes, whose top level
+    names the sections, e.g. `tasks.id,tasks.column`. None if absent.
+    """
+    value = query_params.get(FIELDS_QUERY_PARAM)
+    if value is None:
+        return None
+    tree = parse_fields(value)
+    for name, subtree in tree.items():
+        if name not in CHANGE_SERIALIZERS:
+            raise ValidationError({FIELDS_QUERY_PARAM: [UNKNOWN_FIELD.format(name)]})
+        if subtree is not None:
+            check_fields(CHANGE_SERIALIZERS[name], subtree, f'{name}.')
+    return tree
+
+
+def changes_since(board: Board, since: datetime | None, fields: dict | None = None) -> dict:
+    """
+    The changes to a board after `since`. Without a usable `since` the
+    whole board is returned with `reset` set, and clients replace their copy.
+    With `fields`, only the selected sections and row fields are returned;
+    the cursor, `reset` and `deleted` always are.
+    """
+    now = timezone.now()
+    reset = since is None or since < now - TOMBSTONE_RETENTION
+
+    columns = Column.objects.filter(board=board)
+    tasks = Task.objects.filter(column__board=board)
+    subtasks = Subtask.objects.filter(task__column__board=board)
+    deleted = {'columns': [], 'tasks': [], 'subtasks': []}
+    if not reset:
+        columns = columns.filter(last_modified__gt=since)
+        tasks = tasks.filter(last_modified__gt=since)
+        # Subtasks of a task moved in from another board are unchanged themselves.
+        subtasks = subtasks.filter(Q(last_modified__gt=since) | Q(task__last_modified__gt=since))
+        tombstones = Tombstone.objects.filter(board_id=board.id, deleted_at__gt=since)
+        for kind, object_id in tombstones.values_list('kind', 'object_id'):
+            deleted[f'{kind}s'].append(object_id)
+
+    board_changed = reset or board.last_modified > since
+    changes = {'cursor': encode_changes_cursor(now - CHANGES_OVERLAP), 'reset': reset}
+    if fields is None or 'board' in fields:
+        board_fields = None if fields is None else fields['board']
+        changes['board'] = BoardChangeSerializer(board, fields=board_fields).data if board_changed else None
+    for section, queryset in (('columns', columns), ('tasks', tasks), ('subtasks', subtasks)):
+        if fields is None or section in fields:
+            serializer_class = CHANGE_SERIALIZERS[section]
+            section_fields = None if fields is None else fields[section]
+            rows = sparse_queryset(queryset, serializer_class, section_fields)
+            changes[section] = serializer_class(rows, many=True, fields=section_fields).data
+    changes['deleted'] = deleted
+    return changes
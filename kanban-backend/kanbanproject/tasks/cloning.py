@@ -0,0 +1,89 @@
+from django.db import connection
+
+from .models import Board, Column, Task, Subtask
+
+# Copies a board in one statement. Columns and tasks get their new ids
+# from their sequences up front, in the order of the old ids, so children
+# can be pointed at them; the maps are materialized so nextval() runs once
+# per row. Subtasks aren't referenced by anything and take default ids.
+CLONE_BOARD_SQL = f"""
+WITH new_board AS (
+    INSERT INTO {Board._meta.db_table} (name, version, created_at, last_modified)
+    SELECT COALESCE(%(name)s, b.name), 1, now(), now()
+    FROM {Board._meta.db_table} b
+    WHERE b.id = %(board_id)s AND b.deleted_at IS NULL
+    RETURNING id
+),
+column_map AS MATERIALIZED (
+    SELECT c.id AS old_id, nextval(pg_get_serial_sequence('{Column._meta.db_table}', 'id')) AS new_id
+    FROM (
+        SELECT id FROM {Column._meta.db_table}
+        -- Nothing is copied from a deleted board.
+        WHERE board_id = %(board_id)s AND EXISTS (SELECT FROM new_board)
+        ORDER BY id
+    ) c
+),
+new_columns AS (
+    INSERT INTO {Column._meta.db_table} (id, name, board_id, created_at, last_modified)
+    SELECT m.new_id, c.name, b.id, now(), now()
+    FROM column_map m
+    JOIN {Column._meta.db_table} c ON c.id = m.old_id
+    CROSS JOIN new_board b
+    RETURNING id
+),
+task_map AS MATERIALIZED (
+    SELECT t.id AS old_id, nextval(pg_get_serial_sequence('{Task._meta.db_table}', 'id')) AS new_id, t.column_id
+    FROM (
+        SELECT t.id, m.new_id AS column_id
+        FROM {Task._meta.db_table} t
+        JOIN column_map m ON m.old_id = t.column_id
+        WHERE %(include_tasks)s AND t.deleted_at IS NULL
+        ORDER BY t.id
+    ) t
+),
+new_tasks AS (
+    INSERT INTO {Task._meta.db_table} (
+        id, title, description, column_id, rank, total_subtasks, completed_subtasks, subtask_titles,
+        created_at, last_modified
+    )
+    SELECT
+        m.new_id, t.title, t.description, m.column_id, t.rank, t.total_subtasks,
+        CASE WHEN %(reset_status)s THEN 0 ELSE t.completed_subtasks END, t.subtask_titles, now(), now()
+    FROM task_map m
+    JOIN {Task._meta.db_table} t ON t.id = m.old_id
+    RETURNING id
+),
+new_subtasks AS (
+    INSERT INTO {Subtask._meta.db_table} (title, task_id, status, created_at, last_modified)
+    SELECT s.title, m.new_id, s.status AND NOT %(reset_status)s, now(), now()
+    FROM {Subtask._meta.db_table} s
+    JOIN task_map m ON m.old_id = s.task_id
+    ORDER BY s.id
+    RETURNING id
+)
+SELECT
+    (SELECT id FROM new_board),
+    (SELECT count(*) FROM new_columns),
+    (SELECT count(*) FROM new_tasks),
+    (SELECT count(*) FROM new_subtasks)
+"""
+
+
+def copy_board(board_id: int, name: str | None = None, reset_status: bool = False, include_tasks: bool = True):
+    """
+    Copy a board with its columns and, unless `include_tasks` is false, its
+    tasks and subtasks inside the database. Returns the new board's id and
+    the number of copied rows per table, or None if the board doesn't exist
+    or was deleted.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(CLONE_BOARD_SQL, {
+            'board_id': board_id,
+            'name': name,
+            'reset_status': reset_status,
+            'include_tasks': include_tasks,
+        })
+        id, columns, tasks, subtasks = cursor.fetchone()
+    if id is None:
+        return None
+    return {'id': id, 'columns': columns, 'tasks': tasks, 'subtasks': subtasks}
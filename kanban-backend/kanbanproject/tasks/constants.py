@@ -2,14 +2,36 @@ BOARD_NAME_MAX_LENGTH = 100
 BOARD_NAME_MAX_LENGTH_ERROR = 'Board name is too long.'
 BOARD_NOT_FOUND = 'Board not found.'
 BOARD_DELETED = 'Board deleted successfully.'
+INVALID_IMPORT = 'Invalid board import.'
 
 COLUMN_NAME_MAX_LENGTH = 50
 COLUMN_NAME_MAX_LENGTH_ERROR = 'Column name is too long.'
+COLUMN_NOT_FOUND = 'Column not found.'
 
 TASK_TITLE_MAX_LENGTH = 255
 TASK_TITLE_MAX_LENGTH_ERROR = 'Task name is too long.'
 TASK_NOT_FOUND = 'Task not found.'
 TASK_DELETED = 'Task deleted successfully.'
+TASK_RANK_MAX_LENGTH = 255
+TASK_NEIGHBOR_NOT_IN_COLUMN = 'Neighbor tasks must be other tasks of the target column.'
+TASK_NEIGHBORS_OUT_OF_ORDER = 'The task after must rank lower than the task before.'
+TASK_RANK_CONFLICT = 'Task ranks are being rebalanced, retry the move.'
+TASK_BULK_MAX_SIZE = 1_000
+TASK_SEARCH_CONFIG = 'english'
+TASK_SEARCH_QUERY_MAX_LENGTH = 200
+TASK_BULK_NOT_FOUND = 'Some of the tasks do not exist.'
+TASK_BULK_MIXED_BOARDS = 'All tasks must belong to the same board.'
+TASK_BULK_COLUMN_REQUIRED = 'A column is required to move tasks.'
+ARCHIVED_TASK_NOT_FOUND = 'Archived task not found.'
 
 SUBTASK_NAME_MAX_LENGTH = 255
-SUBTASK_NAME_MAX_LENGTH_ERROR = 'Subtask name is too long.'
\ No newline at end of file
+SUBTASK_NAME_MAX_LENGTH_ERROR = 'Subtask name is too long.'
+
+BATCH_MAX_OPERATIONS = 100
+BATCH_INVALID_OPERATION = 'Unsupported batch operation.'
+BATCH_INVALID_REFERENCE = 'Invalid reference to an earlier operation.'
+BATCH_OPERATION_FAILED = 'A batch operation failed, no changes were made.'
+
+INVALID_CURSOR = 'Invalid cursor.'
+INVALID_ORDERING = 'Invalid ordering.'
+UNKNOWN_FIELD = 'Unknown field: {}.'
\ No newline at end of file
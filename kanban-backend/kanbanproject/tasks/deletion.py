@@ -0,0 +1,87 @@
+"""
+Purging deleted boards and tasks.
+
+Deleting a board or task only sets its `deleted_at`, which the model
+managers hide from every read, so the request doesn't wait for the rows
+to go. A deleted board is purged in a background thread once its delete
+commits; deleted tasks, and boards whose purge was cut short, are purged
+by the `purge_deleted` command.
+
+Purges go in batches of tasks, live or archived, each deleting the
+batch's subtasks and then the tasks with one statement per table. The
+foreign keys cascade in the database as well, but a cascade deletes
+children parent by parent.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from .models import ArchivedSubtask, ArchivedTask, Board, Column, Task, Subtask, Tombstone
+
+# Tasks purged per transaction, along with their subtasks.
+PURGE_BATCH_SIZE = getattr(settings, 'TASKS_PURGE_BATCH_SIZE', 1_000)
+
+logger = logging.getLogger(__name__)
+
+
+def purge_tasks(task_ids: list[int]):
+    with transaction.atomic():
+        Subtask.all_objects.filter(task_id__in=task_ids).delete()
+        Task.all_objects.filter(pk__in=task_ids).delete()
+
+
+def purge_archived_tasks(task_ids: list[int]):
+    with transaction.atomic():
+        ArchivedSubtask.objects.filter(task_id__in=task_ids).delete()
+        ArchivedTask.all_objects.filter(pk__in=task_ids).delete()
+
+
+def purge_deleted_tasks(batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Purge the tasks marked deleted. Returns how many were purged."""
+    # Unordered, so each batch is read off task_deleted_idx instead of
+    # sorting every deleted task by rank.
+    deleted = Task.all_objects.filter(deleted_at__isnull=False).order_by()
+    total = 0
+    while task_ids := list(deleted.values_list('id', flat=True)[:batch_size]):
+        purge_tasks(task_ids)
+        total += len(task_ids)
+    return total
+
+
+def purge_board(board_id: int, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Purge a board marked deleted, with its columns, tasks and subtasks,
+    archived ones included. Returns how many tasks were purged.
+    """
+    total = 0
+    for tasks, purge in (
+        (Task.all_objects.filter(column__board_id=board_id).order_by(), purge_tasks),
+        (ArchivedTask.all_objects.filter(column__board_id=board_id).order_by(), purge_archived_tasks),
+    ):
+        while task_ids := list(tasks.values_list('id', flat=True)[:batch_size]):
+            purge(task_ids)
+            total += len(task_ids)
+    with transaction.atomic():
+        Column.all_objects.filter(board_id=board_id).delete()
+        Board.all_objects.filter(pk=board_id).delete()
+        Tombstone.objects.filter(board_id=board_id).delete()
+    return total
+
+
+def run_purge(board_id: int):
+    close_old_connections()
+    try:
+        purge_board(board_id)
+    except Exception:
+        logger.exception('Purging board %s failed', board_id)
+    finally:
+        connection.close()
+
+
+def schedule_purge(board_id: int):
+    """Purge a deleted board in a background thread once the current transaction commits."""
+    transaction.on_commit(
+        lambda: threading.Thread(target=run_purge, args=(board_id,), daemon=True).start()
+    )
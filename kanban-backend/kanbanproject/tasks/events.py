@@ -0,0 +1,189 @@
+"""
+Board change events for the server-sent events feed.
+
+The write paths publish small events once their transaction commits, and
+a broker fans them out to the feed's subscribers. The broker is chosen
+with the TASKS_EVENTS_BACKEND setting: InProcessBroker only reaches
+subscribers in the publishing process, PostgresBroker goes through
+LISTEN/NOTIFY to reach every process using the database.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from functools import cache
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.utils.module_loading import import_string
+
+EVENTS_BACKEND = getattr(settings, 'TASKS_EVENTS_BACKEND', 'tasks.events.InProcessBroker')
+# Events a subscriber may fall behind by before it is told to resync.
+SUBSCRIBER_QUEUE_SIZE = 100
+# Seconds between comments keeping an idle feed's connection open.
+HEARTBEAT_INTERVAL = getattr(settings, 'TASKS_EVENTS_HEARTBEAT_INTERVAL', 15)
+# NOTIFY payloads must stay under 8000 bytes.
+NOTIFY_MAX_PAYLOAD = 7_999
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A subscriber's queue, fed from any thread through its event loop."""
+
+    def __init__(self, board_id: int):
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def put(self, event: dict):
+        if self.queue.full():
+            # Too far behind to catch up event by event.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {'type': 'resync', 'board': self.board_id}
+        self.queue.put_nowait(event)
+
+    def deliver(self, event: dict):
+        try:
+            self.loop.call_soon_threadsafe(self.put, event)
+        except RuntimeError:
+            # The subscriber's loop is closed.
+            pass
+
+
+class InProcessBroker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def subscribe(self, board_id: int) -> Subscription:
+        """Subscribe to a board's events. Must be called from the event loop that reads them."""
+        subscription = Subscription(board_id)
+        with self.lock:
+            self.subscriptions[board_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self.lock:
+            subscriptions = self.subscriptions[subscription.board_id]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.board_id]
+
+    def publish(self, event: dict):
+        self.deliver(event)
+
+    def deliver(self, event: dict):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(event['board'], ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Publishes with NOTIFY on the publisher's connection. Each process runs
+    one listener thread with its own connection, started on the first
+    subscription, which delivers the notifications to local subscribers.
+    """
+    channel = 'tasks_board_events'
+
+    def __init__(self):
+        super().__init__()
+        self.listener = None
+
+    def subscribe(self, board_id: int) -> Subscription:
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(target=self.listen, daemon=True)
+                self.listener.start()
+        return super().subscribe(board_id)
+
+    def publish(self, event: dict):
+        with connection.cursor() as cursor:
+            for payload in split_payloads(event, NOTIFY_MAX_PAYLOAD):
+                cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    def listen(self):
+        while True:
+            try:
+                raw_connection = connection.get_new_connection(connection.get_connection_params())
+                try:
+                    raw_connection.autocommit = True
+                    raw_connection.cursor().execute(f'LISTEN {self.channel}')
+                    for payload in self.notifications(raw_connection):
+                        self.deliver(json.loads(payload))
+                finally:
+                    raw_connection.close()
+            except Exception:
+                logger.exception('Listening for board events failed, reconnecting')
+                time.sleep(1)
+
+    def notifications(self, raw_connection):
+        if is_psycopg3:
+            for notify in raw_connection.notifies():
+                yield notify.payload
+            return
+        while True:
+            if select.select([raw_connection], [], [], 5) == ([], [], []):
+                continue
+            raw_connection.poll()
+            while raw_connection.notifies:
+                yield raw_connection.notifies.pop(0).payload
+
+
+def split_payloads(event: dict, max_size: int) -> list[str]:
+    """
+    JSON payloads of `event`, each at most `max_size` bytes. An event too
+    large for one, such as a bulk write's list of ids, is sent as several
+    events of the same type, each with part of its longest list.
+    """
+    payload = json.dumps(event)
+    if len(payload.encode()) <= max_size:
+        return [payload]
+    lists = [key for key, value in event.items() if isinstance(value, list) and len(value) > 1]
+    if not lists:
+        raise ValueError(f"{event['type']} event is too large to publish")
+    key = max(lists, key=lambda key: len(event[key]))
+    half = len(event[key]) // 2
+    return (
+        split_payloads({**event, key: event[key][:half]}, max_size)
+        + split_payloads({**event, key: event[key][half:]}, max_size)
+    )
+
+
+@cache
+def get_broker() -> InProcessBroker:
+    return import_string(EVENTS_BACKEND)()
+
+
+def encode_event(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+def publish(board_id: int, type: str, **data):
+    """Publish an event about a board once the current transaction commits."""
+    event = {'type': type, 'board': board_id, **data}
+    # The write has committed by then, so a failed publish is only logged.
+    transaction.on_commit(lambda: get_broker().publish(event), robust=True)
+
+
+def publish_row_changes(board_id: int, serializer, kind: str, field_events: dict[str, str], **parent):
+    """
+    Publish events for the rows written by a BulkDiffListSerializer update:
+    `<kind>.created` and `<kind>.deleted`, and the event named in
+    `field_events` for each changed field.
+    """
+    for row in serializer.created_rows:
+        publish(board_id, f'{kind}.created', **parent, **{kind: row.id})
+    for row_id, changes in serializer.row_changes.items():
+        for field, type in field_events.items():
+            if field in changes:
+                publish(board_id, type, **parent, **{kind: row_id, field: changes[field]})
+    for row_id in serializer.removed_ids:
+        publish(board_id, f'{kind}.deleted', **parent, **{kind: row_id})
@@ -0,0 +1,196 @@
+"""
+Sparse fieldsets: the `fields` query parameter of the read endpoints, a
+comma-separated list of field paths such as
+
+    ?fields=id,name,columns.tasks.title
+
+A nested document named without a path below it is returned in full.
+
+The selection is parsed into a field tree, a dict mapping each selected
+name to the tree selected below it or to None when selected in full,
+which DynamicFieldsModelSerializer takes as its `fields`. It is also
+pushed down into the queries: only the columns read by the selected
+fields are loaded, and only the selected relations are prefetched.
+
+Relations a serializer lists in its `windowed_fields` are paginated: the
+documents carry their first page and the cursor of the next one.
+"""
+import hashlib
+from collections import defaultdict
+
+from django.db.models import Prefetch, prefetch_related_objects
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import ValidationError
+
+from .constants import UNKNOWN_FIELD
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def parse_fields(value: str) -> dict:
+    tree = {}
+    for path in value.split(','):
+        names = path.strip().split('.')
+        node = tree
+        for name in names[:-1]:
+            if name in node and node[name] is None:
+                # Already selected in full.
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+    return tree
+
+
+def requested_fields(query_params, serializer_class) -> dict | None:
+    """
+    Field tree of the `fields` parameter, validated against the fields of
+    `serializer_class`, or None if the parameter is absent.
+    """
+    value = query_params.get(FIELDS_QUERY_PARAM)
+    if value is None:
+        return None
+    tree = parse_fields(value)
+    check_fields(serializer_class, tree)
+    return tree
+
+
+def check_fields(serializer_class, tree: dict, prefix: str = ''):
+    serializer = blank_serializer(serializer_class)
+    for name, subtree in tree.items():
+        if name not in serializer.fields:
+            raise ValidationError({FIELDS_QUERY_PARAM: [UNKNOWN_FIELD.format(prefix + name)]})
+        if subtree is None:
+            continue
+        nested = serializer.get_nested_serializer(name)
+        if nested is None:
+            # Plain fields have no fields of their own.
+            raise ValidationError({FIELDS_QUERY_PARAM: [UNKNOWN_FIELD.format(f'{prefix}{name}.{next(iter(subtree))}')]})
+        check_fields(nested, subtree, f'{prefix}{name}.')
+
+
+def canonical_fields(tree: dict) -> str:
+    return ','.join(
+        name if subtree is None else f'{name}({canonical_fields(subtree)})'
+        for name, subtree in sorted(tree.items())
+    )
+
+
+def fields_key(tree: dict) -> str:
+    """
+    Key of a field selection for cache keys and ETags, the same whatever
+    the order of the paths. Hashed, as ETags can't hold commas.
+    """
+    return hashlib.md5(canonical_fields(tree).encode(), usedforsecurity=False).hexdigest()
+
+
+def fields_variant(variant: str, fields: dict | None) -> str:
+    """`variant` of a document, narrowed to the selected fields if any."""
+    return variant if fields is None else f'{variant};fields={fields_key(fields)}'
+
+
+def blank_serializer(serializer_class, fields: dict | None = None):
+    # Given an instance, as some serializers drop `id` when creating.
+    return serializer_class(serializer_class.Meta.model(), fields=fields)
+
+
+def loaded_fields(serializer_class, fields: dict | None = None) -> set[str]:
+    """The model fields read by the selected fields of `serializer_class`."""
+    serializer = blank_serializer(serializer_class, fields)
+    model = serializer_class.Meta.model
+    concrete = {field.name for field in model._meta.concrete_fields}
+    return {model._meta.pk.name} | {field.source for field in serializer.fields.values() if field.source in concrete}
+
+
+def sparse_queryset(queryset, serializer_class, fields: dict | None = None, required=()):
+    """
+    `queryset` loading only what `serializer_class` renders for `fields`,
+    plus the `required` model fields. Nested documents are loaded by
+    prefetch_documents once the rows are.
+    """
+    return queryset.only(*loaded_fields(serializer_class, fields), *required)
+
+
+def cache_related(instance, name: str, objects):
+    """
+    Fill the prefetch cache of `instance.<name>` with already loaded
+    objects, so serializers reading the relation don't query for it.
+    """
+    queryset = getattr(instance, name).all()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    if not hasattr(instance, '_prefetched_objects_cache'):
+        instance._prefetched_objects_cache = {}
+    instance._prefetched_objects_cache[name] = queryset
+
+
+def prefetch_documents(instances: list, serializer_class, fields: dict | None = None):
+    """
+    Load the nested documents `serializer_class` renders for `fields` into
+    the prefetch caches of `instances`, one query per relation, each
+    loading only the fields its own selection reads. Windowed relations
+    only get their window.
+    """
+    if not instances:
+        return
+    serializer = blank_serializer(serializer_class, fields)
+    model = serializer_class.Meta.model
+    for name, field in serializer.fields.items():
+        nested = serializer.get_nested_serializer(name)
+        if nested is None:
+            continue
+        nested_fields = serializer.get_nested_fields(name)
+        relation = model._meta.get_field(name if field.source == '*' else field.source)
+        # The rows are matched to their parent by the foreign key.
+        loaded = {*loaded_fields(nested, nested_fields), relation.field.name}
+
+        if name in serializer.windowed_fields:
+            rows = load_window(instances, relation, loaded, serializer.windowed_fields[name])
+        else:
+            accessor = relation.get_accessor_name()
+            # The parents were read through their manager, so their rows
+            # need no checks of their own.
+            queryset = relation.related_model._base_manager.only(*loaded)
+            prefetch_related_objects(instances, Prefetch(accessor, queryset=queryset))
+            rows = [row for instance in instances for row in getattr(instance, accessor).all()]
+        prefetch_documents(rows, nested, nested_fields)
+
+
+def load_window(instances: list, relation, loaded: set[str], pagination_class) -> list:
+    """
+    Load the first page of `relation` of each instance, as paginated by
+    `pagination_class`, into its prefetch cache, and set the cursor of
+    the next page, or None, on its `<relation>_cursor`. Each page is read
+    by its own LATERAL index scan, so the cost doesn't grow with the rows
+    past it. Returns the loaded rows.
+    """
+    paginator = pagination_class()
+    model = relation.related_model
+    accessor = relation.get_accessor_name()
+    ordering_fields = [field.lstrip('-') for field in paginator.ordering]
+    # Through the default manager, so rows it hides stay hidden. One extra
+    # row per page tells whether there is a next one.
+    parent_id = RawSQL('p.id', [], output_field=relation.field.target_field)
+    page = (
+        model.objects.filter(**{relation.field.attname: parent_id})
+        .order_by(*paginator.ordering).values('pk')[:paginator.page_size + 1]
+    )
+    page_sql, page_params = page.query.sql_with_params()
+    window_sql = f'SELECT w.* FROM unnest(%s::bigint[]) AS p(id) CROSS JOIN LATERAL ({page_sql}) w'
+    # The pages are already filtered.
+    queryset = model._base_manager.only(*loaded, *ordering_fields).filter(
+        pk__in=RawSQL(window_sql, [[instance.pk for instance in instances], *page_params])
+    ).order_by(*paginator.ordering)
+
+    pages = defaultdict(list)
+    for row in queryset:
+        pages[getattr(row, relation.field.attname)].append(row)
+    rows = []
+    for instance in instances:
+        page = pages[instance.pk]
+        has_next = len(page) > paginator.page_size
+        page = page[:paginator.page_size]
+        setattr(instance, f'{accessor}_cursor', paginator.get_cursor(page[-1]) if has_next else None)
+        cache_related(instance, accessor, page)
+        rows.extend(page)
+    return rows
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tasks.archiving import ARCHIVE_AGE, ARCHIVE_BATCH_SIZE, archive_tasks
+
+
+class Command(BaseCommand):
+    help = 'Move tasks with all subtasks done and unmodified for the given age into the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ARCHIVE_AGE.days, help='Days since the tasks were last modified.')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='Range of task ids archived per transaction.')
+
+    def handle(self, *args, **options):
+        total = archive_tasks(timedelta(days=options['days']), options['batch_size'])
+        self.stdout.write(f"Archived {total} tasks unmodified for {options['days']} days.")
@@ -0,0 +1,101 @@
+"""
+Load test of the board detail endpoint through running servers, e.g.:
+
+    gunicorn kanbanproject.wsgi -w 4 -b 127.0.0.1:8000
+    uvicorn kanbanproject.asgi:application --workers 4 --port 8001
+    python manage.py bench_asgi --concurrency 200
+
+Both servers must use the same database as this command. Each target is
+timed warm, served from the servers' document caches, and cold, with the
+board's version moved before each request so its cached document is a miss.
+Latencies leave the version moves out; the cold requests per second don't.
+"""
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from statistics import quantiles
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tasks.models import Board
+from tasks.seeding import delete_seeded_board, seed_board
+
+
+def touch_board(board_id: int):
+    """Move the board's version, so the servers rebuild its document."""
+    Board.objects.filter(pk=board_id).touch()
+    # Runs in the pool's threads, which would otherwise keep connections open.
+    connection.close()
+
+
+def fetch(url: str, board_id: int | None = None) -> tuple[float, bool]:
+    """Time a GET of `url`, after touching the board `board_id` if given."""
+    if board_id is not None:
+        touch_board(board_id)
+    request = urllib.request.Request(url, headers={'Accept': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent board detail throughput of the WSGI and ASGI entry points, sync and async views.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once.')
+        parser.add_argument('--requests', type=int, default=2_000, help='Requests per target.')
+        parser.add_argument('--board', type=int, help='Board to read; a board is seeded and deleted afterwards if omitted.')
+        parser.add_argument('--columns', type=int, default=5)
+        parser.add_argument('--tasks', type=int, default=20, help='Tasks per column.')
+        parser.add_argument('--subtasks', type=int, default=3, help='Subtasks per task.')
+
+    def handle(self, *args, **options):
+        # The servers read from their own connections, so the seeded board is committed.
+        board = None
+        if options['board'] is None:
+            board = seed_board(options['columns'], options['tasks'], options['subtasks'], name='Benchmark Board')
+        board_id = options['board'] or board.id
+
+        targets = (
+            ('wsgi, sync view', f"{options['wsgi_url']}/tasks/boards/{board_id}/"),
+            ('asgi, sync view', f"{options['asgi_url']}/tasks/boards/{board_id}/"),
+            ('asgi, async view', f"{options['asgi_url']}/tasks/async/boards/{board_id}/"),
+        )
+        try:
+            for label, url in targets:
+                self.run_target(f'{label}, warm', url, options['concurrency'], options['requests'])
+                self.run_target(f'{label}, cold', url, options['concurrency'], options['requests'], board_id)
+        finally:
+            if board is not None:
+                delete_seeded_board(board.id)
+
+    def run_target(self, label: str, url: str, concurrency: int, requests: int, board_id: int | None = None):
+        """Time `requests` GETs of `url`; cold if `board_id` is given, see fetch."""
+        # Warm up connections, caches and the servers' workers.
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(fetch, [url] * concurrency))
+
+            start = time.perf_counter()
+            results = list(executor.map(fetch, [url] * requests, [board_id] * requests))
+            elapsed = time.perf_counter() - start
+
+        timings = sorted(timing for timing, ok in results if ok)
+        errors = len(results) - len(timings)
+        if len(timings) < 2:
+            self.stdout.write(f'{label:>22}: {errors} of {requests} requests failed')
+            return
+        percentiles = quantiles(timings, n=100)
+        self.stdout.write(
+            f'{label:>22}: {len(timings) / elapsed:.1f} req/s, '
+            f'p50 {percentiles[49] * 1000:.1f} ms, p95 {percentiles[94] * 1000:.1f} ms, '
+            f'p99 {percentiles[98] * 1000:.1f} ms, {errors} errors'
+        )
@@ -0,0 +1,58 @@
+import json
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from tasks.fieldsets import prefetch_documents
+from tasks.models import Board
+from tasks.serializers import BoardSerializer
+from tasks.seeding import seed_board
+from tasks.snapshots import board_snapshot
+
+
+def serializer_path(board_id: int) -> bytes:
+    # As views.get_board builds it, with each column's task window.
+    board = Board.objects.get(pk=board_id)
+    prefetch_documents([board], BoardSerializer)
+    return JSONRenderer().render(BoardSerializer(board).data)
+
+
+def snapshot_path(board_id: int) -> bytes:
+    return board_snapshot(board_id).encode()
+
+
+class Command(BaseCommand):
+    help = 'Compare the serializer and PostgreSQL JSON snapshot paths of the board detail endpoint.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--columns', type=int, default=5)
+        parser.add_argument('--tasks', type=int, default=200, help='Tasks per column.')
+        parser.add_argument('--subtasks', type=int, default=5, help='Subtasks per task.')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        # Seeded rows are rolled back once the benchmark finishes.
+        with transaction.atomic():
+            board = seed_board(options['columns'], options['tasks'], options['subtasks'], name='Benchmark Board')
+
+            if json.loads(serializer_path(board.id)) != json.loads(snapshot_path(board.id)):
+                self.stderr.write('Snapshot output differs from BoardSerializer output.')
+
+            for label, path in (('serializer', serializer_path), ('snapshot', snapshot_path)):
+                timings = []
+                for _ in range(options['repeat']):
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        payload = path(board.id)
+                        timings.append(time.perf_counter() - start)
+                self.stdout.write(
+                    f'{label:>10}: median {median(timings) * 1000:.2f} ms, '
+                    f'min {min(timings) * 1000:.2f} ms, '
+                    f'{len(queries.captured_queries)} queries, {len(payload)} bytes'
+                )
+
+            transaction.set_rollback(True)
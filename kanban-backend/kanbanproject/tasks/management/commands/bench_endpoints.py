@@ -0,0 +1,228 @@
+"""
+Latency, query count and response size of every endpoint in tasks/urls.py
+against a seeded board, e.g.:
+
+    python manage.py bench_endpoints --scale large --output large.json
+    python manage.py bench_endpoints --scale large --baseline large.json
+
+Requests go through the full Django stack in-process. Writes run inside
+a transaction that is rolled back after each request, so every run sees
+the same data. The cached documents are timed both as cache hits and,
+in the "cold" scenarios, with the document cache cleared before each run.
+"""
+import json
+import time
+from statistics import mean, quantiles
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from tasks import urls
+from tasks.archiving import archive
+from tasks.cache import CACHE_ALIAS
+from tasks.changes import encode_changes_cursor
+from tasks.models import Column, Task, Subtask
+from tasks.seeding import SCALES, delete_seeded_board, seed_board
+
+# Endpoints that can't be timed request by request.
+SKIPPED = {
+    'board-events': 'endless event stream',
+}
+WRITE_METHODS = {'POST', 'PATCH', 'PUT', 'DELETE'}
+
+
+def scenario(
+    name: str, url_name: str, method: str, path: str, data=None, content_type='application/json', cold=False, **headers
+):
+    if data is not None and content_type == 'application/json':
+        data = json.dumps(data)
+    return {
+        'name': name,
+        'url_name': url_name,
+        'method': method,
+        'path': path,
+        'data': data,
+        'content_type': content_type,
+        # Whether the document cache is cleared before each run.
+        'cold': cold,
+        'headers': headers,
+    }
+
+
+def build_scenarios(client: Client, board_id: int, archived_id: int) -> list[dict]:
+    first, second = Column.objects.filter(board_id=board_id).order_by('id')[:2]
+    first_tasks = list(Task.objects.filter(column=first).values_list('id', flat=True)[:100])
+    task_id = first_tasks[len(first_tasks) // 2]
+    board = f'/tasks/boards/{board_id}/'
+    task = f'/tasks/items/{task_id}/'
+
+    etag = client.get(board)['ETag']
+    # A client that synced just now, after the board was seeded.
+    cursor = encode_changes_cursor(timezone.now())
+    export = b''.join(client.get(f'{board}export/').streaming_content)
+    columns = [{'name': f'Column {i}'} for i in range(5)]
+    # Updates carry the full child lists; omitted children are deleted.
+    board_columns = list(Column.objects.filter(board_id=board_id).values('id', 'name'))
+    task_subtasks = list(Subtask.objects.filter(task_id=task_id).values('id', 'title', 'status'))
+    return [
+        scenario('board list', 'board-list', 'GET', '/tasks/boards/'),
+        scenario('board create', 'board-list', 'POST', '/tasks/boards/', {'name': 'Board', 'columns': columns}),
+        scenario('board import', 'board-import', 'POST', '/tasks/boards/import/', export, 'application/x-ndjson'),
+        scenario('board detail', 'board-detail', 'GET', board),
+        scenario('board detail cold', 'board-detail', 'GET', board, cold=True),
+        scenario('board detail 304', 'board-detail', 'GET', board, HTTP_IF_NONE_MATCH=etag),
+        scenario('board summary', 'board-detail', 'GET', f'{board}?view=summary'),
+        scenario('board snapshot', 'board-detail', 'GET', f'{board}?snapshot=1'),
+        scenario('board titles', 'board-detail', 'GET', f'{board}?fields=id,columns.id,columns.tasks.id,columns.tasks.title'),
+        scenario('board rename', 'board-detail', 'PATCH', board, {'name': 'Renamed', 'columns': board_columns}),
+        scenario('board delete', 'board-detail', 'DELETE', board),
+        scenario('board full sync', 'board-changes', 'GET', f'{board}changes/'),
+        scenario('board changes', 'board-changes', 'GET', f'{board}changes/?since={cursor}'),
+        scenario('column tasks', 'column-tasks', 'GET', f'{board}columns/{first.id}/tasks/'),
+        scenario('board clone', 'board-clone', 'POST', f'{board}clone/', {}),
+        scenario('board export', 'board-export', 'GET', f'{board}export/'),
+        scenario('board archive', 'board-archive', 'GET', f'{board}archive/'),
+        scenario('task create', 'task-list', 'POST', '/tasks/items/', {
+            'title': 'Task', 'column': first.id, 'subtasks': [{'title': f'Subtask {i}'} for i in range(3)],
+        }),
+        scenario('tasks bulk move', 'task-bulk', 'POST', '/tasks/items/bulk/', {
+            'ids': first_tasks, 'op': 'move', 'column': second.id,
+        }),
+        scenario('task search', 'task-search', 'GET', '/tasks/items/search/?q=subtask'),
+        scenario('task detail', 'task-detail', 'GET', task),
+        scenario('task detail cold', 'task-detail', 'GET', task, cold=True),
+        scenario('task rename', 'task-detail', 'PATCH', task, {'title': 'Renamed', 'subtasks': task_subtasks}),
+        scenario('task delete', 'task-detail', 'DELETE', task),
+        scenario('task move', 'task-move', 'POST', f'{task}move/', {'column': second.id}),
+        scenario('archived task', 'archived-task-detail', 'GET', f'/tasks/archive/{archived_id}/'),
+        scenario('archived task restore', 'archived-task-restore', 'POST', f'/tasks/archive/{archived_id}/restore/'),
+        scenario('batch', 'batch', 'POST', '/tasks/batch/', {'operations': [
+            {'method': 'POST', 'path': '/tasks/boards/', 'body': {'name': 'Board', 'columns': columns}},
+            {'method': 'PATCH', 'path': task, 'body': {'title': 'Renamed', 'subtasks': task_subtasks}},
+        ]}),
+        scenario('async board list', 'async-board-list', 'GET', '/tasks/async/boards/'),
+        scenario('async board detail', 'async-board-detail', 'GET', f'/tasks/async{board[6:]}'),
+        scenario('async board detail cold', 'async-board-detail', 'GET', f'/tasks/async{board[6:]}', cold=True),
+        scenario('async task detail', 'async-task-detail', 'GET', f'/tasks/async{task[6:]}'),
+        scenario('async task detail cold', 'async-task-detail', 'GET', f'/tasks/async{task[6:]}', cold=True),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every tasks endpoint on a seeded board and write the results as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small')
+        parser.add_argument('--board', type=int, help='Board to use; one is seeded at --scale and deleted afterwards if omitted.')
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs per scenario, after one warm-up run.')
+        parser.add_argument('--only', action='append', default=[], help='Run only the named scenarios.')
+        parser.add_argument('--output', help='File to write the JSON results to.')
+        parser.add_argument('--baseline', help='Results of an earlier run to compare against.')
+
+    def handle(self, *args, **options):
+        board_id = options['board']
+        if board_id is None:
+            _, columns, tasks, subtasks = SCALES[options['scale']]
+            with transaction.atomic():
+                board_id = seed_board(columns, tasks, subtasks, name='Benchmark Board').id
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                report = self.run(board_id, options)
+        finally:
+            if options['board'] is None:
+                delete_seeded_board(board_id)
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def run(self, board_id: int, options) -> dict:
+        client = Client()
+        # The archive endpoints need an archived task: one of the board's is
+        # archived for the run and restored afterwards.
+        archived_id = Task.objects.filter(column__board_id=board_id).order_by('-id').values_list('id', flat=True)[0]
+        archive([(archived_id, board_id)])
+        try:
+            results = self.run_scenarios(client, board_id, archived_id, options)
+        finally:
+            client.post(f'/tasks/archive/{archived_id}/restore/')
+        return {
+            'created_at': timezone.now().isoformat(),
+            'board': board_id,
+            'scale': None if options['board'] else options['scale'],
+            'dataset': {
+                'columns': Column.objects.filter(board_id=board_id).count(),
+                'tasks': Task.objects.filter(column__board_id=board_id).count(),
+            },
+            'runs': options['runs'],
+            'results': results,
+            'skipped': SKIPPED,
+        }
+
+    def run_scenarios(self, client: Client, board_id: int, archived_id: int, options) -> list[dict]:
+        scenarios = build_scenarios(client, board_id, archived_id)
+        missing = {pattern.name for pattern in urls.urlpatterns} - {item['url_name'] for item in scenarios} - set(SKIPPED)
+        if missing:
+            raise CommandError(f"No benchmark scenario for {', '.join(sorted(missing))}.")
+        if options['only']:
+            scenarios = [item for item in scenarios if item['name'] in options['only']]
+
+        baseline = {}
+        if options['baseline']:
+            with open(options['baseline']) as file:
+                baseline = {result['name']: result for result in json.load(file)['results']}
+
+        results = []
+        for item in scenarios:
+            result = self.run_scenario(client, item, options['runs'])
+            results.append(result)
+            self.write_result(result, baseline.get(item['name']))
+        return results
+
+    def run_scenario(self, client: Client, item: dict, runs: int) -> dict:
+        timings = []
+        for _ in range(runs + 1):
+            if item['cold']:
+                caches[CACHE_ALIAS].clear()
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = client.generic(
+                        item['method'], item['path'], item['data'] or '', item['content_type'], **item['headers']
+                    )
+                    body = b''.join(response.streaming_content) if response.streaming else response.content
+                    timings.append(time.perf_counter() - start)
+                if item['method'] in WRITE_METHODS:
+                    transaction.set_rollback(True)
+
+        # The first run warms up connections, and the cache of warm scenarios.
+        timings = timings[1:]
+        percentiles = quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+        return {
+            'name': item['name'],
+            'url_name': item['url_name'],
+            'method': item['method'],
+            'status': response.status_code,
+            'p50_ms': round(percentiles[49] * 1000, 3),
+            'p95_ms': round(percentiles[94] * 1000, 3),
+            'p99_ms': round(percentiles[98] * 1000, 3),
+            'mean_ms': round(mean(timings) * 1000, 3),
+            'queries': len(queries.captured_queries),
+            'bytes': len(body),
+        }
+
+    def write_result(self, result: dict, baseline: dict | None):
+        line = (
+            f"{result['name']:>23}: {result['status']}, p50 {result['p50_ms']:.1f} ms, "
+            f"p95 {result['p95_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms, "
+            f"{result['queries']} queries, {result['bytes']} bytes"
+        )
+        if baseline:
+            change = (result['p50_ms'] - baseline['p50_ms']) / baseline['p50_ms'] * 100 if baseline['p50_ms'] else 0
+            line += f", p50 {change:+.0f}% vs baseline, queries {result['queries'] - baseline['queries']:+d}"
+        self.stdout.write(line)
@@ -0,0 +1,72 @@
+import io
+import time
+import tracemalloc
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from tasks.parsers import FastJSONParser
+from tasks.renderers import FastJSONRenderer, orjson
+from tasks.seeding import SCALES, seed_board
+from tasks.serializers import BoardSerializer
+
+
+def measure(function, repeat: int) -> tuple[float, int]:
+    """Median time of `function` over `repeat` calls, and its peak traced memory."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    # Traced separately, tracing slows allocations down.
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return median(timings), peak
+
+
+class Command(BaseCommand):
+    help = "Compare encode and parse time and peak memory of DRF's JSON renderer and parser with the orjson ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, action='append', help='Defaults to small and medium.')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write('orjson is not installed, both paths use the stdlib json module.')
+        for scale in options['scale'] or ['small', 'medium']:
+            _, columns, tasks, subtasks = SCALES[scale]
+            # Seeded rows are rolled back once the scale is measured.
+            with transaction.atomic():
+                board = seed_board(columns, tasks, subtasks, name='Benchmark Board')
+                prefetch_related_objects([board], 'columns__tasks__subtasks')
+                data = BoardSerializer(board).data
+                transaction.set_rollback(True)
+            self.measure_scale(scale, data, options['repeat'])
+
+    def measure_scale(self, scale: str, data, repeat: int):
+        content = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != content:
+            self.stderr.write(f'{scale}: FastJSONRenderer output differs from JSONRenderer output.')
+        self.stdout.write(f'{scale}: {len(content)} bytes')
+
+        cases = (
+            ('encode', 'stdlib', lambda: JSONRenderer().render(data)),
+            ('encode', 'orjson', lambda: FastJSONRenderer().render(data)),
+            ('parse', 'stdlib', lambda: JSONParser().parse(io.BytesIO(content))),
+            ('parse', 'orjson', lambda: FastJSONParser().parse(io.BytesIO(content))),
+        )
+        for operation, label, function in cases:
+            timing, peak = measure(function, repeat)
+            self.stdout.write(
+                f'{operation:>8} {label:>6}: median {timing * 1000:.2f} ms, peak {peak / 1024 / 1024:.1f} MiB'
+            )
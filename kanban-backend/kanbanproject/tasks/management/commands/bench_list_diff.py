@@ -0,0 +1,76 @@
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from tasks.models import Subtask, Task
+from tasks.seeding import seed_board
+from tasks.serializers import SubtaskSerializer
+
+
+def row_by_row_update(task: Task, data):
+    """The per-row diff SubtaskListSerializer.update used before bulk diffs."""
+    subtask_mapping = {subtask.id: subtask for subtask in Subtask.objects.filter(task=task)}
+    data_mapping = {item['id']: item for item in data if 'id' in item}
+
+    for subtask_id, subtask in subtask_mapping.items():
+        item = data_mapping.get(subtask_id)
+        if item:
+            subtask.title = item.get('title', subtask.title)
+            subtask.status = item.get('status', subtask.status)
+            subtask.save()
+        else:
+            subtask.delete()
+
+    Subtask.objects.bulk_create([Subtask(task=task, **item) for item in data if 'id' not in item])
+
+
+def bulk_diff_update(task: Task, data):
+    serializer = SubtaskSerializer(
+        Subtask.objects.filter(task=task), data=data, many=True, partial=True, context={'task': task}
+    )
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+
+
+def build_payload(task: Task):
+    """Rename half the subtasks, keep a quarter untouched, drop the rest and add as many new ones."""
+    subtasks = list(Subtask.objects.filter(task=task).order_by('id'))
+    half, quarter = len(subtasks) // 2, len(subtasks) // 4
+    data = [{'id': subtask.id, 'title': f'{subtask.title} (renamed)'} for subtask in subtasks[:half]]
+    data += [{'id': subtask.id} for subtask in subtasks[half:half + quarter]]
+    data += [{'title': f'New subtask {i}'} for i in range(len(subtasks) - half - quarter)]
+    return data
+
+
+class Command(BaseCommand):
+    help = 'Compare statement count and latency of row-by-row and bulk subtask list diffs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subtasks', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        for label, update in (('row-by-row', row_by_row_update), ('bulk diff', bulk_diff_update)):
+            timings, statements = [], 0
+            for _ in range(options['repeat']):
+                # Each run gets a fresh task and is rolled back afterwards.
+                with transaction.atomic():
+                    board = seed_board(1, 1, options['subtasks'], name='Benchmark Board')
+                    task = Task.objects.get(column__board=board)
+                    data = build_payload(task)
+
+                    with CaptureQueriesContext(connection) as queries:
+                        start = time.perf_counter()
+                        update(task, data)
+                        timings.append(time.perf_counter() - start)
+                    statements = len(queries.captured_queries)
+
+                    transaction.set_rollback(True)
+
+            self.stdout.write(
+                f'{label:>10}: median {median(timings) * 1000:.2f} ms, '
+                f'min {min(timings) * 1000:.2f} ms, {statements} statements'
+            )
@@ -0,0 +1,117 @@
+"""
+Latency of task searches over a large seeded board, e.g.:
+
+    python manage.py bench_search --tasks 1000000
+
+The board is committed so the table can be vacuumed and analyzed like a
+live one, and deleted afterwards.
+"""
+import time
+from statistics import quantiles
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from tasks.models import Board, Column, Task
+from tasks.search import search_tasks
+from tasks.seeding import delete_seeded_board
+
+# Drawn with a skew towards the front of the list, so the first words are
+# in most tasks and the last ones in few.
+VOCABULARY = [
+    'update', 'design', 'review', 'page', 'login', 'report', 'server', 'mobile', 'layout', 'email',
+    'invoice', 'customer', 'payment', 'search', 'profile', 'dashboard', 'export', 'import', 'button', 'migration',
+    'release', 'bug', 'feature', 'test', 'deploy', 'cache', 'query', 'index', 'schema', 'upload',
+    'download', 'notification', 'settings', 'password', 'session', 'checkout', 'cart', 'shipping', 'refund', 'coupon',
+    'analytics', 'onboarding', 'tooltip', 'sidebar', 'footer', 'banner', 'carousel', 'webhook', 'throttle', 'audit',
+]
+# Added to one task in RARE_EVERY.
+RARE_WORD = 'zeppelin'
+RARE_EVERY = 10_000
+INSERT_CHUNK_SIZE = 100_000
+
+WORD = f"(%(words)s::text[])[1 + floor(power(random(), 3) * {len(VOCABULARY)})::int]"
+
+INSERT_TASKS_SQL = f"""
+INSERT INTO {Task._meta.db_table} (
+    title, description, column_id, rank, total_subtasks, completed_subtasks, subtask_titles, created_at, last_modified
+)
+SELECT
+    concat_ws(' ', {WORD}, {WORD}, {WORD}, CASE WHEN mod(n, {RARE_EVERY}) = 0 THEN '{RARE_WORD}' END),
+    concat_ws(' ', {WORD}, {WORD}, {WORD}, {WORD}, {WORD}, {WORD}, {WORD}, {WORD}),
+    (%(columns)s::bigint[])[1 + mod(n, %(column_count)s)],
+    lpad(to_hex(n), 8, '0'),
+    -- Only the subtask titles the search covers are seeded, not the rows.
+    3,
+    0,
+    concat_ws(' ', {WORD}, {WORD}, {WORD}),
+    now(),
+    now()
+FROM generate_series(%(start)s, %(stop)s) n
+"""
+
+
+class Command(BaseCommand):
+    help = 'Time full-text task searches, ranked and paginated like the search endpoint, on a large board.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1_000_000)
+        parser.add_argument('--columns', type=int, default=100)
+        parser.add_argument('--runs', type=int, default=20, help='Runs per query.')
+        parser.add_argument('--page-size', type=int, default=20)
+
+    def handle(self, *args, **options):
+        board = Board.objects.create(name='Search Benchmark Board')
+        try:
+            columns = self.seed(board, options['columns'], options['tasks'])
+            queries = (
+                ('common word', VOCABULARY[0], {}),
+                ('mid word', VOCABULARY[len(VOCABULARY) // 2], {}),
+                ('rare word', RARE_WORD, {}),
+                ('two words', f'{VOCABULARY[5]} {VOCABULARY[20]}', {}),
+                ('phrase or word', f'"{VOCABULARY[1]} {VOCABULARY[2]}" or {VOCABULARY[-1]}', {}),
+                ('common, column', VOCABULARY[0], {'column_id': columns[0]}),
+                ('rare, board', RARE_WORD, {'board_id': board.id}),
+            )
+            for label, text, filters in queries:
+                self.run_query(label, text, filters, options['runs'], options['page_size'])
+        finally:
+            delete_seeded_board(board.id)
+
+    def seed(self, board: Board, columns: int, tasks: int) -> list[int]:
+        column_ids = [
+            column.id for column in Column.objects.bulk_create([Column(name=f'Column {i}', board=board) for i in range(columns)])
+        ]
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            for chunk_start in range(1, tasks + 1, INSERT_CHUNK_SIZE):
+                cursor.execute(INSERT_TASKS_SQL, {
+                    'words': VOCABULARY,
+                    'columns': column_ids,
+                    'column_count': len(column_ids),
+                    'start': chunk_start,
+                    'stop': min(chunk_start + INSERT_CHUNK_SIZE - 1, tasks),
+                })
+            # Flushes the GIN pending list and refreshes the statistics.
+            cursor.execute(f'VACUUM ANALYZE {Task._meta.db_table}')
+        self.stdout.write(f'Seeded {tasks} tasks in {time.perf_counter() - start:.1f} s')
+        return column_ids
+
+    def run_query(self, label: str, text: str, filters: dict, runs: int, page_size: int):
+        queryset = search_tasks(text, **filters).order_by('-relevance', 'id')
+        matches = queryset.count()
+        plan = queryset[:page_size].explain()
+
+        timings = []
+        for _ in range(runs + 1):
+            start = time.perf_counter()
+            list(queryset[:page_size + 1])
+            timings.append(time.perf_counter() - start)
+        # The first run warms the buffer cache.
+        timings = sorted(timings[1:])
+        percentiles = quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+        self.stdout.write(
+            f'{label:>16}: {matches:>8} matches, p50 {percentiles[49] * 1000:.1f} ms, '
+            f'p95 {percentiles[94] * 1000:.1f} ms, '
+            f"{'GIN index' if 'task_search_vector_idx' in plan else 'no index'}"
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from tasks.deletion import PURGE_BATCH_SIZE, purge_board, purge_deleted_tasks
+from tasks.models import Board
+
+
+class Command(BaseCommand):
+    help = 'Purge deleted tasks, and deleted boards whose background purge did not finish.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE, help='Tasks purged per transaction.')
+
+    def handle(self, *args, **options):
+        tasks = purge_deleted_tasks(options['batch_size'])
+        board_ids = list(Board.all_objects.filter(deleted_at__isnull=False).values_list('id', flat=True))
+        for board_id in board_ids:
+            tasks += purge_board(board_id, options['batch_size'])
+        self.stdout.write(f'Purged {len(board_ids)} deleted boards and {tasks} tasks.')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.changes import TOMBSTONE_RETENTION
+from tasks.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete tombstones older than the retention period; clients with older cursors resync the whole board.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - TOMBSTONE_RETENTION
+        expired = Tombstone.objects.filter(deleted_at__lt=cutoff)
+        total = 0
+        # Short batches keep locks and WAL bursts small on large backlogs.
+        while True:
+            ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += Tombstone.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(f'Deleted {total} tombstones older than {cutoff.isoformat()}.')
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks.seeding import SCALES, seed_board
+
+
+class Command(BaseCommand):
+    help = 'Seed boards at a named scale for benchmarks. The same scale always produces the same content.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scale', choices=SCALES)
+        parser.add_argument('--boards', type=int, help="Override the scale's number of boards.")
+        parser.add_argument('--name', default='Seeded Board')
+
+    def handle(self, *args, **options):
+        boards, columns, tasks, subtasks = SCALES[options['scale']]
+        if options['boards'] is not None:
+            boards = options['boards']
+
+        start = time.perf_counter()
+        ids = []
+        for i in range(boards):
+            name = options['name'] if boards == 1 else f"{options['name']} {i}"
+            with transaction.atomic():
+                ids.append(seed_board(columns, tasks, subtasks, name=name).id)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f'Seeded {boards} board(s) of {columns} columns x {tasks} tasks x {subtasks} subtasks '
+            f'({boards * columns * tasks} tasks, {boards * columns * tasks * subtasks} subtasks) in {elapsed:.1f} s'
+        )
+        self.stdout.write(f"Board ids: {', '.join(map(str, ids))}")
@@ -0,0 +1,185 @@
+"""
+Per-endpoint request metrics in the Prometheus text format, served by
+the `metrics` view.
+
+RequestMetricsMiddleware records latency, SQL time, query count and
+response size for each request, labelled with the resolved view name and
+method. Queries are timed by an execute wrapper installed on every
+database connection, which adds them to the stats of the request being
+served in the current context.
+
+Requires prometheus_client; without it the middleware disables itself.
+Under a multi-process server, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers before they start, so every worker
+writes its samples there and any of them can serve the combined metrics.
+"""
+import os
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+# Label of requests that didn't resolve to a view, to bound the label values.
+UNRESOLVED = 'unresolved'
+LABELS = ('view', 'method')
+
+if prometheus_client is not None:
+    REQUEST_DURATION = prometheus_client.Histogram(
+        'kanban_request_duration_seconds', 'Time to serve a request, including streaming the response.', LABELS,
+    )
+    REQUEST_DB_DURATION = prometheus_client.Histogram(
+        'kanban_request_db_duration_seconds', 'Time spent executing SQL while serving a request.', LABELS,
+    )
+    REQUEST_QUERIES = prometheus_client.Histogram(
+        'kanban_request_queries', 'SQL queries executed while serving a request.', LABELS,
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000),
+    )
+    RESPONSE_SIZE = prometheus_client.Histogram(
+        'kanban_response_size_bytes', 'Size of the response body.', LABELS,
+        buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+    )
+    REQUESTS = prometheus_client.Counter(
+        'kanban_requests', 'Requests served, by status code.', (*LABELS, 'status'),
+    )
+
+# Stats of the request served in the current thread or task.
+current_stats = ContextVar('current_stats', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_duration = 0.0
+        self.size = 0
+
+
+def record_query(execute, sql, params, many, context):
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_duration += time.perf_counter() - start
+
+
+def install_query_recorder(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    Goes first in MIDDLEWARE, so the recorded latency covers the other
+    middleware. Streaming responses are recorded once their content has
+    been sent.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if prometheus_client is None:
+            raise MiddlewareNotUsed('prometheus_client is not installed.')
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder, dispatch_uid='tasks.metrics')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats: RequestStats):
+        if not response.streaming:
+            stats.size = len(response.content)
+            observe(request, response, stats)
+        elif response.is_async:
+            response.streaming_content = self.astream(request, response, stats, response.streaming_content)
+        else:
+            response.streaming_content = self.stream(request, response, stats, response.streaming_content)
+        return response
+
+    def stream(self, request, response, stats: RequestStats, content):
+        content = iter(content)
+        try:
+            while True:
+                # Queries run while the server pulls the content count too.
+                token = current_stats.set(stats)
+                try:
+                    chunk = next(content, None)
+                finally:
+                    current_stats.reset(token)
+                if chunk is None:
+                    return
+                stats.size += len(chunk)
+                yield chunk
+        finally:
+            observe(request, response, stats)
+
+    async def astream(self, request, response, stats: RequestStats, content):
+        content = aiter(content)
+        try:
+            while True:
+                token = current_stats.set(stats)
+                try:
+                    chunk = await anext(content, None)
+                finally:
+                    current_stats.reset(token)
+                if chunk is None:
+                    return
+                stats.size += len(chunk)
+                yield chunk
+        finally:
+            observe(request, response, stats)
+
+
+def observe(request, response, stats: RequestStats):
+    match = request.resolver_match
+    labels = (match.view_name if match else UNRESOLVED, request.method)
+    REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - stats.start)
+    REQUEST_DB_DURATION.labels(*labels).observe(stats.db_duration)
+    REQUEST_QUERIES.labels(*labels).observe(stats.queries)
+    RESPONSE_SIZE.labels(*labels).observe(stats.size)
+    REQUESTS.labels(*labels, response.status_code).inc()
+
+
+def metrics(request):
+    if prometheus_client is None:
+        raise Http404('prometheus_client is not installed.')
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return HttpResponse(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_board_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_subtasks',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='total_subtasks',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE tasks_task t
+                SET total_subtasks = s.total, completed_subtasks = s.completed
+                FROM (
+                    SELECT task_id, count(*) AS total, count(*) FILTER (WHERE status) AS completed
+                    FROM tasks_subtask
+                    GROUP BY task_id
+                ) s
+                WHERE s.task_id = t.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
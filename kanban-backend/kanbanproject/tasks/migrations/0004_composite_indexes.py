@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:04
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built without locking writes. The composite indexes are in
+    # place before the single-column FK indexes they replace are dropped.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0003_task_subtask_counters'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='column',
+            options={'ordering': ['id']},
+        ),
+        migrations.AlterModelOptions(
+            name='subtask',
+            options={'ordering': ['id']},
+        ),
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['id']},
+        ),
+        AddIndexConcurrently(
+            model_name='board',
+            index=models.Index(fields=['last_modified', 'id'], name='board_last_modified_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='column',
+            index=models.Index(fields=['board', 'id'], name='column_board_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='subtask',
+            index=models.Index(fields=['task', 'id'], name='subtask_task_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='subtask',
+            index=models.Index(condition=models.Q(('status', False)), fields=['task'], name='subtask_incomplete_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['column', 'id'], name='task_column_id_idx'),
+        ),
+        migrations.AlterField(
+            model_name='column',
+            name='board',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='columns', to='tasks.board'),
+        ),
+        migrations.AlterField(
+            model_name='subtask',
+            name='task',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to='tasks.task'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='column',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='tasks.column'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:06
+
+from django.db import migrations, models
+
+# Copied from tasks.ranking as of this migration, so later changes there
+# don't change how it runs.
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def to_rank(value, width):
+    """Rank of the fraction `value / BASE ** width`."""
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)).rstrip(DIGITS[0])
+
+
+def spaced_ranks(count):
+    """Return `count` increasing ranks spread evenly over the whole range."""
+    width = 1
+    while BASE ** width < (count + 1) * BASE:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [to_rank(position * step, width) for position in range(1, count + 1)]
+
+
+def assign_ranks(apps, schema_editor):
+    """Rank existing tasks in id order, evenly spaced within each column."""
+    Column = apps.get_model('tasks', 'Column')
+    Task = apps.get_model('tasks', 'Task')
+    for column_id in Column.objects.values_list('id', flat=True).iterator():
+        tasks = list(Task.objects.filter(column_id=column_id).order_by('id').only('id'))
+        for task, rank in zip(tasks, spaced_ranks(len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=1_000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['rank', 'id']},
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(db_collation='C', default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(assign_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['column', 'rank', 'id'], name='task_column_rank_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_column_id_idx',
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+# Statement-level triggers recording a tombstone for every column, task and
+# subtask deleted, and for every task moved to another board. Cascades
+# delete children before parents, so the joins to the parents still find
+# the board.
+TOMBSTONE_TRIGGERS_SQL = """
+CREATE FUNCTION tasks_column_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT o.board_id, 'column', o.id, clock_timestamp()
+    FROM old_rows o;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION tasks_task_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT c.board_id, 'task', o.id, clock_timestamp()
+    FROM old_rows o
+    JOIN tasks_column c ON c.id = o.column_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION tasks_task_moved_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT old_column.board_id, 'task', o.id, clock_timestamp()
+    FROM old_rows o
+    JOIN new_rows n ON n.id = o.id
+    JOIN tasks_column old_column ON old_column.id = o.column_id
+    JOIN tasks_column new_column ON new_column.id = n.column_id
+    WHERE old_column.board_id <> new_column.board_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION tasks_subtask_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT c.board_id, 'subtask', o.id, clock_timestamp()
+    FROM old_rows o
+    JOIN tasks_task t ON t.id = o.task_id
+    JOIN tasks_column c ON c.id = t.column_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER tasks_column_tombstones AFTER DELETE ON tasks_column
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_column_tombstones();
+
+CREATE TRIGGER tasks_task_tombstones AFTER DELETE ON tasks_task
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_tombstones();
+
+CREATE TRIGGER tasks_task_moved_tombstones AFTER UPDATE ON tasks_task
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_moved_tombstones();
+
+CREATE TRIGGER tasks_subtask_tombstones AFTER DELETE ON tasks_subtask
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_subtask_tombstones();
+"""
+
+DROP_TOMBSTONE_TRIGGERS_SQL = """
+DROP TRIGGER tasks_subtask_tombstones ON tasks_subtask;
+DROP TRIGGER tasks_task_moved_tombstones ON tasks_task;
+DROP TRIGGER tasks_task_tombstones ON tasks_task;
+DROP TRIGGER tasks_column_tombstones ON tasks_column;
+DROP FUNCTION tasks_subtask_tombstones();
+DROP FUNCTION tasks_task_moved_tombstones();
+DROP FUNCTION tasks_task_tombstones();
+DROP FUNCTION tasks_column_tombstones();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_rank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board_id', models.BigIntegerField()),
+                ('kind', models.CharField(choices=[('column', 'Column'), ('task', 'Task'), ('subtask', 'Subtask')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board_id', 'deleted_at'], name='tombstone_board_deleted_idx')],
+            },
+        ),
+        migrations.RunSQL(TOMBSTONE_TRIGGERS_SQL, DROP_TOMBSTONE_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:22
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+BACKFILL_SUBTASK_TITLES_SQL = """
+UPDATE tasks_task t
+SET subtask_titles = s.titles
+FROM (
+    SELECT task_id, string_agg(title, ' ' ORDER BY id) AS titles
+    FROM tasks_subtask
+    GROUP BY task_id
+) s
+WHERE s.task_id = t.id
+"""
+
+
+class Migration(migrations.Migration):
+    # The search index is built without locking writes.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0006_tombstones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='subtask_titles',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunSQL(BACKFILL_SUBTASK_TITLES_SQL, migrations.RunSQL.noop),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), '||', django.contrib.postgres.search.SearchVector('subtask_titles', config='english', weight='C'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
+        ),
+    ]
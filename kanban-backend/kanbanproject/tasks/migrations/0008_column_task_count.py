@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:59
+
+from django.db import migrations, models
+
+# Statement-level triggers keeping tasks_column.task_count in step with the
+# tasks inserted, deleted and moved between columns, whichever way they are
+# written (ORM, COPY, raw SQL or cascades).
+TASK_COUNT_TRIGGERS_SQL = """
+CREATE FUNCTION tasks_column_count_inserted() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_column c SET task_count = c.task_count + n.count
+    FROM (SELECT column_id, count(*) AS count FROM new_rows GROUP BY column_id) n
+    WHERE c.id = n.column_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION tasks_column_count_deleted() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_column c SET task_count = c.task_count - o.count
+    FROM (SELECT column_id, count(*) AS count FROM old_rows GROUP BY column_id) o
+    WHERE c.id = o.column_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION tasks_column_count_moved() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_column c SET task_count = c.task_count + d.delta
+    FROM (
+        SELECT column_id, sum(delta) AS delta
+        FROM (
+            SELECT n.column_id, 1 AS delta
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE n.column_id <> o.column_id
+            UNION ALL
+            SELECT o.column_id, -1
+            FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE n.column_id <> o.column_id
+        ) moves
+        GROUP BY column_id
+    ) d
+    WHERE c.id = d.column_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER tasks_column_count_inserted AFTER INSERT ON tasks_task
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_column_count_inserted();
+
+CREATE TRIGGER tasks_column_count_deleted AFTER DELETE ON tasks_task
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_column_count_deleted();
+
+CREATE TRIGGER tasks_column_count_moved AFTER UPDATE ON tasks_task
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_column_count_moved();
+"""
+
+DROP_TASK_COUNT_TRIGGERS_SQL = """
+DROP TRIGGER tasks_column_count_moved ON tasks_task;
+DROP TRIGGER tasks_column_count_deleted ON tasks_task;
+DROP TRIGGER tasks_column_count_inserted ON tasks_task;
+DROP FUNCTION tasks_column_count_moved();
+DROP FUNCTION tasks_column_count_deleted();
+DROP FUNCTION tasks_column_count_inserted();
+"""
+
+BACKFILL_TASK_COUNT_SQL = """
+UPDATE tasks_column c SET task_count = t.count
+FROM (SELECT column_id, count(*) AS count FROM tasks_task GROUP BY column_id) t
+WHERE c.id = t.column_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='column',
+            name='task_count',
+            field=models.PositiveIntegerField(db_default=0, default=0),
+        ),
+        migrations.RunSQL(TASK_COUNT_TRIGGERS_SQL, DROP_TASK_COUNT_TRIGGERS_SQL),
+        migrations.RunSQL(BACKFILL_TASK_COUNT_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,204 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def foreign_key_sql(table: str, column: str, parent: str, action: str) -> str:
+    """
+    Recreate the foreign key Django created on `table`.`column`, under
+    the same name, with another ON DELETE action.
+    """
+    return f"""
+DO $$
+DECLARE
+    name text;
+BEGIN
+    SELECT con.conname INTO STRICT name
+    FROM pg_constraint con
+    JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = con.conkey[1]
+    WHERE con.contype = 'f' AND con.conrelid = '{table}'::regclass AND a.attname = '{column}';
+    EXECUTE format(
+        'ALTER TABLE {table} DROP CONSTRAINT %1$I, ADD CONSTRAINT %1$I FOREIGN KEY ({column}) '
+        'REFERENCES {parent} (id) ON DELETE {action} DEFERRABLE INITIALLY DEFERRED',
+        name
+    );
+END
+$$;
+"""
+
+
+FOREIGN_KEYS = [
+    ('tasks_column', 'board_id', 'tasks_board'),
+    ('tasks_task', 'column_id', 'tasks_column'),
+    ('tasks_subtask', 'task_id', 'tasks_task'),
+]
+CASCADE_SQL = ''.join(foreign_key_sql(*foreign_key, 'CASCADE') for foreign_key in FOREIGN_KEYS)
+NO_ACTION_SQL = ''.join(foreign_key_sql(*foreign_key, 'NO ACTION') for foreign_key in FOREIGN_KEYS)
+
+# The tombstone and task_count triggers of migrations 0006 and 0008 skip
+# tasks that were already marked deleted, which were accounted for then,
+# and rows of deleted boards, which nobody syncs. Marking tasks deleted
+# records tombstones for them and their subtasks and takes them out of
+# their column's task_count.
+SOFT_DELETE_TRIGGERS_SQL = """
+CREATE OR REPLACE FUNCTION tasks_column_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT o.board_id, 'column', o.id, clock_timestamp()
+    FROM old_rows o
+    JOIN tasks_board b ON b.id = o.board_id
+    WHERE b.deleted_at IS NULL;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION tasks_task_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT c.board_id, 'task', o.id, clock_timestamp()
+    FROM old_rows o
+    JOIN tasks_column c ON c.id = o.column_id
+    JOIN tasks_board b ON b.id = c.board_id
+    WHERE o.deleted_at IS NULL AND b.deleted_at IS NULL;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION tasks_subtask_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT c.board_id, 'subtask', o.id, clock_timestamp()
+    FROM old_rows o
+    JOIN tasks_task t ON t.id = o.task_id
+    JOIN tasks_column c ON c.id = t.column_id
+    JOIN tasks_board b ON b.id = c.board_id
+    WHERE t.deleted_at IS NULL AND b.deleted_at IS NULL;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION tasks_column_count_deleted() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_column c SET task_count = c.task_count - o.count
+    FROM (SELECT column_id, count(*) AS count FROM old_rows WHERE deleted_at IS NULL GROUP BY column_id) o
+    WHERE c.id = o.column_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION tasks_task_soft_deleted() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    WITH deleted AS MATERIALIZED (
+        SELECT n.id, n.column_id, c.board_id
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        JOIN tasks_column c ON c.id = n.column_id
+        WHERE o.deleted_at IS NULL AND n.deleted_at IS NOT NULL
+    ),
+    counts AS (
+        UPDATE tasks_column c SET task_count = c.task_count - d.count
+        FROM (SELECT column_id, count(*) AS count FROM deleted GROUP BY column_id) d
+        WHERE c.id = d.column_id
+    )
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT d.board_id, 'task', d.id, clock_timestamp()
+    FROM deleted d
+    UNION ALL
+    SELECT d.board_id, 'subtask', s.id, clock_timestamp()
+    FROM deleted d
+    JOIN tasks_subtask s ON s.task_id = d.id;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER tasks_task_soft_deleted AFTER UPDATE ON tasks_task
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION tasks_task_soft_deleted();
+"""
+
+# The functions as migrations 0006 and 0008 created them.
+DROP_SOFT_DELETE_TRIGGERS_SQL = """
+DROP TRIGGER tasks_task_soft_deleted ON tasks_task;
+DROP FUNCTION tasks_task_soft_deleted();
+
+CREATE OR REPLACE FUNCTION tasks_column_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT o.board_id, 'column', o.id, clock_timestamp()
+    FROM old_rows o;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION tasks_task_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT c.board_id, 'task', o.id, clock_timestamp()
+    FROM old_rows o
+    JOIN tasks_column c ON c.id = o.column_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION tasks_subtask_tombstones() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO tasks_tombstone (board_id, kind, object_id, deleted_at)
+    SELECT c.board_id, 'subtask', o.id, clock_timestamp()
+    FROM old_rows o
+    JOIN tasks_task t ON t.id = o.task_id
+    JOIN tasks_column c ON c.id = t.column_id;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION tasks_column_count_deleted() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE tasks_column c SET task_count = c.task_count - o.count
+    FROM (SELECT column_id, count(*) AS count FROM old_rows GROUP BY column_id) o
+    WHERE c.id = o.column_id;
+    RETURN NULL;
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_column_task_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='column',
+            name='board',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='columns', to='tasks.board'),
+        ),
+        migrations.AlterField(
+            model_name='subtask',
+            name='task',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='subtasks', to='tasks.task'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='column',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='tasks', to='tasks.column'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='task_deleted_idx'),
+        ),
+        migrations.RunSQL(CASCADE_SQL, NO_ACTION_SQL),
+        migrations.RunSQL(SOFT_DELETE_TRIGGERS_SQL, DROP_SOFT_DELETE_TRIGGERS_SQL),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_soft_delete'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('total_subtasks', models.PositiveIntegerField(default=0)),
+                ('completed_subtasks', models.PositiveIntegerField(default=0)),
+                ('subtask_titles', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField()),
+                ('last_modified', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('column', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='archived_tasks', to='tasks.column')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedSubtask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('status', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('last_modified', models.DateTimeField()),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='subtasks', to='tasks.archivedtask')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedtask',
+            index=models.Index(fields=['column', 'archived_at', 'id'], name='archived_task_column_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedsubtask',
+            index=models.Index(fields=['task', 'id'], name='archived_subtask_task_id_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:17
+
+from importlib import import_module
+
+from django.db import migrations
+
+foreign_key_sql = import_module('tasks.migrations.0009_soft_delete').foreign_key_sql
+
+
+# The archive tables cascade like the live ones (see migration 0009). A
+# migration of its own, as Django only adds the keys of the tables it
+# creates once the migration creating them ends.
+FOREIGN_KEYS = [
+    ('tasks_archivedtask', 'column_id', 'tasks_column'),
+    ('tasks_archivedsubtask', 'task_id', 'tasks_archivedtask'),
+]
+CASCADE_SQL = ''.join(foreign_key_sql(*foreign_key, 'CASCADE') for foreign_key in FOREIGN_KEYS)
+NO_ACTION_SQL = ''.join(foreign_key_sql(*foreign_key, 'NO ACTION') for foreign_key in FOREIGN_KEYS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_archive'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CASCADE_SQL, NO_ACTION_SQL),
+    ]
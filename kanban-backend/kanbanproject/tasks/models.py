@@ -1,32 +1,218 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
-from .constants import BOARD_NAME_MAX_LENGTH, COLUMN_NAME_MAX_LENGTH
+from .constants import BOARD_NAME_MAX_LENGTH, COLUMN_NAME_MAX_LENGTH, TASK_RANK_MAX_LENGTH, TASK_SEARCH_CONFIG
 
 # Create your models here.
+class BoardQuerySet(models.QuerySet):
+    def touch(self):
+        """
+        Move the boards' version and last_modified forward. Called by every
+        write to a board's columns, tasks or subtasks.
+        """
+        return self.update(version=F('version') + 1, last_modified=timezone.now())
+
+
+class BoardManager(models.Manager.from_queryset(BoardQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at=None)
+
+
 class Board(models.Model):
     name = models.CharField(max_length=BOARD_NAME_MAX_LENGTH)
+    # Bumped on any change to the board document, including its children.
+    version = models.PositiveBigIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
+    # Set when the board is deleted; the rows stay until they are purged
+    # in the background, see deletion.py.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    # Deleted boards, and their columns and tasks, are hidden from reads.
+    objects = BoardManager()
+    all_objects = BoardQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the board list.
+            models.Index(fields=['last_modified', 'id'], name='board_last_modified_id_idx'),
+        ]
+
+
+class ColumnManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(board__deleted_at=None)
 
 
 class Column(models.Model):
     name = models.CharField(max_length=COLUMN_NAME_MAX_LENGTH)
-    board = models.ForeignKey(Board, related_name='columns', on_delete=models.CASCADE)
+    # Lookups by board are served by the composite index below. Deletes
+    # are cascaded by the database (see migration 0009), so the ORM never
+    # loads the rows it deletes.
+    board = models.ForeignKey(Board, related_name='columns', on_delete=models.DO_NOTHING, db_index=False)
+    # Maintained by database triggers (see migration 0008), so boards can
+    # show the size of columns whose tasks they don't load. Column writes
+    # go through bulk_update with explicit fields and leave it alone.
+    task_count = models.PositiveIntegerField(default=0, db_default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
 
+    objects = ColumnManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['board', 'id'], name='column_board_id_idx'),
+        ]
+
+
+class TaskManager(models.Manager):
+    def get_queryset(self):
+        # The search columns are only read inside the database, so tasks
+        # loaded for documents don't carry them.
+        return super().get_queryset().filter(
+            deleted_at=None, column__board__deleted_at=None
+        ).defer('subtask_titles', 'search_vector')
+
 
 class Task(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
-    column = models.ForeignKey(Column, related_name='tasks', on_delete=models.CASCADE)
+    column = models.ForeignKey(Column, related_name='tasks', on_delete=models.DO_NOTHING, db_index=False)
+    # Fractional position within the column, see ranking.py. The C collation
+    # makes the database compare ranks byte by byte.
+    rank = models.CharField(max_length=TASK_RANK_MAX_LENGTH, db_collation='C')
+    # Maintained by the subtask write paths so task cards don't load subtasks.
+    total_subtasks = models.PositiveIntegerField(default=0)
+    completed_subtasks = models.PositiveIntegerField(default=0)
+    # Titles of the subtasks, maintained alongside the counters, so the
+    # search vector below can cover them.
+    subtask_titles = models.TextField(blank=True, default='')
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config=TASK_SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=TASK_SEARCH_CONFIG)
+            + SearchVector('subtask_titles', weight='C', config=TASK_SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
+    # Set when the task is deleted, see Board.deleted_at.
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = TaskManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        ordering = ['rank', 'id']
+        indexes = [
+            # Also serves the plain column lookups, so no (column, id) index.
+            models.Index(fields=['column', 'rank', 'id'], name='task_column_rank_idx'),
+            GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
+            # Deleted tasks waiting to be purged.
+            models.Index(fields=['deleted_at'], condition=models.Q(deleted_at__isnull=False), name='task_deleted_idx'),
+        ]
+
+
+class SubtaskManager(models.Manager):
+    def get_queryset(self):
+        # Subtasks are only read through a board or task that was found
+        # live, so the board isn't checked again.
+        return super().get_queryset().filter(task__deleted_at=None)
 
 
 class Subtask(models.Model):
     title = models.CharField(max_length=255)
-    task = models.ForeignKey(Task, related_name='subtasks', on_delete=models.CASCADE)
+    task = models.ForeignKey(Task, related_name='subtasks', on_delete=models.DO_NOTHING, db_index=False)
     status = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    last_modified = models.DateTimeField(auto_now=True)
\ No newline at end of file
+    last_modified = models.DateTimeField(auto_now=True)
+
+    objects = SubtaskManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['task', 'id'], name='subtask_task_id_idx'),
+            models.Index(fields=['task'], condition=models.Q(status=False), name='subtask_incomplete_idx'),
+        ]
+
+
+class ArchivedTaskManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(column__board__deleted_at=None)
+
+
+class ArchivedTask(models.Model):
+    """
+    A finished task moved out of the live tables by the archive_tasks
+    command, see archiving.py, so the board queries and their indexes
+    only ever see live tasks. It keeps the id of the task, and gets it
+    back when restored.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    # Cascaded by the database like Task.column (see migration 0010).
+    column = models.ForeignKey(Column, related_name='archived_tasks', on_delete=models.DO_NOTHING, db_index=False)
+    total_subtasks = models.PositiveIntegerField(default=0)
+    completed_subtasks = models.PositiveIntegerField(default=0)
+    subtask_titles = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField()
+    last_modified = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    objects = ArchivedTaskManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Also serves the plain column lookups of cascades and purges.
+            models.Index(fields=['column', 'archived_at', 'id'], name='archived_task_column_idx'),
+        ]
+
+
+class ArchivedSubtask(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    task = models.ForeignKey(ArchivedTask, related_name='subtasks', on_delete=models.DO_NOTHING, db_index=False)
+    status = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    last_modified = models.DateTimeField()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['task', 'id'], name='archived_subtask_task_id_idx'),
+        ]
+
+
+class Tombstone(models.Model):
+    """
+    A column, task or subtask that left a board, kept so clients syncing
+    changes learn about it. Written by database triggers (see migration
+    0006), so rows deleted through cascades or moved to another board are
+    recorded too.
+    """
+    COLUMN = 'column'
+    TASK = 'task'
+    SUBTASK = 'subtask'
+    KIND_CHOICES = [(COLUMN, 'Column'), (TASK, 'Task'), (SUBTASK, 'Subtask')]
+
+    # Not a foreign key: the board may be gone as well.
+    board_id = models.BigIntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board_id', 'deleted_at'], name='tombstone_board_deleted_idx'),
+        ]
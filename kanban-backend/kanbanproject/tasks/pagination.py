@@ -0,0 +1,191 @@
+import base64
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .constants import INVALID_CURSOR, INVALID_ORDERING
+
+
+def encode_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError):
+        raise NotFound(INVALID_CURSOR)
+
+
+def estimated_count(model) -> int | None:
+    """
+    Approximate row count taken from the planner statistics of the
+    model's table, or None if the table has never been analyzed. It
+    counts every row of the table, so rows its default manager hides,
+    such as deleted boards awaiting their purge, are included.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over a fixed set of orderings. Every ordering ends
+    with the primary key so the position is always unique, and the cursor
+    is an opaque encoding of the last row's ordering values.
+    """
+    page_size = 100
+    max_page_size = 1_000
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    count_query_param = 'count'
+    orderings = {
+        'id': ('id',),
+        '-id': ('-id',),
+        'last_modified': ('last_modified', 'id'),
+        '-last_modified': ('-last_modified', '-id'),
+    }
+    default_ordering = 'id'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = self.get_page_queryset(queryset, request)
+        if self.count_requested:
+            self.count = estimated_count(queryset.model)
+        return self.set_page(list(page))
+
+    def get_page_queryset(self, queryset, request):
+        """
+        The unevaluated queryset of the requested page, for callers that
+        fetch the rows themselves and pass them to `set_page`.
+        """
+        self.request = request
+        self.ordering_name = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        if self.ordering_name not in self.orderings:
+            raise NotFound(INVALID_ORDERING)
+        self.ordering = self.orderings[self.ordering_name]
+        self.page_size = self.get_page_size(request)
+        self.count_requested = request.query_params.get(self.count_query_param) == 'estimate'
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.get_position_filter(cursor))
+
+        # Fetch one extra row to know whether there is a next page.
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows: list):
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_position_filter(self, cursor: str) -> Q:
+        payload = decode_cursor(cursor)
+        if not isinstance(payload, dict) or payload.get('o') != self.ordering_name:
+            raise NotFound(INVALID_CURSOR)
+        values = payload.get('v')
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(INVALID_CURSOR)
+
+        fields = [field.lstrip('-') for field in self.ordering]
+        try:
+            values = [self.from_cursor_value(field, value) for field, value in zip(fields, values)]
+        except (TypeError, ValueError):
+            raise NotFound(INVALID_CURSOR)
+
+        # Lexicographic "after" comparison: (a > x) OR (a = x AND b > y) ...
+        position = Q()
+        for index, ordering in enumerate(self.ordering):
+            lookup = 'lt' if ordering.startswith('-') else 'gt'
+            condition = Q(**{f'{fields[index]}__{lookup}': values[index]})
+            for field, value in zip(fields[:index], values[:index]):
+                condition &= Q(**{field: value})
+            position |= condition
+        return position
+
+    def from_cursor_value(self, field: str, value):
+        if field == 'id':
+            return int(value)
+        return datetime.fromisoformat(value)
+
+    def to_cursor_value(self, field: str, row):
+        value = getattr(row, field)
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    def get_cursor(self, row) -> str:
+        """Cursor of the position right after `row`."""
+        values = [self.to_cursor_value(field.lstrip('-'), row) for field in self.ordering]
+        return encode_cursor({'o': self.ordering_name, 'v': values})
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        cursor = self.get_cursor(self.last)
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data) -> dict:
+        content = {'next': self.get_next_link(), 'results': data}
+        if self.count_requested:
+            content['count_estimate'] = self.count
+        return content
+
+
+class ColumnTaskPagination(KeysetPagination):
+    """
+    The tasks of a column in rank order. Its first page is the window of
+    tasks the board documents carry for each column, see fieldsets.py.
+    """
+    page_size = getattr(settings, 'TASKS_COLUMN_TASK_WINDOW', 50)
+    orderings = {
+        'rank': ('rank', 'id'),
+    }
+    default_ordering = 'rank'
+    # Columns carry their task_count.
+    count_query_param = None
+
+    def __init__(self):
+        # Board documents position cursors without a request.
+        self.ordering_name = self.default_ordering
+        self.ordering = self.orderings[self.default_ordering]
+
+    def from_cursor_value(self, field: str, value):
+        if field == 'rank':
+            if not isinstance(value, str):
+                raise TypeError(value)
+            return value
+        return super().from_cursor_value(field, value)
+
+
+class ArchivedTaskPagination(KeysetPagination):
+    """The archived tasks of a board, most recently archived first by default."""
+    orderings = {
+        '-archived_at': ('-archived_at', '-id'),
+        'archived_at': ('archived_at', 'id'),
+    }
+    default_ordering = '-archived_at'
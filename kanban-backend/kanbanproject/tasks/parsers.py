@@ -0,0 +1,26 @@
+import codecs
+import io
+
+from rest_framework.parsers import JSONParser, get_encoding
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """
+    Parses UTF-8 JSON with orjson. Bodies orjson rejects, such as integers
+    beyond 64 bits or lone surrogates, are parsed again by JSONParser, which
+    accepts or rejects them as before.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or codecs.lookup(get_encoding(parser_context or {})).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        content = stream.read()
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(content), media_type, parser_context)
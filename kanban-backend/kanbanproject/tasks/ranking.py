@@ -0,0 +1,171 @@
+"""
+Lexicographic fractional ranks for ordering tasks within a column.
+
+A rank is the fractional part of a base-36 number written with the digits
+below, without trailing zeros, so comparing two ranks as byte strings
+compares the numbers they represent. There is always a rank between any
+two ranks, which makes moving a task a single-row write.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .constants import TASK_RANK_MAX_LENGTH
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Appended ranks are spaced one unit apart at this many digits.
+APPEND_WIDTH = 6
+
+# Ranks longer than this trigger a background rebalance of their column.
+RANK_REBALANCE_LENGTH = getattr(settings, 'TASKS_RANK_REBALANCE_LENGTH', 24)
+
+logger = logging.getLogger(__name__)
+
+
+def to_rank(value: int, width: int) -> str:
+    """Rank of the fraction `value / BASE ** width`."""
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)).rstrip(DIGITS[0])
+
+
+def is_rank(value) -> bool:
+    """Whether `value` is a well-formed rank that fits a task row."""
+    return (
+        isinstance(value, str) and 0 < len(value) <= TASK_RANK_MAX_LENGTH
+        and not value.endswith(DIGITS[0]) and all(digit in DIGITS for digit in value)
+    )
+
+
+def midpoint(lower: str, upper: str | None) -> str:
+    """
+    Return a rank strictly between `lower` and `upper`. An empty `lower`
+    stands for 0 and a None `upper` for 1.
+    """
+    if upper is not None:
+        if lower >= upper:
+            raise ValueError(f'{lower!r} is not lower than {upper!r}')
+        # Keep the common prefix and find the midpoint of what follows it.
+        n = 0
+        while n < len(upper) and (lower[n] if n < len(lower) else '0') == upper[n]:
+            n += 1
+        if n > 0:
+            return upper[:n] + midpoint(lower[n:], upper[n:])
+
+    lower_digit = DIGITS.index(lower[0]) if lower else 0
+    upper_digit = DIGITS.index(upper[0]) if upper is not None else BASE
+    if upper_digit - lower_digit > 1:
+        return DIGITS[(lower_digit + upper_digit + 1) // 2]
+    if upper is not None and len(upper) > 1:
+        return upper[:1]
+    return DIGITS[lower_digit] + midpoint(lower[1:], None)
+
+
+def rank_after(rank: str | None) -> str:
+    """
+    Return a rank greater than `rank`, which must be the greatest rank in
+    its column. Appends step by one unit in the last of APPEND_WIDTH digits
+    instead of halving the space left, so they keep ranks short.
+    """
+    if not rank:
+        return midpoint('', None)
+    width = max(len(rank), APPEND_WIDTH)
+    value = 0
+    for digit in rank.ljust(width, DIGITS[0]):
+        value = value * BASE + DIGITS.index(digit)
+    if value + 1 >= BASE ** width:
+        return midpoint(rank, None)
+
+    return to_rank(value + 1, width)
+
+
+def rank_between(lower: str | None, upper: str | None) -> str:
+    if upper is None:
+        return rank_after(lower)
+    return midpoint(lower or '', upper)
+
+
+def spaced_ranks(count: int) -> list[str]:
+    """Return `count` increasing ranks spread evenly over the whole range."""
+    width = 1
+    while BASE ** width < (count + 1) * BASE:
+        width += 1
+    step = BASE ** width // (count + 1)
+
+    return [to_rank(position * step, width) for position in range(1, count + 1)]
+
+
+def append_rank(column_id: int) -> str:
+    """Rank placing a new task at the end of a column."""
+    return append_ranks(column_id, 1)[0]
+
+
+def append_ranks(column_id: int, count: int, exclude=()) -> list[str]:
+    """
+    Ranks placing `count` tasks at the end of a column, in order. Tasks in
+    `exclude` are about to be ranked again and don't count as the end.
+    """
+    from .models import Task
+
+    rank = (
+        Task.objects.filter(column_id=column_id).exclude(pk__in=exclude)
+        .order_by('-rank', '-id').values_list('rank', flat=True).first()
+    )
+    ranks = []
+    for _ in range(count):
+        rank = rank_after(rank)
+        ranks.append(rank)
+    return ranks
+
+
+def needs_rebalance(rank: str) -> bool:
+    return len(rank) > RANK_REBALANCE_LENGTH
+
+
+def rebalance_column(column_id: int):
+    """Rewrite the ranks of a column's tasks evenly spaced, keeping their order."""
+    from .models import Column, Task
+    from .views import boards_changed
+
+    with transaction.atomic():
+        task_ids = list(
+            # Only the tasks: the managers join their column and board.
+            Task.objects.select_for_update(of=('self',)).filter(column_id=column_id)
+            .order_by('rank', 'id').values_list('id', flat=True)
+        )
+        if not task_ids:
+            return
+        ranks = spaced_ranks(len(task_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {Task._meta.db_table} t SET rank = r.rank, last_modified = %s '
+                f'FROM unnest(%s::bigint[], %s::varchar[]) AS r(id, rank) '
+                f'WHERE t.id = r.id',
+                [timezone.now(), task_ids, ranks],
+            )
+        # Board documents carry ranks in their cursors of the next tasks.
+        boards_changed(Column.all_objects.filter(pk=column_id).values_list('board_id', flat=True).get())
+
+
+def run_rebalance(column_id: int):
+    close_old_connections()
+    try:
+        rebalance_column(column_id)
+    except Exception:
+        logger.exception('Rebalancing ranks of column %s failed', column_id)
+    finally:
+        connection.close()
+
+
+def schedule_rebalance(column_id: int):
+    """Rebalance a column in a background thread once the current transaction commits."""
+    transaction.on_commit(
+        lambda: threading.Thread(target=run_rebalance, args=(column_id,), daemon=True).start()
+    )
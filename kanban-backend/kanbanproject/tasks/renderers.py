@@ -0,0 +1,61 @@
+"""
+JSON rendering with orjson, falling back to DRF's JSONRenderer whenever
+the output could differ from it, so responses stay byte for byte the
+same. The one exception is NaN and infinity, which JSONRenderer refuses
+to render and orjson renders as null; serializers don't produce them.
+
+Used as the default renderer of the tasks API. Without orjson installed
+it is DRF's renderer.
+"""
+import re
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Start of an exponent; one that follows a digit is a float orjson writes
+# differently from repr(), without the sign or padding (1e16, 2.5e-7).
+EXPONENT = re.compile(rb'e[-\d]')
+
+
+def has_mismatched_float(content: bytes) -> bool:
+    """
+    Whether `content` may hold a float orjson writes differently from the
+    stdlib: in exponent form, or below 1e-4 in positional form. Strings
+    can match too; those responses just take the slow path. Searches for
+    literals first, a character class up front makes re scan byte by byte.
+    """
+    if b'0.0000' in content:
+        return True
+    for match in EXPONENT.finditer(content):
+        if content[match.start() - 1:match.start()].isdigit():
+            return True
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            # Datetimes and dataclasses go through DRF's encoder to keep its
+            # formats; non-string keys, big integers and anything else orjson
+            # rejects fall back to the stdlib.
+            content = orjson.dumps(
+                data,
+                default=JSONEncoder().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if has_mismatched_float(content):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, so the output is valid JavaScript.
+        return content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,48 @@
+"""
+Full-text task search. Tasks carry a stored tsvector over their title,
+description and subtask titles, weighted in that order and indexed with
+GIN, so a search is an index scan followed by ranking the matches.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from .constants import TASK_SEARCH_CONFIG
+from .models import Task
+from .pagination import KeysetPagination
+
+
+def search_tasks(text: str, board_id: int | None = None, column_id: int | None = None):
+    """
+    Tasks matching `text`, in web search syntax (quoted phrases, `or`,
+    `-word`), annotated with their `relevance` and `board`.
+    """
+    query = SearchQuery(text, config=TASK_SEARCH_CONFIG, search_type='websearch')
+    queryset = Task.objects.filter(search_vector=query)
+    if board_id is not None:
+        queryset = queryset.filter(column__board_id=board_id)
+    if column_id is not None:
+        queryset = queryset.filter(column_id=column_id)
+    return queryset.annotate(
+        # ts_rank is a real; as a double it survives the round trip
+        # through a cursor exactly.
+        relevance=Cast(SearchRank(F('search_vector'), query), FloatField()),
+        board=F('column__board_id'),
+    ).only('id', 'title', 'column_id', 'total_subtasks', 'completed_subtasks')
+
+
+class SearchPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
+    orderings = {
+        'relevance': ('-relevance', 'id'),
+        'id': ('id',),
+    }
+    default_ordering = 'relevance'
+    # The table's estimate says nothing about the number of matches.
+    count_query_param = None
+
+    def from_cursor_value(self, field: str, value):
+        if field == 'relevance':
+            return float(value)
+        return super().from_cursor_value(field, value)
@@ -0,0 +1,61 @@
+from django.utils import timezone
+
+from .deletion import purge_board
+from .models import Board, Column, Task, Subtask
+from .ranking import spaced_ranks
+from .transfer import copy_rows, reserve_ids
+
+# Named dataset sizes: (boards, columns per board, tasks per column, subtasks per task).
+SCALES = {
+    'small': (1, 5, 20, 3),
+    'medium': (1, 10, 200, 5),
+    'large': (1, 50, 2_000, 10),
+    'many-boards': (200, 5, 20, 3),
+}
+
+
+def seed_board(columns: int, tasks: int, subtasks: int, name: str = 'Seeded Board') -> Board:
+    """
+    Create a board with `columns` columns, `tasks` tasks per column and
+    `subtasks` subtasks per task. Rows are loaded with COPY one column at
+    a time, and their content only depends on the arguments.
+    """
+    board = Board.objects.create(name=name)
+    now = timezone.now()
+    column_ids = reserve_ids(Column, columns)
+    copy_rows(
+        Column,
+        ('id', 'board', 'name', 'created_at', 'last_modified'),
+        [(id, board.id, f'Column {i}', now, now) for i, id in enumerate(column_ids)],
+    )
+
+    ranks = spaced_ranks(tasks)
+    subtask_titles = ' '.join(f'Subtask {i}' for i in range(subtasks))
+    for column_id in column_ids:
+        task_ids = reserve_ids(Task, tasks)
+        copy_rows(
+            Task,
+            (
+                'id', 'column', 'title', 'description', 'rank', 'total_subtasks', 'completed_subtasks',
+                'subtask_titles', 'created_at', 'last_modified',
+            ),
+            [
+                (
+                    id, column_id, f'Task {i}', f'Description of task {i}.', ranks[i], subtasks,
+                    (subtasks + 1) // 2, subtask_titles, now, now,
+                )
+                for i, id in enumerate(task_ids)
+            ],
+        )
+        copy_rows(
+            Subtask,
+            ('task', 'title', 'status', 'created_at', 'last_modified'),
+            [(task_id, f'Subtask {i}', i % 2 == 0, now, now) for task_id in task_ids for i in range(subtasks)],
+        )
+    return board
+
+
+def delete_seeded_board(board_id: int):
+    """Delete a board at once, rather than leaving the purge to a background thread."""
+    Board.objects.filter(pk=board_id).update(deleted_at=timezone.now())
+    purge_board(board_id)
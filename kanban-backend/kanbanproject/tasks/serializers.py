@@ -1,19 +1,35 @@
 from rest_framework import serializers
+from django.contrib.postgres.aggregates import StringAgg
 from django.core.validators import MaxLengthValidator
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-from .models import Board, Column, Task, Subtask
+from .models import ArchivedSubtask, ArchivedTask, Board, Column, Task, Subtask
+from .pagination import ColumnTaskPagination
 from .constants import (
     BOARD_NAME_MAX_LENGTH, BOARD_NAME_MAX_LENGTH_ERROR,
     COLUMN_NAME_MAX_LENGTH, COLUMN_NAME_MAX_LENGTH_ERROR,
     TASK_TITLE_MAX_LENGTH, TASK_TITLE_MAX_LENGTH_ERROR,
-    SUBTASK_NAME_MAX_LENGTH, SUBTASK_NAME_MAX_LENGTH_ERROR
+    SUBTASK_NAME_MAX_LENGTH, SUBTASK_NAME_MAX_LENGTH_ERROR,
+    TASK_NEIGHBOR_NOT_IN_COLUMN, TASK_NEIGHBORS_OUT_OF_ORDER,
+    TASK_BULK_MAX_SIZE, TASK_BULK_NOT_FOUND, TASK_BULK_MIXED_BOARDS, TASK_BULK_COLUMN_REQUIRED,
+    TASK_SEARCH_QUERY_MAX_LENGTH,
+    BATCH_MAX_OPERATIONS
 )
 
 class DynamicFieldsModelSerializer(serializers.ModelSerializer):
     """
     A ModelSerializer that takes an additional `fields` argument that
-    controls which fields should be displayed.
+    controls which fields should be displayed: a list of names, or a field
+    tree (see fieldsets.py) that also selects the fields of nested documents.
     """
+    # Serializers of the nested documents rendered by method fields, by
+    # field name. Named by string, as most are defined further down.
+    nested_serializers: dict[str, str] = {}
+    # Paginations of the nested documents that are windowed, by field name.
+    windowed_fields: dict[str, type] = {}
 
     def __init__(self, *args, **kwargs):
         # Don't pass the 'fields' arg up to the superclass
@@ -22,12 +38,53 @@ class DynamicFieldsModelSerializer(serializers.ModelSerializer):
         # Instantiate the superclass normally
         super().__init__(*args, **kwargs)
 
+        self.field_tree = None
         if fields is not None:
-            # Drop any fields that are not specified in the `fields` argument.
-            allowed = set(fields)
-            existing = set(self.fields)
-            for field_name in existing - allowed:
-                self.fields.pop(field_name)
+            self.restrict(fields)
+
+    def restrict(self, fields):
+        if not isinstance(fields, dict):
+            fields = dict.fromkeys(fields)
+        self.field_tree = fields
+
+        # Drop any fields that are not specified in the `fields` argument.
+        allowed = set(fields)
+        existing = set(self.fields)
+        for field_name in existing - allowed:
+            self.fields.pop(field_name)
+
+        # Nested serializers declared as fields are restricted in place.
+        for field_name, subtree in fields.items():
+            field = self.fields.get(field_name)
+            child = getattr(field, 'child', field)
+            if subtree is not None and isinstance(child, DynamicFieldsModelSerializer):
+                child.restrict(subtree)
+
+    def update(self, instance, validated_data):
+        # Only the written fields are saved: the version, rank, counters
+        # and deleted_at of the loaded row may have been moved since by
+        # other writes, which a full save would undo.
+        for field_name, value in validated_data.items():
+            setattr(instance, field_name, value)
+        instance.save(update_fields=[*validated_data, 'last_modified'])
+        return instance
+
+    def get_nested_serializer(self, field_name: str):
+        """Serializer class of the nested document in `field_name`, or None for a plain field."""
+        field = self.fields[field_name]
+        if isinstance(field, serializers.BaseSerializer):
+            return type(getattr(field, 'child', field))
+        if field_name in self.nested_serializers:
+            return globals()[self.nested_serializers[field_name]]
+        return None
+
+    def get_nested_fields(self, field_name: str):
+        """Fields selected in the nested document of `field_name`, None for all of them."""
+        return None if self.field_tree is None else self.field_tree.get(field_name)
+
+    def nested_data(self, field_name: str, instances):
+        serializer_class = self.get_nested_serializer(field_name)
+        return serializer_class(instances, many=True, fields=self.get_nested_fields(field_name)).data
 
 
 class BoardSerializer(DynamicFieldsModelSerializer):    
@@ -40,49 +97,148 @@ class BoardSerializer(DynamicFieldsModelSerializer):
         model = Board
         fields = ['id', 'name', 'columns', 'created_at', 'last_modified']
         read_only_fields = ['created_at', 'last_modified']
+    nested_serializers = {'columns': 'ColumnSerializer'}
 
     def get_columns(self, board):
-        columns = Column.objects.filter(board=board)
-        serializer = ColumnSerializer(columns, many=True)
-        return serializer.data
+        # Related managers read from the prefetch cache when present.
+        return self.nested_data('columns', board.columns.all())
+
+
+class BoardChangeSerializer(DynamicFieldsModelSerializer):
+    class Meta:
+        model = Board
+        fields = ['id', 'name', 'created_at', 'last_modified']
+
+
+class ColumnChangeSerializer(DynamicFieldsModelSerializer):
+    class Meta:
+        model = Column
+        fields = ['id', 'name', 'created_at', 'last_modified']
+
+
+class TaskChangeSerializer(DynamicFieldsModelSerializer):
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'title', 'description', 'column', 'rank', 'total_subtasks', 'completed_subtasks',
+            'created_at', 'last_modified',
+        ]
 
 
-class ColumnListSerializer(serializers.ListSerializer):
+class SubtaskChangeSerializer(DynamicFieldsModelSerializer):
+    class Meta:
+        model = Subtask
+        fields = ['id', 'title', 'status', 'task', 'created_at', 'last_modified']
+
+
+class BoardCloneSerializer(serializers.Serializer):
+    """Options for copying a board. The copy keeps the board's name unless given one."""
+    name = serializers.CharField(
+        required=False,
+        validators=[MaxLengthValidator(limit_value=BOARD_NAME_MAX_LENGTH, message=BOARD_NAME_MAX_LENGTH_ERROR)]
+    )
+    reset_status = serializers.BooleanField(default=False)
+    include_tasks = serializers.BooleanField(default=True)
+
+
+class BulkDiffListSerializer(serializers.ListSerializer):
+    """
+    A ListSerializer that applies a list of items against the existing rows
+    in set-based form: one bulk_update for the rows whose values changed,
+    one DELETE for the rows missing from the data and one bulk_create for
+    the items without an id, all inside a single transaction.
+    """
+    # Context key holding the parent instance, which is also the FK field name.
+    parent_field: str
+    update_fields: tuple[str, ...]
+
     def create(self, validated_data):
-        columns = [Column(board=self.context['board'], **item) for item in validated_data]
-        return Column.objects.bulk_create(columns)
+        model = self.child.Meta.model
+        parent = self.context[self.parent_field]
+        return model.objects.bulk_create([model(**{self.parent_field: parent}, **item) for item in validated_data])
 
     def update(self, instance, validated_data):
-        # Maps for id->instance and id->data item.        
-        column_mapping: dict[int, Column] = {column.id: column for column in instance}
+        model = self.child.Meta.model
+        parent = self.context[self.parent_field]
+
+        # Maps for id->instance and id->data item.
+        row_mapping = {row.id: row for row in instance}
         data_mapping = {item['id']: item for item in validated_data if 'id' in item}
 
-        for column_id, column in column_mapping.items():
-            data = data_mapping.get(column_id)
-            if data:
-                column.name = data.get('name', column.name)
-                column.save()
-            else:
-                column.delete()
-                
-        new_columns = [Column(board=self.context['board'], **item) for item in validated_data if 'id' not in item]
-        Column.objects.bulk_create(new_columns)
-        
+        now = timezone.now()
+        changed_rows = []
+        # What was written, kept for callers: id -> changed values.
+        self.row_changes = {}
+        for row_id, row in row_mapping.items():
+            data = data_mapping.get(row_id)
+            if not data:
+                continue
+            changes = {
+                field: data[field] for field in self.update_fields
+                if field in data and data[field] != getattr(row, field)
+            }
+            if changes:
+                for field, value in changes.items():
+                    setattr(row, field, value)
+                # bulk_update doesn't go through save(), so auto_now isn't applied.
+                row.last_modified = now
+                changed_rows.append(row)
+                self.row_changes[row_id] = changes
+
+        removed_ids = [row_id for row_id in row_mapping if row_id not in data_mapping]
+        new_rows = [model(**{self.parent_field: parent}, **item) for item in validated_data if 'id' not in item]
+        self.removed_ids = removed_ids
+        self.created_rows = new_rows
+
+        # The rows were found through their parent, so writes go to them
+        # by primary key without the managers' filters.
+        with transaction.atomic():
+            if changed_rows:
+                model.all_objects.bulk_update(changed_rows, [*self.update_fields, 'last_modified'])
+            if removed_ids:
+                self.delete_rows(removed_ids)
+            if new_rows:
+                model.objects.bulk_create(new_rows)
+            self.rows_changed(parent)
+
         return instance
 
+    def delete_rows(self, ids: list[int]):
+        self.child.Meta.model.all_objects.filter(id__in=ids).delete()
+
+    def rows_changed(self, parent):
+        """Hook called inside the update transaction once the rows are written."""
+        pass
+
+
+class ColumnListSerializer(BulkDiffListSerializer):
+    parent_field = 'board'
+    update_fields = ('name',)
 
-class ColumnSerializer(serializers.ModelSerializer):    
+    def delete_rows(self, ids: list[int]):
+        # Children first: the database cascade would delete them after
+        # their column, when the tombstone triggers can't find the board.
+        Subtask.all_objects.filter(task__column__in=ids).delete()
+        Task.all_objects.filter(column__in=ids).delete()
+        super().delete_rows(ids)
+
+
+class ColumnSerializer(DynamicFieldsModelSerializer):    
     id = serializers.IntegerField()
     name = serializers.CharField(
         validators=[MaxLengthValidator(limit_value=COLUMN_NAME_MAX_LENGTH, message=COLUMN_NAME_MAX_LENGTH_ERROR)]
     )
     tasks = serializers.SerializerMethodField()
+    # Set when the tasks are loaded as a window, see fieldsets.py.
+    tasks_cursor = serializers.CharField(read_only=True, allow_null=True)
 
     class Meta:
         model = Column
-        fields = ['id', 'name', 'tasks', 'created_at', 'last_modified']
-        read_only_fields = ['tasks', 'created_at', 'last_modified']
+        fields = ['id', 'name', 'tasks', 'task_count', 'tasks_cursor', 'created_at', 'last_modified']
+        read_only_fields = ['tasks', 'task_count', 'created_at', 'last_modified']
         list_serializer_class = ColumnListSerializer
+    nested_serializers = {'tasks': 'TaskSummarySerializer'}
+    windowed_fields = {'tasks': ColumnTaskPagination}
 
     def get_fields(self):
         fields = super().get_fields()
@@ -92,12 +248,9 @@ class ColumnSerializer(serializers.ModelSerializer):
         return fields
     
     def get_tasks(self, column):
-        tasks = Task.objects.filter(column=column)
-        serializer = TaskSummarySerializer(tasks, many=True)
-        return serializer.data
-
+        return self.nested_data('tasks', column.tasks.all())
 
-class TaskSerializer(serializers.ModelSerializer):    
+class TaskSerializer(DynamicFieldsModelSerializer):    
     title = serializers.CharField(
         validators=[MaxLengthValidator(limit_value=TASK_TITLE_MAX_LENGTH, message=TASK_TITLE_MAX_LENGTH_ERROR)]
     )
@@ -107,52 +260,158 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = ['id', 'title', 'description', 'column', 'subtasks', 'created_at', 'last_modified']
         read_only_fields = ['created_at', 'last_modified']
+    nested_serializers = {'subtasks': 'SubtaskSerializer'}
 
     def get_subtasks(self, task):
-        subtasks = Subtask.objects.filter(task=task)
-        serializer = SubtaskSerializer(subtasks, many=True)
-        return serializer.data
+        return self.nested_data('subtasks', task.subtasks.all())
+
+
+class TaskMoveSerializer(serializers.Serializer):
+    """
+    Target position of the task in the `task` context: a column and the
+    tasks it should end up between. Without neighbors the task goes to
+    the end of the column.
+    """
+    column = serializers.PrimaryKeyRelatedField(queryset=Column.objects.all(), required=False)
+    after = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all(), required=False, allow_null=True)
+    before = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all(), required=False, allow_null=True)
+
+    def get_column_id(self, data) -> int:
+        return data['column'].id if 'column' in data else self.context['task'].column_id
+
+    def validate(self, data):
+        task = self.context['task']
+        column_id = self.get_column_id(data)
+        after, before = data.get('after'), data.get('before')
+
+        for neighbor in (after, before):
+            if neighbor is not None and (neighbor.column_id != column_id or neighbor.id == task.id):
+                raise serializers.ValidationError(TASK_NEIGHBOR_NOT_IN_COLUMN)
+        if after is not None and before is not None and (after.rank, after.id) >= (before.rank, before.id):
+            raise serializers.ValidationError(TASK_NEIGHBORS_OUT_OF_ORDER)
+        return data
+
+    def neighbor_ranks(self) -> tuple[str | None, str | None]:
+        """Ranks right below and right above the target position."""
+        after, before = self.validated_data.get('after'), self.validated_data.get('before')
+        if after is not None and before is not None:
+            return after.rank, before.rank
+
+        others = Task.objects.filter(column_id=self.get_column_id(self.validated_data)).exclude(pk=self.context['task'].pk)
+        if after is not None:
+            upper = others.filter(Q(rank__gt=after.rank) | Q(rank=after.rank, id__gt=after.id))
+            return after.rank, upper.order_by('rank', 'id').values_list('rank', flat=True).first()
+        if before is not None:
+            lower = others.filter(Q(rank__lt=before.rank) | Q(rank=before.rank, id__lt=before.id))
+            return lower.order_by('-rank', '-id').values_list('rank', flat=True).first(), before.rank
+        return others.order_by('-rank', '-id').values_list('rank', flat=True).first(), None
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    """
+    An operation over many tasks of one board: move them to the end of
+    `column`, or delete them. Validation resolves the tasks' board and
+    leaves the deduplicated ids in `ids` and the board in `board_id`.
+    """
+    MOVE = 'move'
+    DELETE = 'delete'
+
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=TASK_BULK_MAX_SIZE)
+    op = serializers.ChoiceField(choices=[MOVE, DELETE])
+    column = serializers.PrimaryKeyRelatedField(queryset=Column.objects.all(), required=False)
+
+    def validate(self, data):
+        if data['op'] == self.MOVE and 'column' not in data:
+            raise serializers.ValidationError({'column': TASK_BULK_COLUMN_REQUIRED})
 
+        ids = list(dict.fromkeys(data['ids']))
+        board_ids = dict(Task.objects.filter(pk__in=ids).values_list('id', 'column__board_id'))
+        if len(board_ids) != len(ids):
+            raise serializers.ValidationError({'ids': TASK_BULK_NOT_FOUND})
+        if len(set(board_ids.values())) > 1:
+            raise serializers.ValidationError({'ids': TASK_BULK_MIXED_BOARDS})
 
-class TaskSummarySerializer(serializers.ModelSerializer):
+        data['ids'] = ids
+        data['board_id'] = board_ids[ids[0]]
+        return data
+
+
+class TaskSummarySerializer(DynamicFieldsModelSerializer):
     subtasks = serializers.SerializerMethodField()
     
     class Meta:
         model = Task
         fields = ['id', 'title', 'subtasks']        
+    nested_serializers = {'subtasks': 'SubtaskSummarySerializer'}
 
     def get_subtasks(self, task):
-        subtasks = Subtask.objects.filter(task=task)
-        serializer = SubtaskSummarySerializer(subtasks, many=True)
-        return serializer.data
+        return self.nested_data('subtasks', task.subtasks.all())
 
 
-class SubtaskListSerializer(serializers.ListSerializer):
-    def create(self, validated_data):
-        subtasks = [Subtask(task=self.context['task'], **item) for item in validated_data]
-        return Subtask.objects.bulk_create(subtasks)
+class TaskProgressSerializer(DynamicFieldsModelSerializer):
+    class Meta:
+        model = Task
+        fields = ['id', 'title', 'total_subtasks', 'completed_subtasks']
 
-    def update(self, instance, validated_data):
-        # Maps for id->instance and id->data item.        
-        subtask_mapping: dict[int, Subtask] = {subtask.id: subtask for subtask in instance}
-        data_mapping = {item['id']: item for item in validated_data if 'id' in item}
 
-        for subtask_id, subtask in subtask_mapping.items():
-            data = data_mapping.get(subtask_id)
-            if data:
-                subtask.title = data.get('title', subtask.title)
-                subtask.status = data.get('status', subtask.status)
-                subtask.save()
-            else:
-                subtask.delete()
-                
-        new_subtasks = [Subtask(task=self.context['task'], **item) for item in validated_data if 'id' not in item]
-        Subtask.objects.bulk_create(new_subtasks)
-        
-        return instance
+class TaskSearchSerializer(serializers.Serializer):
+    """Query parameters of a task search."""
+    q = serializers.CharField(max_length=TASK_SEARCH_QUERY_MAX_LENGTH)
+    board = serializers.IntegerField(required=False)
+    column = serializers.IntegerField(required=False)
+
+
+class TaskSearchResultSerializer(DynamicFieldsModelSerializer):
+    board = serializers.IntegerField(read_only=True)
+    relevance = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'title', 'column', 'board', 'total_subtasks', 'completed_subtasks', 'relevance']
+
+
+class ColumnProgressSerializer(DynamicFieldsModelSerializer):
+    tasks = TaskProgressSerializer(many=True, read_only=True)
+    tasks_cursor = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Column
+        fields = ['id', 'name', 'tasks', 'task_count', 'tasks_cursor', 'created_at', 'last_modified']
+    windowed_fields = {'tasks': ColumnTaskPagination}
+
+
+class BoardProgressSerializer(DynamicFieldsModelSerializer):
+    """
+    Board detail whose task cards carry subtask progress counters instead
+    of the subtasks themselves.
+    """
+    columns = ColumnProgressSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Board
+        fields = ['id', 'name', 'columns', 'created_at', 'last_modified']
+
+
+class SubtaskListSerializer(BulkDiffListSerializer):
+    parent_field = 'task'
+    update_fields = ('title', 'status')
+
+    def rows_changed(self, task):
+        # Recount in the same statement that stores the counters, and
+        # collect the titles the task's search vector covers.
+        subtasks = Subtask.objects.filter(task=OuterRef('pk')).order_by().values('task')
+        Task.all_objects.filter(pk=task.pk).update(
+            total_subtasks=Coalesce(Subquery(subtasks.annotate(count=Count('id')).values('count')), 0),
+            completed_subtasks=Coalesce(
+                Subquery(subtasks.filter(status=True).annotate(count=Count('id')).values('count')), 0
+            ),
+            subtask_titles=Coalesce(
+                Subquery(subtasks.annotate(titles=StringAgg('title', ' ', ordering='id')).values('titles')), Value('')
+            ),
+        )
 
 
-class SubtaskSerializer(serializers.ModelSerializer):    
+class SubtaskSerializer(DynamicFieldsModelSerializer):    
     id = serializers.IntegerField()
     title = serializers.CharField(
         validators=[MaxLengthValidator(limit_value=SUBTASK_NAME_MAX_LENGTH, message=SUBTASK_NAME_MAX_LENGTH_ERROR)]
@@ -172,7 +431,40 @@ class SubtaskSerializer(serializers.ModelSerializer):
         return fields
 
 
-class SubtaskSummarySerializer(serializers.ModelSerializer):    
+class SubtaskSummarySerializer(DynamicFieldsModelSerializer):    
     class Meta:
         model = Subtask
         fields = ['id', 'title', 'status']
+
+
+class ArchivedTaskSerializer(DynamicFieldsModelSerializer):
+    subtasks = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedTask
+        fields = ['id', 'title', 'description', 'column', 'subtasks', 'created_at', 'last_modified', 'archived_at']
+    nested_serializers = {'subtasks': 'ArchivedSubtaskSerializer'}
+
+    def get_subtasks(self, task):
+        return self.nested_data('subtasks', task.subtasks.all())
+
+
+class ArchivedSubtaskSerializer(DynamicFieldsModelSerializer):
+    class Meta:
+        model = ArchivedSubtask
+        fields = ['id', 'title', 'status']
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['POST', 'PATCH', 'DELETE'])
+    path = serializers.CharField()
+    body = serializers.DictField(required=False, default=dict)
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    An ordered list of writes against the board and task endpoints. A
+    string `$<index>.<key>[.<key>...]` in a path or body stands for a value
+    from the response of an earlier operation, e.g. `$0.columns.1.id`.
+    """
+    operations = BatchOperationSerializer(many=True, allow_empty=False, max_length=BATCH_MAX_OPERATIONS)
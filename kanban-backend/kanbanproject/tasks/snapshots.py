@@ -0,0 +1,143 @@
+from django.db import connection
+from django.utils import timezone
+
+from .models import Board, Column, Task, Subtask
+from .pagination import ColumnTaskPagination
+
+
+def _timestamp(column: str) -> str:
+    """
+    SQL expression rendering a timestamptz column exactly like DRF's
+    DateTimeField does: ISO 8601 in the current timezone, microseconds
+    only when non-zero and `Z` instead of `+00:00`.
+    """
+    local = f"({column} AT TIME ZONE %(tz)s)"
+    offset = f"({local} - ({column} AT TIME ZONE 'UTC'))"
+    return (
+        f"to_char({local}, 'YYYY-MM-DD\"T\"HH24:MI:SS')"
+        f" || CASE WHEN to_char({local}, 'US') = '000000' THEN '' ELSE '.' || to_char({local}, 'US') END"
+        f" || CASE WHEN {offset} = INTERVAL '0' THEN 'Z'"
+        f" WHEN {offset} < INTERVAL '0' THEN '-' || to_char(-{offset}, 'HH24:MI')"
+        f" ELSE '+' || to_char({offset}, 'HH24:MI') END"
+    )
+
+
+def _cursor(rank: str, id: str) -> str:
+    """
+    SQL expression encoding the ColumnTaskPagination cursor of the position
+    after a task, like encode_cursor does for ranks in ASCII, which are all
+    the ranks the API assigns.
+    """
+    payload = f"""'{{"o":"rank","v":[' || to_json({rank})::text || ',' || {id} || ']}}'"""
+    # encode() wraps lines; the cursor is unwrapped and URL-safe.
+    return f"translate(encode(convert_to({payload}, 'UTF8'), 'base64'), E'+/\\n', '-_')"
+
+
+def _json(value: str) -> str:
+    """SQL expression of the JSON text of `value`, `null` included."""
+    return f"COALESCE(to_json({value})::text, 'null')"
+
+
+def _object(*members: tuple[str, str]) -> str:
+    """
+    SQL expression writing a JSON object compactly, as JSONRenderer does,
+    from (key, SQL expression of the value's JSON text) pairs in order.
+    """
+    return "'{' || " + " || ',' || ".join(f"'\"{key}\":' || {value}" for key, value in members) + " || '}'"
+
+
+def _array(items: str) -> str:
+    """SQL expression of a JSON array of `items`, comma-joined JSON texts or NULL for none."""
+    return f"'[' || COALESCE({items}, '') || ']'"
+
+
+# Mirrors BoardSerializer -> ColumnSerializer -> TaskSummarySerializer ->
+# SubtaskSummarySerializer, key order and task windows included. Each
+# window is read with a LATERAL index scan and one extra task telling
+# whether the column has more. The JSON is written as text rather than
+# with json_build_object, which puts spaces around its separators, so the
+# document is byte for byte the JSONRenderer output.
+BOARD_SNAPSHOT_SQL = f"""
+WITH board_columns AS (
+    SELECT c.id, c.name, c.task_count, c.created_at, c.last_modified
+    FROM {Column._meta.db_table} c
+    WHERE c.board_id = %(board_id)s
+),
+board_tasks AS (
+    SELECT t.id, t.title, t.column_id, t.rank, t.position
+    FROM board_columns c
+    CROSS JOIN LATERAL (
+        SELECT t.id, t.title, t.column_id, t.rank, row_number() OVER (ORDER BY t.rank, t.id) AS position
+        FROM {Task._meta.db_table} t
+        WHERE t.column_id = c.id AND t.deleted_at IS NULL
+        ORDER BY t.rank, t.id
+        LIMIT %(window)s + 1
+    ) t
+),
+task_subtasks AS (
+    SELECT s.task_id, string_agg(
+        {_object(('id', _json('s.id')), ('title', _json('s.title')), ('status', _json('s.status')))},
+        ',' ORDER BY s.id
+    ) AS items
+    FROM {Subtask._meta.db_table} s
+    JOIN board_tasks t ON t.id = s.task_id AND t.position <= %(window)s
+    GROUP BY s.task_id
+),
+column_tasks AS (
+    SELECT
+        t.column_id,
+        string_agg(
+            {_object(('id', _json('t.id')), ('title', _json('t.title')), ('subtasks', _array('s.items')))},
+            ',' ORDER BY t.rank, t.id
+        ) FILTER (WHERE t.position <= %(window)s) AS items,
+        max({_cursor('t.rank', 't.id')}) FILTER (WHERE t.position = %(window)s) AS cursor,
+        count(*) > %(window)s AS has_next
+    FROM board_tasks t
+    LEFT JOIN task_subtasks s ON s.task_id = t.id
+    GROUP BY t.column_id
+),
+board_columns_json AS (
+    SELECT string_agg(
+        {_object(
+            ('id', _json('c.id')),
+            ('name', _json('c.name')),
+            ('tasks', _array('t.items')),
+            ('task_count', _json('c.task_count')),
+            ('tasks_cursor', _json('CASE WHEN t.has_next THEN t.cursor END')),
+            ('created_at', _json(_timestamp('c.created_at'))),
+            ('last_modified', _json(_timestamp('c.last_modified'))),
+        )},
+        ',' ORDER BY c.id
+    ) AS items
+    FROM board_columns c
+    LEFT JOIN column_tasks t ON t.column_id = c.id
+)
+SELECT {_object(
+    ('id', _json('b.id')),
+    ('name', _json('b.name')),
+    ('columns', _array('(SELECT items FROM board_columns_json)')),
+    ('created_at', _json(_timestamp('b.created_at'))),
+    ('last_modified', _json(_timestamp('b.last_modified'))),
+)}
+FROM {Board._meta.db_table} b
+WHERE b.id = %(board_id)s
+"""
+
+
+def board_snapshot(board_id: int) -> str | None:
+    """
+    Return the board detail document as JSON text built entirely by
+    PostgreSQL, or None if the board does not exist. It is the
+    BoardSerializer document as JSONRenderer renders it.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(BOARD_SNAPSHOT_SQL, {
+            'board_id': board_id,
+            'window': ColumnTaskPagination.page_size,
+            'tz': timezone.get_current_timezone_name(),
+        })
+        row = cursor.fetchone()
+    if not row:
+        return None
+    # Escaped like JSONRenderer does; they can only occur inside strings.
+    return row[0].replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
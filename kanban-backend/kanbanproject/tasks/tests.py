@@ -1,17 +1,56 @@
 from calendar import c
-from datetime import timedelta
+import asyncio
+import io
+import json
+import tempfile
+import unittest
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F, prefetch_related_objects
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
+from django.utils.translation import gettext_lazy
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from rest_framework.exceptions import ValidationError
-
-from .models import Board, Column, Task, Subtask
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from .archiving import archive
+from .cache import board_cache, task_cache
+from .changes import TOMBSTONE_RETENTION, encode_changes_cursor
+from .deletion import purge_board
+from .events import NOTIFY_MAX_PAYLOAD, PostgresBroker, get_broker, split_payloads
+from .fieldsets import parse_fields, prefetch_documents
+from .metrics import prometheus_client
+from .models import ArchivedSubtask, ArchivedTask, Board, Column, Task, Subtask, Tombstone
+from .parsers import FastJSONParser
+from .pagination import ColumnTaskPagination, encode_cursor
 from .serializers import BoardSerializer, ColumnSerializer, TaskSerializer, SubtaskSerializer
+from .renderers import FastJSONRenderer, orjson
+from .ranking import midpoint, rank_after, rebalance_column, spaced_ranks
+from .search import search_tasks
+from .seeding import delete_seeded_board, seed_board
+from .urls import urlpatterns
+from .views import update_board, update_task
+from .transfer import BoardImport, board_lines
 from .constants import (
-    BOARD_NAME_MAX_LENGTH_ERROR, BOARD_NOT_FOUND, BOARD_DELETED,
+    BOARD_NAME_MAX_LENGTH_ERROR, BOARD_NOT_FOUND, BOARD_DELETED, INVALID_IMPORT,
     COLUMN_NAME_MAX_LENGTH_ERROR,
     TASK_TITLE_MAX_LENGTH_ERROR, TASK_NOT_FOUND, TASK_DELETED,
-    SUBTASK_NAME_MAX_LENGTH_ERROR
+    SUBTASK_NAME_MAX_LENGTH_ERROR,
+    INVALID_CURSOR,
+    TASK_NEIGHBOR_NOT_IN_COLUMN, TASK_NEIGHBORS_OUT_OF_ORDER,
+    TASK_BULK_NOT_FOUND, TASK_BULK_MIXED_BOARDS, TASK_BULK_COLUMN_REQUIRED,
+    BATCH_INVALID_REFERENCE, BATCH_OPERATION_FAILED,
+    UNKNOWN_FIELD, COLUMN_NOT_FOUND, ARCHIVED_TASK_NOT_FOUND
 )
 
 # Create your tests here.
@@ -165,20 +204,20 @@ class BoardAPITests(APITestCase):
         client = APIClient()
         response = client.get('/tasks/boards/', format='json')        
 
-        self.assertTrue(not response.data)
+        self.assertTrue(not response.data['results'])
 
         Board.objects.create(name='Board Test 1')
         Board.objects.create(name='Board Test 2')
 
         response = client.get('/tasks/boards/', format='json')
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
         """
         Assert only the necessary fields are being sent.
         """
-        self.assertIn('name', response.data[0])
-        self.assertIn('id', response.data[0])
-        self.assertNotIn('created_at', response.data[0])
+        self.assertIn('name', response.data['results'][0])
+        self.assertIn('id', response.data['results'][0])
+        self.assertNotIn('created_at', response.data['results'][0])
 
     def test_get_board_not_found(self):
         client = APIClient()
@@ -1109,4 +1148,2084 @@ class BoardAPITests(APITestCase):
         related_subtasks = Subtask.objects.filter(task=response.data['id'])
         
         self.assertIn('subtasks', response.data)
-        self.assertTrue(not related_subtasks)
\ No newline at end of file
+        self.assertTrue(not related_subtasks)
+
+class QueryCountTests(APITestCase):
+    # (columns, tasks per column, subtasks per task)
+    BOARD_SIZES = [(1, 1, 1), (3, 5, 2), (8, 10, 5)]
+
+    def create_board(self, columns_count, tasks_count, subtasks_count):
+        board = Board.objects.create(name='Sample Board')
+        columns = Column.objects.bulk_create(
+            [Column(name=f'Column {i}', board=board) for i in range(columns_count)]
+        )
+        tasks = Task.objects.bulk_create(
+            [Task(title=f'Task {i}', column=column) for column in columns for i in range(tasks_count)]
+        )
+        Subtask.objects.bulk_create(
+            [Subtask(title=f'Subtask {i}', task=task) for task in tasks for i in range(subtasks_count)]
+        )
+        return board, tasks
+
+    def test_get_board_query_count(self):
+        client = APIClient()
+        for size in self.BOARD_SIZES:
+            board, _ = self.create_board(*size)
+
+            # Board lookup plus one query per prefetched level.
+            with self.assertNumQueries(4):
+                response = client.get(f'/tasks/boards/{board.id}/')
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['columns']), size[0])
+            self.assertEqual(len(response.data['columns'][0]['tasks']), size[1])
+            self.assertEqual(len(response.data['columns'][0]['tasks'][0]['subtasks']), size[2])
+
+    def test_get_task_query_count(self):
+        client = APIClient()
+        for size in self.BOARD_SIZES:
+            _, tasks = self.create_board(*size)
+
+            with self.assertNumQueries(2):
+                response = client.get(f'/tasks/items/{tasks[0].id}/')
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['subtasks']), size[2])
+
+
+
+class BoardSnapshotTests(APITestCase):
+    def rendered_board(self, board_id):
+        board = Board.objects.get(pk=board_id)
+        prefetch_documents([board], BoardSerializer)
+        return JSONRenderer().render(BoardSerializer(board).data)
+
+    def test_get_board_snapshot_not_found(self):
+        client = APIClient()
+        response = client.get('/tasks/boards/0/', {'snapshot': 'true'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], BOARD_NOT_FOUND)
+
+    def test_get_board_snapshot_empty_board(self):
+        client = APIClient()
+        board = Board.objects.create(name='Sample Board')
+        response = client.get(f'/tasks/boards/{board.id}/', {'snapshot': 'true'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, self.rendered_board(board.id))
+
+    def test_get_board_snapshot_matches_serializer(self):
+        client = APIClient()
+        board = seed_board(3, 4, 3, name='Tâblero "ñ" \\ 🚀')
+        Column.objects.create(name='Empty Column', board=board)
+        task = Task.objects.filter(column__board=board).first()
+        Subtask.objects.filter(task=task).delete()
+        # Whole-second timestamps are rendered without microseconds.
+        Column.objects.filter(board=board).update(created_at=timezone.now().replace(microsecond=0))
+
+        # Board lookup for the conditional GET validators, then the snapshot.
+        with self.assertNumQueries(2):
+            response = client.get(f'/tasks/boards/{board.id}/', {'snapshot': 'true'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, self.rendered_board(board.id))
+
+    def test_get_board_snapshot_escapes_line_separators(self):
+        client = APIClient()
+        board = seed_board(1, 1, 1, name='Line\u2028Paragraph\u2029')
+        response = client.get(f'/tasks/boards/{board.id}/', {'snapshot': 'true'})
+
+        self.assertNotIn('\u2028'.encode(), response.content)
+        self.assertNotIn('\u2029'.encode(), response.content)
+        self.assertIn(b'Line\\u2028Paragraph\\u2029', response.content)
+        self.assertEqual(response.content, self.rendered_board(board.id))
+
+    def test_get_board_snapshot_utc(self):
+        client = APIClient()
+        board = seed_board(1, 1, 1)
+
+        with timezone.override('UTC'):
+            response = client.get(f'/tasks/boards/{board.id}/', {'snapshot': 'true'})
+            expected = self.rendered_board(board.id)
+
+        self.assertTrue(json.loads(expected)['created_at'].endswith('Z'))
+        self.assertEqual(response.content, expected)
+
+
+class BoardPaginationTests(APITestCase):
+    def collect_pages(self, client, params):
+        ids = []
+        url = '/tasks/boards/'
+        while url:
+            response = client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(board['id'] for board in response.data['results'])
+            url, params = response.data['next'], None
+        return ids
+
+    def test_get_boards_paginated_by_id(self):
+        client = APIClient()
+        boards = Board.objects.bulk_create([Board(name=f'Board {i}') for i in range(7)])
+
+        ids = self.collect_pages(client, {'page_size': 3})
+
+        self.assertEqual(ids, [board.id for board in boards])
+
+    def test_get_boards_paginated_by_last_modified(self):
+        client = APIClient()
+        boards = Board.objects.bulk_create([Board(name=f'Board {i}') for i in range(6)])
+        # Ties on last_modified are broken by id.
+        now = timezone.now()
+        Board.objects.filter(id__in=[boards[0].id, boards[3].id]).update(last_modified=now)
+        Board.objects.filter(id__in=[boards[1].id, boards[4].id]).update(last_modified=now - timedelta(days=1))
+
+        ids = self.collect_pages(client, {'page_size': 2, 'ordering': 'last_modified'})
+        expected = [
+            board.id for board in
+            Board.objects.order_by('last_modified', 'id')
+        ]
+        self.assertEqual(ids, expected)
+
+        ids = self.collect_pages(client, {'page_size': 4, 'ordering': '-last_modified'})
+        self.assertEqual(ids, list(reversed(expected)))
+
+    def test_get_boards_last_page_has_no_next(self):
+        client = APIClient()
+        Board.objects.bulk_create([Board(name=f'Board {i}') for i in range(2)])
+        response = client.get('/tasks/boards/', {'page_size': 2})
+
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+        self.assertNotIn('count_estimate', response.data)
+
+    def test_get_boards_invalid_cursor(self):
+        client = APIClient()
+        response = client.get('/tasks/boards/', {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['detail'], INVALID_CURSOR)
+
+    def test_get_boards_cursor_from_other_ordering(self):
+        client = APIClient()
+        Board.objects.bulk_create([Board(name=f'Board {i}') for i in range(3)])
+        response = client.get('/tasks/boards/', {'page_size': 1})
+        cursor = parse_qs(urlparse(response.data['next']).query)['cursor'][0]
+
+        response = client.get('/tasks/boards/', {'cursor': cursor, 'ordering': 'last_modified'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_boards_count_estimate(self):
+        client = APIClient()
+        Board.objects.bulk_create([Board(name=f'Board {i}') for i in range(5)])
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Board._meta.db_table}')
+
+        with self.assertNumQueries(2):
+            response = client.get('/tasks/boards/', {'count': 'estimate'})
+
+        self.assertIn('count_estimate', response.data)
+        self.assertEqual(response.data['count_estimate'], 5)
+
+
+class BulkDiffTests(APITestCase):
+    def test_update_task_subtasks_query_count_independent_of_size(self):
+        client = APIClient()
+        counts = []
+        for size in (4, 20, 80):
+            board = seed_board(1, 1, size)
+            task = Task.objects.get(column__board=board)
+            subtasks = list(Subtask.objects.filter(task=task).order_by('id'))
+            data = {
+                'subtasks': [
+                    *({'id': subtask.id, 'title': f'Renamed {subtask.id}'} for subtask in subtasks[:size // 2]),
+                    *({'title': f'New {i}'} for i in range(size // 4)),
+                ]
+            }
+
+            with CaptureQueriesContext(connection) as context:
+                response = client.patch(f'/tasks/items/{task.id}/', data=data, format='json')
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['subtasks']), size // 2 + size // 4)
+            counts.append(len(context.captured_queries))
+
+        self.assertEqual(len(set(counts)), 1)
+
+    def test_update_board_columns_query_count_independent_of_size(self):
+        client = APIClient()
+        counts = []
+        for size in (2, 10, 40):
+            board = seed_board(size, 0, 0)
+            columns = list(Column.objects.filter(board=board).order_by('id'))
+            data = {
+                'columns': [
+                    *({'id': column.id, 'name': f'Renamed {column.id}'} for column in columns[:size // 2]),
+                    {'name': 'New Column'},
+                ]
+            }
+
+            with CaptureQueriesContext(connection) as context:
+                response = client.patch(f'/tasks/boards/{board.id}/', data=data, format='json')
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['columns']), size // 2 + 1)
+            counts.append(len(context.captured_queries))
+
+        self.assertEqual(len(set(counts)), 1)
+
+    def test_update_task_only_writes_changed_subtasks(self):
+        client = APIClient()
+        board = seed_board(1, 1, 0)
+        task = Task.objects.get(column__board=board)
+        subtasks = Subtask.objects.bulk_create([
+            Subtask(title='Subtask 1', task=task),
+            Subtask(title='Subtask 2', status=True, task=task),
+        ])
+        data = {
+            'subtasks': [
+                {'id': subtasks[0].id, 'title': 'Subtask 1', 'status': True},
+                {'id': subtasks[1].id, 'title': 'Subtask 2', 'status': True},
+            ]
+        }
+        response = client.patch(f'/tasks/items/{task.id}/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        changed = Subtask.objects.get(id=subtasks[0].id)
+        unchanged = Subtask.objects.get(id=subtasks[1].id)
+        self.assertTrue(changed.status)
+        self.assertGreater(changed.last_modified, subtasks[0].last_modified)
+        self.assertEqual(unchanged.last_modified, subtasks[1].last_modified)
+
+
+class TransactionalCreateTests(APITestCase):
+    def test_create_board_invalid_columns_writes_nothing(self):
+        client = APIClient()
+        data = {'name': 'Test Board', 'columns': [{'name': 'Column 1'}, {'name': '   '}]}
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.post('/tasks/boards/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(context.captured_queries)
+        self.assertFalse(Board.objects.exists())
+
+    def test_create_task_invalid_subtasks_writes_nothing(self):
+        client = APIClient()
+        board = seed_board(1, 0, 0)
+        column = Column.objects.get(board=board)
+        data = {'title': 'Sample Task', 'column': column.id, 'subtasks': [{'title': 'A' * 300}]}
+        response = client.post('/tasks/items/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.exists())
+
+    def test_create_board_response_built_from_inserted_rows(self):
+        client = APIClient()
+        data = {'name': 'Test Board', 'columns': [{'name': 'Column 1'}, {'name': 'Column 2'}]}
+
+        # Savepoint, board insert, column insert, release.
+        with self.assertNumQueries(4):
+            response = client.post('/tasks/boards/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        board = Board.objects.prefetch_related('columns__tasks__subtasks').get(pk=response.data['id'])
+        self.assertEqual(response.data, BoardSerializer(board).data)
+
+    def test_create_task_response_built_from_inserted_rows(self):
+        client = APIClient()
+        board = seed_board(1, 0, 0)
+        column = Column.objects.get(board=board)
+        data = {
+            'title': 'Sample Task',
+            'column': column.id,
+            'subtasks': [{'title': 'Subtask 1'}, {'title': 'Subtask 2', 'status': True}],
+        }
+
+        # Column lookup for validation, savepoint, last rank of the column,
+        # task insert, subtask insert, board version bump, release.
+        with self.assertNumQueries(7):
+            response = client.post('/tasks/items/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        task = Task.objects.prefetch_related('subtasks').get(pk=response.data['id'])
+        self.assertEqual(response.data, TaskSerializer(task).data)
+
+
+class ConditionalGetTests(APITestCase):
+    def test_get_board_etag_not_modified(self):
+        client = APIClient()
+        board = seed_board(2, 2, 2)
+        response = client.get(f'/tasks/boards/{board.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        # A matching validator is answered from the board lookup alone.
+        with self.assertNumQueries(1):
+            response = client.get(f'/tasks/boards/{board.id}/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+        self.assertIn('ETag', response)
+
+    def test_get_board_if_modified_since(self):
+        client = APIClient()
+        board = seed_board(1, 1, 1)
+        response = client.get(f'/tasks/boards/{board.id}/')
+        response = client.get(f'/tasks/boards/{board.id}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_board_snapshot_has_own_etag(self):
+        client = APIClient()
+        board = seed_board(1, 1, 1)
+        response = client.get(f'/tasks/boards/{board.id}/')
+        snapshot_response = client.get(f'/tasks/boards/{board.id}/', {'snapshot': 'true'})
+
+        self.assertNotEqual(response['ETag'], snapshot_response['ETag'])
+        response = client.get(
+            f'/tasks/boards/{board.id}/', {'snapshot': 'true'}, HTTP_IF_NONE_MATCH=snapshot_response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_child_writes_change_board_etag(self):
+        client = APIClient()
+        board = seed_board(2, 1, 2)
+        column = Column.objects.filter(board=board).first()
+        task = Task.objects.filter(column__board=board).first()
+        subtask = Subtask.objects.filter(task=task).first()
+
+        writes = [
+            lambda: client.post('/tasks/items/', data={'title': 'New Task', 'column': column.id}, format='json'),
+            lambda: client.patch(
+                f'/tasks/items/{task.id}/',
+                data={'subtasks': [{'id': subtask.id, 'status': not subtask.status}]},
+                format='json',
+            ),
+            lambda: client.patch(
+                f'/tasks/boards/{board.id}/', data={'columns': [{'id': column.id, 'name': 'Renamed'}]}, format='json'
+            ),
+            lambda: client.delete(f'/tasks/items/{task.id}/'),
+        ]
+        etag = client.get(f'/tasks/boards/{board.id}/')['ETag']
+        for write in writes:
+            self.assertLess(write().status_code, status.HTTP_400_BAD_REQUEST)
+            response = client.get(f'/tasks/boards/{board.id}/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+
+    def test_get_task_etag_not_modified(self):
+        client = APIClient()
+        board = seed_board(1, 1, 2)
+        task = Task.objects.get(column__board=board)
+        etag = client.get(f'/tasks/items/{task.id}/')['ETag']
+
+        with self.assertNumQueries(1):
+            response = client.get(f'/tasks/items/{task.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        client.patch(f'/tasks/items/{task.id}/', data={'subtasks': [{'title': 'Only subtask'}]}, format='json')
+        response = client.get(f'/tasks/items/{task.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['subtasks']), 1)
+
+    def test_updates_keep_concurrent_writes(self):
+        board = seed_board(1, 1, 1)
+        column = Column.objects.get(board=board)
+        task = Task.objects.select_related('column').get(column__board=board)
+        # Written by other requests after these rows were loaded.
+        Board.objects.filter(pk=board.id).touch()
+        Task.objects.filter(pk=task.id).update(rank='zz', deleted_at=timezone.now())
+
+        update_board(board, {'name': 'Renamed', 'columns': [{'id': column.id}]})
+        self.assertEqual(Board.objects.values_list('name', 'version').get(pk=board.id), ('Renamed', board.version + 2))
+
+        # The task was deleted meanwhile, and stays so.
+        response = update_task(task, {'title': 'Renamed'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        task = Task.all_objects.get(pk=task.id)
+        self.assertEqual((task.title, task.rank), ('Renamed', 'zz'))
+        self.assertIsNotNone(task.deleted_at)
+
+
+class DocumentCacheTests(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+        board_cache.reset_stats()
+        task_cache.reset_stats()
+
+    def test_get_board_served_from_cache(self):
+        client = APIClient()
+        board = seed_board(2, 3, 2)
+        first = client.get(f'/tasks/boards/{board.id}/')
+
+        with self.assertNumQueries(1):
+            second = client.get(f'/tasks/boards/{board.id}/')
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(board_cache.stats(), {'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_get_task_served_from_cache(self):
+        client = APIClient()
+        board = seed_board(1, 1, 3)
+        task = Task.objects.get(column__board=board)
+        first = client.get(f'/tasks/items/{task.id}/')
+
+        with self.assertNumQueries(1):
+            second = client.get(f'/tasks/items/{task.id}/')
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(task_cache.stats()['hits'], 1)
+
+    def test_board_writes_invalidate_cache(self):
+        client = APIClient()
+        board = seed_board(2, 1, 1)
+        columns = [{'id': column.id} for column in Column.objects.filter(board=board).order_by('id')]
+        column = Column.objects.filter(board=board).order_by('id').first()
+
+        client.get(f'/tasks/boards/{board.id}/')
+        client.patch(f'/tasks/boards/{board.id}/', data={'name': 'Renamed', 'columns': columns}, format='json')
+        self.assertEqual(board_cache.stats()['evictions'], 1)
+        self.assertEqual(client.get(f'/tasks/boards/{board.id}/').data['name'], 'Renamed')
+
+        response = client.post('/tasks/items/', data={'title': 'New Task', 'column': column.id}, format='json')
+        self.assertEqual(board_cache.stats()['evictions'], 2)
+        task_id = response.data['id']
+        response = client.get(f'/tasks/boards/{board.id}/')
+        self.assertIn(task_id, [task['id'] for task in response.data['columns'][0]['tasks']])
+
+        client.delete(f'/tasks/items/{task_id}/')
+        response = client.get(f'/tasks/boards/{board.id}/')
+        self.assertNotIn(task_id, [task['id'] for task in response.data['columns'][0]['tasks']])
+
+        client.delete(f'/tasks/boards/{board.id}/')
+        self.assertIsNone(caches['default'].get(board_cache.key(board.id)))
+
+    def test_update_task_invalidates_task_and_board(self):
+        client = APIClient()
+        board = seed_board(1, 1, 1)
+        task = Task.objects.get(column__board=board)
+        client.get(f'/tasks/items/{task.id}/')
+        client.get(f'/tasks/boards/{board.id}/')
+
+        client.patch(f'/tasks/items/{task.id}/', data={'title': 'Renamed', 'subtasks': []}, format='json')
+
+        self.assertEqual(client.get(f'/tasks/items/{task.id}/').data['title'], 'Renamed')
+        response = client.get(f'/tasks/boards/{board.id}/')
+        self.assertEqual(response.data['columns'][0]['tasks'][0]['title'], 'Renamed')
+        self.assertEqual(response.data['columns'][0]['tasks'][0]['subtasks'], [])
+
+    def test_invalid_children_write_nothing(self):
+        client = APIClient()
+        board = seed_board(1, 1, 1)
+        task = Task.objects.get(column__board=board)
+        etag = client.get(f'/tasks/boards/{board.id}/')['ETag']
+
+        response = client.patch(f'/tasks/boards/{board.id}/', data={'name': 'Renamed', 'columns': [{'name': ''}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = client.patch(f'/tasks/items/{task.id}/', data={'title': 'Renamed', 'subtasks': [{'title': ''}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(Board.objects.get(pk=board.id).name, board.name)
+        self.assertEqual(Task.objects.get(pk=task.id).title, task.title)
+        response = client.get(f'/tasks/boards/{board.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_stale_version_is_a_miss(self):
+        client = APIClient()
+        board = seed_board(1, 1, 1)
+        client.get(f'/tasks/boards/{board.id}/')
+
+        # A write that skips explicit invalidation still moves the version.
+        Board.objects.filter(pk=board.id).touch()
+        client.get(f'/tasks/boards/{board.id}/')
+
+        self.assertEqual(board_cache.stats(), {'hits': 0, 'misses': 2, 'evictions': 1})
+
+
+class SubtaskCounterTests(APITestCase):
+    def assertCounters(self, task_id, total, completed):
+        task = Task.objects.get(pk=task_id)
+        self.assertEqual((task.total_subtasks, task.completed_subtasks), (total, completed))
+
+    def test_create_task_sets_counters(self):
+        client = APIClient()
+        column = Column.objects.get(board=seed_board(1, 0, 0))
+        data = {
+            'title': 'Sample Task',
+            'column': column.id,
+            'subtasks': [{'title': 'Subtask 1'}, {'title': 'Subtask 2', 'status': True}, {'title': 'Subtask 3'}],
+        }
+        response = client.post('/tasks/items/', data=data, format='json')
+
+        self.assertCounters(response.data['id'], 3, 1)
+
+    def test_update_task_keeps_counters(self):
+        client = APIClient()
+        board = seed_board(1, 0, 0)
+        task = Task.objects.create(title='Sample Task', column=Column.objects.get(board=board))
+        subtasks = Subtask.objects.bulk_create([
+            Subtask(title='Subtask 1', task=task),
+            Subtask(title='Subtask 2', task=task),
+            Subtask(title='Subtask 3', task=task),
+        ])
+        data = {
+            'subtasks': [
+                {'id': subtasks[0].id, 'status': True},
+                {'id': subtasks[1].id, 'status': True},
+                {'title': 'Subtask 4'},
+            ]
+        }
+        client.patch(f'/tasks/items/{task.id}/', data=data, format='json')
+        self.assertCounters(task.id, 3, 2)
+
+        # Title-only edits still save the task row; counters must survive it.
+        client.patch(f'/tasks/items/{task.id}/', data={'title': 'Renamed', 'subtasks': data['subtasks'][:2]}, format='json')
+        self.assertCounters(task.id, 2, 2)
+
+        client.patch(f'/tasks/items/{task.id}/', data={'title': 'Renamed again'}, format='json')
+        self.assertCounters(task.id, 0, 0)
+
+    def test_get_board_summary_skips_subtasks(self):
+        client = APIClient()
+        board = seed_board(2, 3, 4)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/tasks/boards/{board.id}/', {'view': 'summary'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([query for query in context.captured_queries if Subtask._meta.db_table in query['sql']])
+        card = response.data['columns'][0]['tasks'][0]
+        self.assertEqual(card['total_subtasks'], 4)
+        self.assertEqual(card['completed_subtasks'], 2)
+        self.assertNotIn('subtasks', card)
+
+    def test_get_board_summary_has_own_etag(self):
+        client = APIClient()
+        board = seed_board(1, 1, 1)
+        etag = client.get(f'/tasks/boards/{board.id}/')['ETag']
+        response = client.get(f'/tasks/boards/{board.id}/', {'view': 'summary'}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class IndexUsageTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        boards = [seed_board(5, 40, 5, name=f'Board {i}') for i in range(40)]
+        cls.board = boards[len(boards) // 2]
+        # Plenty of small boards so the board and column tables outgrow a few pages.
+        empty_boards = Board.objects.bulk_create([Board(name=f'Empty Board {i}') for i in range(3_000)])
+        Column.objects.bulk_create([Column(name='Column', board=board) for board in empty_boards for _ in range(5)])
+        with connection.cursor() as cursor:
+            for model in (Board, Column, Task, Subtask):
+                cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_board_detail_prefetch_uses_indexes(self):
+        columns = Column.objects.filter(board=self.board)
+        tasks = Task.objects.filter(column__in=list(columns.values_list('id', flat=True)))
+        subtasks = Subtask.objects.filter(task__in=list(tasks.values_list('id', flat=True)))
+
+        self.assertUsesIndex(columns, 'column_board_id_idx')
+        self.assertUsesIndex(tasks, 'task_column_rank_idx')
+        self.assertUsesIndex(subtasks, 'subtask_task_id_idx')
+
+    def test_incomplete_subtasks_use_partial_index(self):
+        task = Task.objects.filter(column__board=self.board).first()
+        self.assertUsesIndex(Subtask.objects.filter(task=task, status=False), 'subtask_incomplete_idx')
+
+    def test_board_list_pagination_uses_index(self):
+        boards = Board.objects.order_by('last_modified', 'id')[:10]
+        self.assertUsesIndex(boards, 'board_last_modified_id_idx')
+
+    def test_children_are_ordered_by_id(self):
+        client = APIClient()
+        response = client.get(f'/tasks/boards/{self.board.id}/')
+
+        column_ids = [column['id'] for column in response.data['columns']]
+        task_ids = [task['id'] for task in response.data['columns'][0]['tasks']]
+        subtask_ids = [subtask['id'] for subtask in response.data['columns'][0]['tasks'][0]['subtasks']]
+        for ids in (column_ids, task_ids, subtask_ids):
+            self.assertEqual(ids, sorted(ids))
+
+
+class TaskMoveTests(APITestCase):
+    def setUp(self):
+        self.board = seed_board(2, 4, 0)
+        self.first, self.second = Column.objects.filter(board=self.board)
+        self.tasks = list(Task.objects.filter(column=self.first))
+
+    def column_order(self, column):
+        return list(Task.objects.filter(column=column).values_list('id', flat=True))
+
+    def test_rank_helpers_keep_order(self):
+        ranks = spaced_ranks(50)
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), 50)
+
+        lower, upper = 'a', 'b'
+        for _ in range(100):
+            middle = midpoint(lower, upper)
+            self.assertTrue(lower < middle < upper)
+            upper = middle
+
+        rank = None
+        for _ in range(1_000):
+            following = rank_after(rank)
+            self.assertTrue(rank is None or rank < following)
+            rank = following
+        self.assertLessEqual(len(rank), 6)
+
+    def test_move_between_neighbors(self):
+        client = APIClient()
+        a, b, c, d = self.tasks
+        response = client.post(f'/tasks/items/{d.id}/move/', data={'after': a.id, 'before': b.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.column_order(self.first), [a.id, d.id, b.id, c.id])
+
+    def test_move_after_only_and_before_only(self):
+        client = APIClient()
+        a, b, c, d = self.tasks
+        client.post(f'/tasks/items/{a.id}/move/', data={'after': c.id}, format='json')
+        self.assertEqual(self.column_order(self.first), [b.id, c.id, a.id, d.id])
+
+        client.post(f'/tasks/items/{d.id}/move/', data={'before': b.id}, format='json')
+        self.assertEqual(self.column_order(self.first), [d.id, b.id, c.id, a.id])
+
+    def test_move_to_end_of_other_column(self):
+        client = APIClient()
+        task = self.tasks[0]
+        response = client.post(f'/tasks/items/{task.id}/move/', data={'column': self.second.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'id': task.id, 'column': self.second.id})
+        self.assertEqual(self.column_order(self.second)[-1], task.id)
+        self.assertNotIn(task.id, self.column_order(self.first))
+
+    def test_move_writes_a_single_task_row(self):
+        client = APIClient()
+        a, b, c, d = self.tasks
+        etag = client.get(f'/tasks/boards/{self.board.id}/')['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            client.post(f'/tasks/items/{d.id}/move/', data={'after': a.id, 'before': b.id}, format='json')
+
+        task_updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(task_updates), 1)
+        self.assertIn(f'"tasks_task"."id" = {d.id}', task_updates[0])
+        self.assertNotEqual(client.get(f'/tasks/boards/{self.board.id}/')['ETag'], etag)
+
+    def test_neighbor_in_other_column(self):
+        client = APIClient()
+        task = self.tasks[0]
+        response = client.post(
+            f'/tasks/items/{task.id}/move/',
+            data={'column': self.second.id, 'after': self.tasks[1].id},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['non_field_errors'][0], TASK_NEIGHBOR_NOT_IN_COLUMN)
+
+    def test_neighbors_out_of_order(self):
+        client = APIClient()
+        a, b, c, d = self.tasks
+        response = client.post(f'/tasks/items/{a.id}/move/', data={'after': d.id, 'before': b.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['non_field_errors'][0], TASK_NEIGHBORS_OUT_OF_ORDER)
+
+    def test_move_nonexistent_task(self):
+        client = APIClient()
+        response = client.post('/tasks/items/999999/move/', data={}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], TASK_NOT_FOUND)
+
+    def test_long_rank_schedules_rebalance(self):
+        client = APIClient()
+        a, b, c, d = self.tasks
+        Task.objects.filter(pk=a.id).update(rank='h' * 30)
+        Task.objects.filter(pk=b.id).update(rank='h' * 30 + 'i')
+
+        with mock.patch('tasks.views.schedule_rebalance') as schedule_rebalance:
+            response = client.post(f'/tasks/items/{d.id}/move/', data={'after': a.id, 'before': b.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        schedule_rebalance.assert_called_once_with(self.first.id)
+
+    def test_rebalance_keeps_order(self):
+        ranks = ['h' * 30, 'h' * 30 + '1', 'h' * 30 + '2', 'i']
+        for task, rank in zip(self.tasks, ranks):
+            Task.objects.filter(pk=task.id).update(rank=rank)
+
+        rebalance_column(self.first.id)
+
+        self.assertEqual(self.column_order(self.first), [task.id for task in self.tasks])
+        new_ranks = list(Task.objects.filter(column=self.first).values_list('rank', flat=True))
+        self.assertEqual(new_ranks, spaced_ranks(4))
+
+    def test_rebalance_moves_the_board_version(self):
+        client = APIClient()
+        etag = client.get(f'/tasks/boards/{self.first.board_id}/')['ETag']
+
+        rebalance_column(self.first.id)
+
+        response = client.get(f'/tasks/boards/{self.first.board_id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_board_detail_orders_tasks_by_rank(self):
+        client = APIClient()
+        a, b, c, d = self.tasks
+        client.post(f'/tasks/items/{a.id}/move/', data={'after': d.id}, format='json')
+
+        response = client.get(f'/tasks/boards/{self.board.id}/')
+        snapshot = client.get(f'/tasks/boards/{self.board.id}/?snapshot=1')
+
+        expected = [b.id, c.id, d.id, a.id]
+        self.assertEqual([task['id'] for task in response.data['columns'][0]['tasks']], expected)
+        self.assertEqual([task['id'] for task in json.loads(snapshot.content)['columns'][0]['tasks']], expected)
+
+
+class BulkTaskTests(APITestCase):
+    def setUp(self):
+        self.board = seed_board(2, 4, 2)
+        self.first, self.second = Column.objects.filter(board=self.board)
+        self.tasks = list(Task.objects.filter(column=self.first))
+
+    def test_move_tasks_to_end_of_column(self):
+        client = APIClient()
+        ids = [self.tasks[2].id, self.tasks[0].id]
+        data = {'op': 'move', 'column': self.second.id, 'ids': ids}
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/tasks/items/bulk/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'op': 'move', 'column': self.second.id, 'ids': ids})
+        task_updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "tasks_task"')]
+        self.assertEqual(len(task_updates), 1)
+        second_ids = list(Task.objects.filter(column=self.second).values_list('id', flat=True))
+        self.assertEqual(second_ids[-2:], ids)
+        self.assertEqual(Task.objects.filter(column=self.first).count(), 2)
+
+    def test_move_tasks_within_their_column(self):
+        client = APIClient()
+        a, b, c, d = self.tasks
+        data = {'op': 'move', 'column': self.first.id, 'ids': [b.id, a.id]}
+        client.post('/tasks/items/bulk/', data=data, format='json')
+
+        order = list(Task.objects.filter(column=self.first).values_list('id', flat=True))
+        self.assertEqual(order, [c.id, d.id, b.id, a.id])
+
+    def test_delete_tasks(self):
+        client = APIClient()
+        ids = [task.id for task in self.tasks[:3]]
+        response = client.post('/tasks/items/bulk/', data={'op': 'delete', 'ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Task.objects.filter(pk__in=ids).exists())
+        self.assertFalse(Subtask.objects.filter(task__in=ids).exists())
+        self.assertEqual(Task.objects.filter(column=self.first).count(), 1)
+
+    def test_bulk_invalidates_board_and_task_documents(self):
+        client = APIClient()
+        task = self.tasks[0]
+        board_etag = client.get(f'/tasks/boards/{self.board.id}/')['ETag']
+        client.get(f'/tasks/items/{task.id}/')
+
+        data = {'op': 'move', 'column': self.second.id, 'ids': [task.id]}
+        client.post('/tasks/items/bulk/', data=data, format='json')
+
+        self.assertNotEqual(client.get(f'/tasks/boards/{self.board.id}/')['ETag'], board_etag)
+        self.assertEqual(client.get(f'/tasks/items/{task.id}/').data['column'], self.second.id)
+
+    def test_move_requires_column(self):
+        client = APIClient()
+        response = client.post('/tasks/items/bulk/', data={'op': 'move', 'ids': [self.tasks[0].id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['column'][0], TASK_BULK_COLUMN_REQUIRED)
+
+    def test_nonexistent_task(self):
+        client = APIClient()
+        data = {'op': 'delete', 'ids': [self.tasks[0].id, 999999]}
+        response = client.post('/tasks/items/bulk/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['ids'][0], TASK_BULK_NOT_FOUND)
+        self.assertTrue(Task.objects.filter(pk=self.tasks[0].id).exists())
+
+    def test_tasks_of_different_boards(self):
+        client = APIClient()
+        other = Task.objects.get(column__board=seed_board(1, 1, 0))
+        data = {'op': 'delete', 'ids': [self.tasks[0].id, other.id]}
+        response = client.post('/tasks/items/bulk/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['ids'][0], TASK_BULK_MIXED_BOARDS)
+        self.assertEqual(Task.objects.filter(pk__in=data['ids']).count(), 2)
+
+
+class BatchTests(APITestCase):
+    def test_batch_with_references(self):
+        client = APIClient()
+        data = {'operations': [
+            {'method': 'POST', 'path': '/tasks/boards/', 'body': {'name': 'Roadmap', 'columns': [{'name': 'Todo'}, {'name': 'Doing'}]}},
+            {'method': 'PATCH', 'path': '/tasks/boards/$0.id/', 'body': {
+                'name': 'Renamed',
+                'columns': [{'id': '$0.columns.0.id', 'name': 'Todo'}, {'id': '$0.columns.1.id', 'name': 'Doing'}, {'name': 'Done'}],
+            }},
+            {'method': 'POST', 'path': '/tasks/items/', 'body': {'title': 'First', 'column': '$1.columns.2.id'}},
+            {'method': 'POST', 'path': '/tasks/items/', 'body': {'title': 'Second', 'column': '$0.columns.0.id', 'subtasks': [{'title': 'Step'}]}},
+            {'method': 'PATCH', 'path': '/tasks/items/$3.id/', 'body': {'title': 'Second task', 'subtasks': [{'id': '$3.subtasks.0.id', 'title': 'Step', 'status': True}]}},
+        ]}
+
+        response = client.post('/tasks/batch/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result['status'] for result in response.data['results']], [201, 200, 201, 201, 200])
+        board = Board.objects.get(pk=response.data['results'][0]['data']['id'])
+        self.assertEqual(board.name, 'Renamed')
+        self.assertEqual(list(board.columns.values_list('name', flat=True)), ['Todo', 'Doing', 'Done'])
+        self.assertEqual(Task.objects.get(title='First').column.name, 'Done')
+        second = Task.objects.get(title='Second task')
+        self.assertEqual((second.total_subtasks, second.completed_subtasks), (1, 1))
+        self.assertEqual(client.get(f'/tasks/boards/{board.id}/').data['name'], 'Renamed')
+
+    def test_failed_operation_rolls_back_batch(self):
+        client = APIClient()
+        data = {'operations': [
+            {'method': 'POST', 'path': '/tasks/boards/', 'body': {'name': 'Roadmap', 'columns': [{'name': 'Todo'}]}},
+            {'method': 'POST', 'path': '/tasks/items/', 'body': {'title': 'A' * 256, 'column': '$0.columns.0.id'}},
+        ]}
+
+        response = client.post('/tasks/batch/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], BATCH_OPERATION_FAILED)
+        self.assertEqual(response.data['index'], 1)
+        self.assertEqual(response.data['detail']['title'][0], TASK_TITLE_MAX_LENGTH_ERROR)
+        self.assertFalse(Board.objects.filter(name='Roadmap').exists())
+
+    def test_delete_in_batch(self):
+        client = APIClient()
+        board = seed_board(1, 1, 0)
+        task = Task.objects.get(column__board=board)
+        data = {'operations': [
+            {'method': 'DELETE', 'path': f'/tasks/items/{task.id}/'},
+            {'method': 'DELETE', 'path': f'/tasks/boards/{board.id}/'},
+        ]}
+
+        response = client.post('/tasks/batch/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][1], {'status': 204, 'data': {'msg': BOARD_DELETED}})
+        self.assertFalse(Board.objects.filter(pk=board.id).exists())
+
+    def test_missing_object_rolls_back_batch(self):
+        client = APIClient()
+        board = seed_board(1, 0, 0)
+        data = {'operations': [
+            {'method': 'DELETE', 'path': f'/tasks/boards/{board.id}/'},
+            {'method': 'PATCH', 'path': '/tasks/items/999999/', 'body': {'title': 'Gone'}},
+        ]}
+
+        response = client.post('/tasks/batch/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['detail'], {'error': TASK_NOT_FOUND})
+        self.assertTrue(Board.objects.filter(pk=board.id).exists())
+
+    def test_invalid_reference(self):
+        client = APIClient()
+        data = {'operations': [
+            {'method': 'POST', 'path': '/tasks/boards/', 'body': {'name': 'Roadmap'}},
+            {'method': 'POST', 'path': '/tasks/items/', 'body': {'title': 'Task', 'column': '$0.columns.3.id'}},
+        ]}
+
+        response = client.post('/tasks/batch/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['detail'], {'error': BATCH_INVALID_REFERENCE})
+        self.assertFalse(Board.objects.filter(name='Roadmap').exists())
+
+    def test_unsupported_operation(self):
+        client = APIClient()
+        for operation in (
+            {'method': 'POST', 'path': '/tasks/boards/1/'},
+            {'method': 'PATCH', 'path': '/tasks/unknown/'},
+            {'method': 'GET', 'path': '/tasks/boards/'},
+        ):
+            response = client.post('/tasks/batch/', data={'operations': [operation]}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BoardTransferTests(APITestCase):
+    def export(self, client, board_id):
+        response = client.get(f'/tasks/boards/{board_id}/export/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return b''.join(response.streaming_content)
+
+    def import_lines(self, client, content):
+        return client.post('/tasks/boards/import/', data=content, content_type='application/x-ndjson')
+
+    def without_ids(self, document):
+        """The board document with ids and board timestamps left out."""
+        return [
+            (column['name'], [
+                (task['title'], [(subtask['title'], subtask['status']) for subtask in task['subtasks']])
+                for task in column['tasks']
+            ])
+            for column in document['columns']
+        ] + [document['name']]
+
+    def test_export_lines(self):
+        client = APIClient()
+        board = seed_board(2, 3, 2)
+        lines = [json.loads(line) for line in self.export(client, board.id).splitlines()]
+
+        self.assertEqual(lines[0]['type'], 'board')
+        self.assertEqual(lines[0]['name'], board.name)
+        kinds = [line['type'] for line in lines[1:]]
+        self.assertEqual(kinds, ['column'] * 2 + ['task'] * 6 + ['subtask'] * 12)
+        task = Task.objects.get(pk=lines[3]['id'])
+        self.assertEqual(lines[3]['column'], task.column_id)
+        self.assertEqual(lines[3]['rank'], task.rank)
+        self.assertEqual(datetime.fromisoformat(lines[3]['created_at']), task.created_at)
+
+    def test_export_nonexistent_board(self):
+        client = APIClient()
+        response = client.get('/tasks/boards/999999/export/')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], BOARD_NOT_FOUND)
+
+    def test_export_import_round_trip(self):
+        client = APIClient()
+        board = seed_board(3, 4, 3)
+        Task.objects.filter(pk=Task.objects.filter(column__board=board).last().pk).update(rank='0001')
+
+        response = self.import_lines(client, self.export(client, board.id))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['columns'], 3)
+        self.assertEqual(response.data['tasks'], 12)
+        self.assertEqual(response.data['subtasks'], 36)
+        original = client.get(f'/tasks/boards/{board.id}/').data
+        imported = client.get(f'/tasks/boards/{response.data["id"]}/').data
+        self.assertEqual(self.without_ids(imported), self.without_ids(original))
+        task = Task.objects.filter(column__board=response.data['id']).first()
+        self.assertEqual((task.total_subtasks, task.completed_subtasks), (3, 2))
+
+    def test_import_copies_in_chunks(self):
+        board = seed_board(2, 20, 2)
+        content = ''.join(board_lines(board.id))
+        board_import = BoardImport(chunk_size=16)
+
+        with CaptureQueriesContext(connection) as queries:
+            imported = board_import.load(content.splitlines())
+
+        # COPY goes around the query log; every chunk reserves its ids first.
+        reservations = [query for query in queries if 'nextval' in query['sql']]
+        self.assertGreater(len(reservations), 3)
+        self.assertEqual(Subtask.objects.filter(task__column__board=imported).count(), 80)
+
+    def test_import_appends_tasks_without_rank(self):
+        client = APIClient()
+        content = '\n'.join(json.dumps(line) for line in [
+            {'type': 'board', 'name': 'Imported'},
+            {'type': 'column', 'id': 'todo', 'name': 'Todo'},
+            {'type': 'task', 'id': 1, 'column': 'todo', 'title': 'First'},
+            {'type': 'task', 'id': 2, 'column': 'todo', 'title': 'Second'},
+            {'type': 'subtask', 'task': 2, 'title': 'Step', 'status': True},
+        ])
+
+        response = self.import_lines(client, content)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        tasks = list(Task.objects.filter(column__board=response.data['id']))
+        self.assertEqual([task.title for task in tasks], ['First', 'Second'])
+        self.assertEqual((tasks[1].total_subtasks, tasks[1].completed_subtasks), (1, 1))
+
+    def test_invalid_import_is_rolled_back(self):
+        client = APIClient()
+        boards = Board.objects.count()
+        for content, line in (
+            ('{"type": "board", "name": "Imported"}\nnot json', 2),
+            ('{"type": "column", "id": 1, "name": "Todo"}', 1),
+            ('{"type": "board", "name": "Imported"}\n{"type": "task", "id": 1, "column": 5, "title": "Task"}', 2),
+            ('{"type": "board", "name": "Imported"}\n{"type": "column", "id": 1, "name": "%s"}' % ('A' * 51), 2),
+        ):
+            response = self.import_lines(client, content)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data, {'error': INVALID_IMPORT, 'line': line})
+        self.assertEqual(Board.objects.count(), boards)
+
+    def test_import_rejects_malformed_ranks(self):
+        client = APIClient()
+        boards = Board.objects.count()
+        for rank in ('ZZ!', 'i0', 'i' * 256, 1):
+            content = '\n'.join(json.dumps(line) for line in [
+                {'type': 'board', 'name': 'Imported'},
+                {'type': 'column', 'id': 1, 'name': 'Todo'},
+                {'type': 'task', 'id': 1, 'column': 1, 'title': 'Task', 'rank': rank},
+            ])
+            response = self.import_lines(client, content)
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, rank)
+            self.assertEqual(response.data, {'error': INVALID_IMPORT, 'line': 3})
+        self.assertEqual(Board.objects.count(), boards)
+
+
+class BoardCloneTests(APITestCase):
+    def setUp(self):
+        self.board = seed_board(3, 4, 2, name='Template')
+
+    def board_document(self, client, board_id):
+        document = client.get(f'/tasks/boards/{board_id}/').data
+        return [
+            (column['name'], [
+                (task['title'], [(subtask['title'], subtask['status']) for subtask in task['subtasks']])
+                for task in column['tasks']
+            ])
+            for column in document['columns']
+        ]
+
+    def test_clone_board(self):
+        client = APIClient()
+        with self.assertNumQueries(1):
+            response = client.post(f'/tasks/boards/{self.board.id}/clone/', format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['columns'], 3)
+        self.assertEqual(response.data['tasks'], 12)
+        self.assertEqual(response.data['subtasks'], 24)
+        clone = Board.objects.get(pk=response.data['id'])
+        self.assertEqual(clone.name, 'Template')
+        self.assertEqual(self.board_document(client, clone.id), self.board_document(client, self.board.id))
+        task = Task.objects.filter(column__board=clone).first()
+        self.assertEqual((task.total_subtasks, task.completed_subtasks), (2, 1))
+        self.assertEqual(Task.objects.filter(column__board=self.board).count(), 12)
+
+    def test_clone_with_name_and_reset_status(self):
+        client = APIClient()
+        data = {'name': 'Sprint 2', 'reset_status': True}
+        response = client.post(f'/tasks/boards/{self.board.id}/clone/', data=data, format='json')
+
+        clone = Board.objects.get(pk=response.data['id'])
+        self.assertEqual(clone.name, 'Sprint 2')
+        self.assertFalse(Subtask.objects.filter(task__column__board=clone, status=True).exists())
+        self.assertFalse(Task.objects.filter(column__board=clone, completed_subtasks__gt=0).exists())
+        self.assertTrue(Subtask.objects.filter(task__column__board=self.board, status=True).exists())
+
+    def test_clone_without_tasks(self):
+        client = APIClient()
+        response = client.post(f'/tasks/boards/{self.board.id}/clone/', data={'include_tasks': False}, format='json')
+
+        self.assertEqual((response.data['columns'], response.data['tasks'], response.data['subtasks']), (3, 0, 0))
+        clone = Board.objects.get(pk=response.data['id'])
+        self.assertEqual(list(clone.columns.values_list('name', flat=True)), ['Column 0', 'Column 1', 'Column 2'])
+        self.assertFalse(Task.objects.filter(column__board=clone).exists())
+
+    def test_clone_name_too_long(self):
+        client = APIClient()
+        data = {'name': 'A' * (Board._meta.get_field('name').max_length + 1)}
+        response = client.post(f'/tasks/boards/{self.board.id}/clone/', data=data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['name'][0], BOARD_NAME_MAX_LENGTH_ERROR)
+
+    def test_clone_nonexistent_board(self):
+        client = APIClient()
+        boards = Board.objects.count()
+        response = client.post('/tasks/boards/999999/clone/', format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], BOARD_NOT_FOUND)
+        self.assertEqual(Board.objects.count(), boards)
+
+
+class AsyncReadTests(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.board = seed_board(2, 3, 2)
+        self.task = Task.objects.filter(column__board=self.board).first()
+
+    async def test_async_reads_match_sync_reads(self):
+        client = APIClient()
+        for sync_url, async_url in (
+            (f'/tasks/boards/{self.board.id}/', f'/tasks/async/boards/{self.board.id}/'),
+            (f'/tasks/boards/{self.board.id}/?view=summary', f'/tasks/async/boards/{self.board.id}/?view=summary'),
+            (f'/tasks/boards/{self.board.id}/?snapshot=1', f'/tasks/async/boards/{self.board.id}/?snapshot=1'),
+            (f'/tasks/items/{self.task.id}/', f'/tasks/async/items/{self.task.id}/'),
+        ):
+            expected = await sync_to_async(client.get)(sync_url, HTTP_ACCEPT='application/json')
+            response = await self.async_client.get(async_url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.content, expected.content)
+            self.assertEqual(response['ETag'], expected['ETag'])
+
+    async def test_async_board_detail_not_modified(self):
+        response = await self.async_client.get(f'/tasks/async/boards/{self.board.id}/')
+        response = await self.async_client.get(
+            f'/tasks/async/boards/{self.board.id}/', headers={'If-None-Match': response['ETag']}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_async_board_list_pages(self):
+        await sync_to_async(seed_board)(1, 0, 0, name='Second')
+        response = await self.async_client.get('/tasks/async/boards/', {'page_size': 1, 'count': 'estimate'})
+        page = json.loads(response.content)
+        self.assertEqual(page['results'], [{'id': self.board.id, 'name': self.board.name}])
+        self.assertIn('count_estimate', page)
+
+        response = await self.async_client.get(page['next'])
+        self.assertEqual(len(json.loads(response.content)['results']), 1)
+
+        response = await self.async_client.get('/tasks/async/boards/', {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(json.loads(response.content)['detail'], INVALID_CURSOR)
+
+    async def test_async_not_found(self):
+        response = await self.async_client.get('/tasks/async/boards/999999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(json.loads(response.content), {'error': BOARD_NOT_FOUND})
+
+        response = await self.async_client.get('/tasks/async/items/999999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(json.loads(response.content), {'error': TASK_NOT_FOUND})
+
+    async def test_async_reads_only(self):
+        response = await self.async_client.delete(f'/tasks/async/boards/{self.board.id}/')
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class BoardEventTests(APITestCase):
+    def setUp(self):
+        self.board = seed_board(2, 2, 2)
+        self.first, self.second = Column.objects.filter(board=self.board)
+        self.task = Task.objects.filter(column=self.first).first()
+
+    def write(self, method: str, url: str, data=None):
+        """Make a write request and return the events it published on commit."""
+        client = APIClient()
+        with mock.patch.object(get_broker(), 'publish') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                getattr(client, method)(url, data=data, format='json')
+        return [call.args[0] for call in publish.call_args_list]
+
+    async def test_feed_streams_committed_events(self):
+        response = await self.async_client.get(f'/tasks/boards/{self.board.id}/events/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b': subscribed\n\n')
+
+        def move():
+            with self.captureOnCommitCallbacks(execute=True):
+                APIClient().post(f'/tasks/items/{self.task.id}/move/', data={'column': self.second.id}, format='json')
+
+        await sync_to_async(move)()
+        chunk = await asyncio.wait_for(anext(stream), 5)
+        rank = await Task.objects.values_list('rank', flat=True).aget(pk=self.task.id)
+
+        event_line, data_line = chunk.decode().splitlines()[:2]
+        self.assertEqual(event_line, 'event: task.moved')
+        self.assertEqual(json.loads(data_line.removeprefix('data: ')), {
+            'type': 'task.moved', 'board': self.board.id, 'task': self.task.id, 'column': self.second.id, 'rank': rank,
+        })
+
+    async def test_feed_of_nonexistent_board(self):
+        response = await self.async_client.get('/tasks/boards/999999/events/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_task_events(self):
+        subtask = self.task.subtasks.first()
+        events = self.write('patch', f'/tasks/items/{self.task.id}/', {
+            'title': 'Renamed',
+            'subtasks': [{'id': subtask.id, 'title': subtask.title, 'status': not subtask.status}],
+        })
+
+        self.assertEqual([event['type'] for event in events], ['task.updated', 'subtask.toggled', 'subtask.deleted'])
+        self.assertEqual(events[1], {
+            'type': 'subtask.toggled', 'board': self.board.id, 'task': self.task.id,
+            'subtask': subtask.id, 'status': not subtask.status,
+        })
+
+        events = self.write('post', '/tasks/items/', {'title': 'New', 'column': self.first.id})
+        self.assertEqual([event['type'] for event in events], ['task.created'])
+
+        events = self.write('delete', f'/tasks/items/{self.task.id}/')
+        self.assertEqual(events, [{'type': 'task.deleted', 'board': self.board.id, 'task': self.task.id}])
+
+    def test_column_events(self):
+        events = self.write('patch', f'/tasks/boards/{self.board.id}/', {
+            'columns': [{'id': self.first.id, 'name': 'Renamed'}, {'name': 'New'}],
+        })
+
+        self.assertEqual(
+            [event['type'] for event in events],
+            ['board.updated', 'column.created', 'column.renamed', 'column.deleted'],
+        )
+        self.assertEqual(events[2]['name'], 'Renamed')
+        self.assertEqual(events[3]['column'], self.second.id)
+
+    def test_rolled_back_writes_publish_nothing(self):
+        events = self.write('post', '/tasks/batch/', {'operations': [
+            {'method': 'DELETE', 'path': f'/tasks/items/{self.task.id}/'},
+            {'method': 'PATCH', 'path': '/tasks/items/999999/', 'body': {'title': 'Gone'}},
+        ]})
+
+        self.assertEqual(events, [])
+
+    def test_postgres_broker_notifies(self):
+        with CaptureQueriesContext(connection) as queries:
+            PostgresBroker().publish({'type': 'board.deleted', 'board': self.board.id})
+
+        self.assertIn('pg_notify', queries[0]['sql'])
+
+    def test_postgres_broker_splits_large_events(self):
+        event = {'type': 'tasks.deleted', 'board': self.board.id, 'tasks': list(range(1_000_000, 1_001_000))}
+        payloads = [json.loads(payload) for payload in split_payloads(event, NOTIFY_MAX_PAYLOAD)]
+
+        self.assertGreater(len(payloads), 1)
+        for payload in payloads:
+            self.assertEqual(payload['type'], 'tasks.deleted')
+            self.assertLessEqual(len(json.dumps(payload).encode()), NOTIFY_MAX_PAYLOAD)
+        self.assertEqual([id for payload in payloads for id in payload['tasks']], event['tasks'])
+        with self.assertNumQueries(len(payloads)):
+            PostgresBroker().publish(event)
+
+
+class BoardChangesTests(APITestCase):
+    def setUp(self):
+        self.board = seed_board(2, 2, 2)
+        self.first, self.second = Column.objects.filter(board=self.board)
+        # Age everything past the cursor overlap.
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model, lookup in ((Board, 'pk'), (Column, 'board'), (Task, 'column__board'), (Subtask, 'task__column__board')):
+            model.objects.filter(**{lookup: self.board.id}).update(last_modified=an_hour_ago)
+        self.cursor = APIClient().get(f'/tasks/boards/{self.board.id}/changes/').data['cursor']
+
+    def changes(self, client, board=None):
+        board = board or self.board
+        return client.get(f'/tasks/boards/{board.id}/changes/', {'since': self.cursor}).data
+
+    def test_initial_sync_returns_whole_board(self):
+        client = APIClient()
+        response = client.get(f'/tasks/boards/{self.board.id}/changes/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['reset'])
+        self.assertEqual(response.data['board']['name'], self.board.name)
+        self.assertEqual((len(response.data['columns']), len(response.data['tasks']), len(response.data['subtasks'])), (2, 4, 8))
+
+    def test_no_changes(self):
+        changes = self.changes(APIClient())
+
+        self.assertFalse(changes['reset'])
+        self.assertIsNone(changes['board'])
+        self.assertEqual((changes['columns'], changes['tasks'], changes['subtasks']), ([], [], []))
+        self.assertEqual(changes['deleted'], {'columns': [], 'tasks': [], 'subtasks': []})
+
+    def test_changed_and_deleted_rows(self):
+        client = APIClient()
+        task = Task.objects.filter(column=self.first).first()
+        kept, removed = task.subtasks.all()
+        client.patch(f'/tasks/items/{task.id}/', data={
+            'title': 'Renamed', 'subtasks': [{'id': kept.id, 'title': kept.title, 'status': not kept.status}],
+        }, format='json')
+        second_tasks = list(Task.objects.filter(column=self.second).values_list('id', flat=True))
+        second_subtasks = list(Subtask.objects.filter(task__column=self.second).values_list('id', flat=True))
+        client.patch(f'/tasks/boards/{self.board.id}/', data={'columns': [{'id': self.first.id, 'name': 'Todo'}]}, format='json')
+
+        changes = self.changes(client)
+
+        self.assertEqual(changes['board']['id'], self.board.id)
+        self.assertEqual([column['name'] for column in changes['columns']], ['Todo'])
+        self.assertEqual([changed['title'] for changed in changes['tasks']], ['Renamed'])
+        # Subtasks of a changed task are sent along.
+        self.assertEqual([subtask['id'] for subtask in changes['subtasks']], [kept.id])
+        self.assertEqual(changes['deleted']['columns'], [self.second.id])
+        self.assertCountEqual(changes['deleted']['tasks'], second_tasks)
+        self.assertCountEqual(changes['deleted']['subtasks'], [removed.id, *second_subtasks])
+
+    def test_task_moved_to_another_board(self):
+        client = APIClient()
+        other = seed_board(1, 0, 0)
+        task = Task.objects.filter(column=self.first).first()
+        client.post(f'/tasks/items/{task.id}/move/', data={'column': other.columns.get().id}, format='json')
+
+        self.assertEqual(self.changes(client)['deleted']['tasks'], [task.id])
+        changes = self.changes(client, other)
+        self.assertEqual([changed['id'] for changed in changes['tasks']], [task.id])
+        self.assertEqual(len(changes['subtasks']), 2)
+
+    def test_rebalance_is_a_change(self):
+        rebalance_column(self.first.id)
+
+        changes = self.changes(APIClient())
+        self.assertEqual(len(changes['tasks']), 2)
+
+    def test_expired_cursor_resets(self):
+        client = APIClient()
+        self.cursor = encode_changes_cursor(timezone.now() - TOMBSTONE_RETENTION - timedelta(days=1))
+
+        changes = self.changes(client)
+        self.assertTrue(changes['reset'])
+        self.assertEqual(len(changes['tasks']), 4)
+
+    def test_invalid_cursor(self):
+        client = APIClient()
+        for cursor in ('invalid', encode_cursor({'t': 'yesterday'}), encode_cursor({'t': '2026-01-01T00:00:00'})):
+            response = client.get(f'/tasks/boards/{self.board.id}/changes/', {'since': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deleted_board_leaves_no_tombstones(self):
+        client = APIClient()
+        client.delete(f'/tasks/boards/{self.board.id}/')
+
+        self.assertFalse(Tombstone.objects.filter(board_id=self.board.id).exists())
+
+
+class TaskSearchTests(APITestCase):
+    def setUp(self):
+        self.board = seed_board(2, 0, 0)
+        self.first, self.second = Column.objects.filter(board=self.board)
+        client = APIClient()
+        self.title_match = self.create_task(client, self.first, 'Fix the invoice export')
+        self.description_match = self.create_task(client, self.first, 'Billing', description='The invoice totals are wrong.')
+        self.subtask_match = self.create_task(client, self.second, 'Release', subtasks=[{'title': 'Send invoices'}])
+        self.create_task(client, self.second, 'Unrelated', description='Nothing to see here.')
+
+    def create_task(self, client, column, title, description='', subtasks=()):
+        data = {'title': title, 'description': description, 'column': column.id, 'subtasks': list(subtasks)}
+        return client.post('/tasks/items/', data=data, format='json').data['id']
+
+    def search(self, client, **params):
+        return client.get('/tasks/items/search/', params)
+
+    def result_ids(self, response):
+        return [result['id'] for result in response.data['results']]
+
+    def test_search_ranks_title_description_and_subtask_matches(self):
+        client = APIClient()
+        response = self.search(client, q='invoicing')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.result_ids(response), [self.title_match, self.description_match, self.subtask_match])
+        result = response.data['results'][0]
+        self.assertEqual(result['board'], self.board.id)
+        self.assertEqual(result['column'], self.first.id)
+        self.assertGreater(result['relevance'], response.data['results'][1]['relevance'])
+
+    def test_search_syntax(self):
+        client = APIClient()
+
+        self.assertEqual(self.result_ids(self.search(client, q='invoice -export')), [self.description_match, self.subtask_match])
+        self.assertEqual(self.result_ids(self.search(client, q='"invoice export"')), [self.title_match])
+        self.assertEqual(self.result_ids(self.search(client, q='missing')), [])
+
+    def test_search_filters(self):
+        client = APIClient()
+        other = seed_board(1, 0, 0)
+        self.create_task(client, Column.objects.get(board=other), 'Invoice elsewhere')
+
+        response = self.search(client, q='invoice', board=self.board.id)
+        self.assertEqual(len(response.data['results']), 3)
+        response = self.search(client, q='invoice', column=self.second.id)
+        self.assertEqual(self.result_ids(response), [self.subtask_match])
+
+    def test_search_pagination(self):
+        client = APIClient()
+        first_page = self.search(client, q='invoice', page_size=2)
+        self.assertEqual(len(first_page.data['results']), 2)
+        self.assertNotIn('count_estimate', self.search(client, q='invoice', count='estimate').data)
+
+        second_page = client.get(first_page.data['next'])
+        self.assertIsNone(second_page.data['next'])
+        self.assertEqual(
+            self.result_ids(first_page) + self.result_ids(second_page),
+            [self.title_match, self.description_match, self.subtask_match],
+        )
+
+    def test_search_requires_query(self):
+        client = APIClient()
+
+        self.assertEqual(self.search(client).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.search(client, q='invoice', board='first').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_subtask_changes_are_searchable(self):
+        client = APIClient()
+        client.patch(f'/tasks/items/{self.subtask_match}/', data={'subtasks': [{'title': 'Tag the release'}]}, format='json')
+
+        self.assertNotIn(self.subtask_match, self.result_ids(self.search(client, q='invoice')))
+        self.assertEqual(self.result_ids(self.search(client, q='tag')), [self.subtask_match])
+        # Saving the task row without its subtasks keeps their titles.
+        client.patch(f'/tasks/items/{self.subtask_match}/', data={'title': 'Ship', 'subtasks': [{'title': 'Tag'}]}, format='json')
+        self.assertEqual(Task.objects.get(pk=self.subtask_match).subtask_titles, 'Tag')
+
+    def test_imported_and_cloned_subtasks_are_searchable(self):
+        client = APIClient()
+        export = b''.join(client.get(f'/tasks/boards/{self.board.id}/export/').streaming_content)
+        imported = client.post('/tasks/boards/import/', data=export, content_type='application/x-ndjson').data['id']
+        cloned = client.post(f'/tasks/boards/{self.board.id}/clone/', format='json').data['id']
+
+        for board_id in (imported, cloned):
+            response = self.search(client, q='invoice', column=Column.objects.filter(board=board_id).last().id)
+            self.assertEqual(len(response.data['results']), 1)
+
+    def test_search_uses_gin_index(self):
+        seed_board(10, 500, 0)
+        with connection.cursor() as cursor:
+            # Move the seeded rows out of the index's pending list, as vacuum would.
+            cursor.execute("SELECT gin_clean_pending_list('task_search_vector_idx')")
+            cursor.execute(f'ANALYZE {Task._meta.db_table}')
+
+        plan = search_tasks('invoice').explain()
+        self.assertIn('task_search_vector_idx', plan, plan)
+
+
+class SeedingTests(APITestCase):
+    def test_seed_board(self):
+        board = seed_board(2, 3, 2, name='Seeded')
+
+        columns = list(Column.objects.filter(board=board))
+        self.assertEqual([column.name for column in columns], ['Column 0', 'Column 1'])
+        tasks = list(Task.objects.filter(column=columns[1]))
+        self.assertEqual([task.title for task in tasks], ['Task 0', 'Task 1', 'Task 2'])
+        self.assertEqual([task.rank for task in tasks], spaced_ranks(3))
+        self.assertEqual((tasks[0].total_subtasks, tasks[0].completed_subtasks), (2, 1))
+        self.assertEqual(list(tasks[0].subtasks.values_list('title', 'status')), [('Subtask 0', True), ('Subtask 1', False)])
+        self.assertEqual(Task.objects.get(pk=tasks[0].id).subtask_titles, 'Subtask 0 Subtask 1')
+
+    def test_delete_seeded_board(self):
+        board, other = seed_board(2, 3, 2), seed_board(1, 1, 1)
+        delete_seeded_board(board.id)
+
+        self.assertFalse(Board.objects.filter(pk=board.id).exists())
+        self.assertEqual((Task.objects.count(), Subtask.objects.count()), (1, 1))
+        self.assertFalse(Tombstone.objects.filter(board_id=board.id).exists())
+        self.assertTrue(Board.objects.filter(pk=other.id).exists())
+
+    def test_bench_endpoints_covers_every_url(self):
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as output:
+            call_command('bench_endpoints', runs=1, output=output.name, stdout=io.StringIO())
+            report = json.load(output)
+
+        self.assertEqual(report['dataset']['tasks'], 100)
+        url_names = {result['url_name'] for result in report['results']} | set(report['skipped'])
+        self.assertEqual(url_names, {pattern.name for pattern in urlpatterns})
+        for result in report['results']:
+            self.assertLess(result['status'], 400, result)
+        self.assertFalse(Board.objects.filter(name='Benchmark Board').exists())
+
+
+@unittest.skipIf(prometheus_client is None, 'prometheus_client is not installed.')
+class RequestMetricsTests(APITestCase):
+    def sample(self, name, view, method='GET', **labels):
+        return prometheus_client.REGISTRY.get_sample_value(name, {'view': view, 'method': method, **labels}) or 0
+
+    def test_records_request_metrics_per_view(self):
+        client = APIClient()
+        board = seed_board(2, 3, 2)
+        requests = self.sample('kanban_request_duration_seconds_count', 'board-detail')
+        queries = self.sample('kanban_request_queries_sum', 'board-detail')
+        size = self.sample('kanban_response_size_bytes_sum', 'board-detail')
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/tasks/boards/{board.id}/')
+
+        self.assertEqual(self.sample('kanban_request_duration_seconds_count', 'board-detail'), requests + 1)
+        self.assertEqual(self.sample('kanban_request_queries_sum', 'board-detail'), queries + len(context.captured_queries))
+        self.assertEqual(self.sample('kanban_response_size_bytes_sum', 'board-detail'), size + len(response.content))
+        self.assertGreater(self.sample('kanban_request_db_duration_seconds_sum', 'board-detail'), 0)
+        self.assertGreater(self.sample('kanban_requests_total', 'board-detail', status='200'), 0)
+
+    def test_unresolved_requests_share_a_label(self):
+        client = APIClient()
+        requests = self.sample('kanban_requests_total', 'unresolved', status='404')
+        client.get('/tasks/missing/')
+        client.get('/missing/')
+
+        self.assertEqual(self.sample('kanban_requests_total', 'unresolved', status='404'), requests + 2)
+
+    def test_streaming_response_recorded_once_sent(self):
+        client = APIClient()
+        board = seed_board(1, 2, 2)
+        requests = self.sample('kanban_request_duration_seconds_count', 'board-export')
+        queries = self.sample('kanban_request_queries_sum', 'board-export')
+
+        response = client.get(f'/tasks/boards/{board.id}/export/')
+        self.assertEqual(self.sample('kanban_request_duration_seconds_count', 'board-export'), requests)
+        with CaptureQueriesContext(connection) as context:
+            content = b''.join(response.streaming_content)
+
+        self.assertEqual(self.sample('kanban_request_duration_seconds_count', 'board-export'), requests + 1)
+        # The board lookup before streaming, and the export queries.
+        self.assertEqual(self.sample('kanban_request_queries_sum', 'board-export'), queries + 1 + len(context.captured_queries))
+        self.assertEqual(self.sample('kanban_response_size_bytes_count', 'board-export'), requests + 1)
+        self.assertGreaterEqual(self.sample('kanban_response_size_bytes_sum', 'board-export'), len(content))
+
+    def test_metrics_endpoint(self):
+        client = APIClient()
+        client.get('/tasks/boards/')
+        response = client.get('/metrics')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'kanban_request_queries_bucket{le="1.0",method="GET",view="board-list"}', response.content)
+
+    def test_metrics_endpoint_reads_multiprocess_directory(self):
+        client = APIClient()
+        client.get('/tasks/boards/')
+        with tempfile.TemporaryDirectory() as directory, mock.patch.dict('os.environ', {'PROMETHEUS_MULTIPROC_DIR': directory}):
+            response = client.get('/metrics')
+
+        # This process doesn't write to the directory, so nothing is collected.
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(b'kanban_request', response.content)
+
+
+@unittest.skipIf(orjson is None, 'orjson is not installed.')
+class FastJSONTests(APITestCase):
+    def assertSameRendering(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_renders_like_json_renderer(self):
+        now = timezone.now()
+        for data in (
+            {'title': 'Ünïcode \u2028 line \u2029 separators', 'nested': [{'a': None, 'b': True}, [], {}]},
+            {'floats': [0.1, 1.0, 0.0001, 1e-05, 2.5e-07, 1e16, 123456789.123, -0.0]},
+            {'date': now, 'naive': datetime(2024, 1, 2, 3, 4, 5, 6789), 'day': now.date(), 'time': datetime(2024, 1, 1, 9, 30).time()},
+            {'decimal': Decimal('1.50'), 'uuid': uuid.UUID(int=1), 'lazy': gettext_lazy('Lazy'), 'delta': timedelta(seconds=90)},
+            {'big': 2 ** 70, 1: 'integer key', 'set': {1}},
+            'plain string with 1e5 inside',
+            [ValidationError('Invalid.').detail],
+        ):
+            with self.subTest(data=data):
+                self.assertSameRendering(data)
+        self.assertSameRendering({'id': 1}, 'application/json; indent=4')
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_board_responses_match_json_renderer(self):
+        client = APIClient()
+        board = seed_board(2, 3, 2)
+        Task.objects.filter(column__board=board).update(title='Tâche \u2028 1', description='Naïve')
+        response = client.get(f'/tasks/boards/{board.id}/')
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+        response = client.get('/tasks/items/search/', {'q': 'tâche'})
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_parses_like_json_parser(self):
+        for content in (
+            '{"title": "Ünïcode", "subtasks": [{"id": 1, "status": true}], "rank": null, "weight": 1.5e-07}',
+            '{"big": 1180591620717411303424}',
+            '"\\ud800"',
+        ):
+            with self.subTest(content=content):
+                self.assertEqual(
+                    FastJSONParser().parse(io.BytesIO(content.encode())),
+                    JSONParser().parse(io.BytesIO(content.encode())),
+                )
+
+    def parse_error(self, parser, content: bytes) -> str:
+        with self.assertRaises(ParseError) as context:
+            parser.parse(io.BytesIO(content))
+        return str(context.exception)
+
+    def test_rejects_like_json_parser(self):
+        for content in (b'{"title": ', b'{"value": NaN}', b'\xff'):
+            with self.subTest(content=content):
+                self.assertEqual(self.parse_error(FastJSONParser(), content), self.parse_error(JSONParser(), content))
+
+    def test_invalid_request_body(self):
+        client = APIClient()
+        response = client.post('/tasks/boards/', data='{"name": ', content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['detail'].startswith('JSON parse error'))
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.board = seed_board(2, 2, 2)
+        self.task = Task.objects.filter(column__board=self.board).first()
+
+    def selected_columns(self, queries, table: str) -> str:
+        return ' '.join(query['sql'].split(' FROM ')[0] for query in queries if f'FROM "{table}"' in query['sql'])
+
+    def test_parse_fields(self):
+        self.assertEqual(
+            parse_fields('id, columns.tasks.title,columns.tasks.subtasks,columns.name'),
+            {'id': None, 'columns': {'tasks': {'title': None, 'subtasks': None}, 'name': None}},
+        )
+        # A relation selected in full stays in full.
+        self.assertEqual(parse_fields('columns.name,columns'), {'columns': None})
+        self.assertEqual(parse_fields('columns,columns.name'), {'columns': None})
+
+    def test_get_board_nested_fields(self):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'/tasks/boards/{self.board.id}/', {'fields': 'id,columns.tasks.title'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.board.id)
+        self.assertEqual(list(response.data), ['id', 'columns'])
+        self.assertEqual(response.data['columns'][0], {'tasks': [{'title': 'Task 0'}, {'title': 'Task 1'}]})
+        # Unselected columns aren't read, and subtasks aren't prefetched.
+        task_columns = self.selected_columns(queries.captured_queries, 'tasks_task')
+        self.assertIn('"title"', task_columns)
+        self.assertNotIn('"description"', task_columns)
+        self.assertNotIn('"created_at"', task_columns)
+        self.assertNotIn('"name"', self.selected_columns(queries.captured_queries, 'tasks_column'))
+        self.assertFalse(self.selected_columns(queries.captured_queries, 'tasks_subtask'))
+
+    def test_get_board_full_document_unchanged(self):
+        client = APIClient()
+        prefetch_related_objects([self.board], 'columns__tasks__subtasks')
+        response = client.get(f'/tasks/boards/{self.board.id}/')
+
+        self.assertEqual(response.data, BoardSerializer(self.board).data)
+
+    def test_get_board_summary_fields(self):
+        client = APIClient()
+        response = client.get(
+            f'/tasks/boards/{self.board.id}/', {'view': 'summary', 'fields': 'columns.tasks.completed_subtasks'}
+        )
+
+        self.assertEqual(response.data, {'columns': [{'tasks': [{'completed_subtasks': 1}] * 2}] * 2})
+
+    def test_fields_override_snapshot(self):
+        client = APIClient()
+        response = client.get(f'/tasks/boards/{self.board.id}/', {'snapshot': '1', 'fields': 'name'})
+
+        self.assertEqual(response.data, {'name': self.board.name})
+
+    def test_unknown_fields(self):
+        client = APIClient()
+        for fields, path in (
+            ('columns.bogus', 'columns.bogus'),
+            ('name.length', 'name.length'),
+            ('id,', ''),
+            ('columns.tasks.description', 'columns.tasks.description'),
+        ):
+            with self.subTest(fields=fields):
+                response = client.get(f'/tasks/boards/{self.board.id}/', {'fields': fields})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data, {'fields': [UNKNOWN_FIELD.format(path)]})
+
+    def test_fields_have_own_etag_and_cache_entry(self):
+        client = APIClient()
+        full = client.get(f'/tasks/boards/{self.board.id}/')
+        sparse = client.get(f'/tasks/boards/{self.board.id}/', {'fields': 'columns.name,id'})
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+
+        # The same selection in another order is the same variant.
+        response = client.get(
+            f'/tasks/boards/{self.board.id}/', {'fields': 'id,columns.name'}, HTTP_IF_NONE_MATCH=sparse['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        with self.assertNumQueries(1):
+            response = client.get(f'/tasks/boards/{self.board.id}/', {'fields': 'id,columns.name'})
+        self.assertEqual(response.data, sparse.data)
+        self.assertEqual(client.get(f'/tasks/boards/{self.board.id}/').data, full.data)
+
+        column = Column.objects.filter(board=self.board).first()
+        client.patch(f'/tasks/boards/{self.board.id}/', data={'columns': [{'id': column.id, 'name': 'Renamed'}]}, format='json')
+        response = client.get(f'/tasks/boards/{self.board.id}/', {'fields': 'id,columns.name'})
+        self.assertEqual(response.data['columns'], [{'name': 'Renamed'}])
+
+    def test_get_boards_fields(self):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/tasks/boards/', {'fields': 'id,columns.name'})
+
+        self.assertEqual(response.data['results'], [
+            {'id': self.board.id, 'columns': [{'name': 'Column 0'}, {'name': 'Column 1'}]},
+        ])
+        self.assertNotIn('"name"', self.selected_columns(queries.captured_queries, 'tasks_board'))
+
+    def test_get_task_fields(self):
+        client = APIClient()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'/tasks/items/{self.task.id}/', {'fields': 'title,subtasks.status'})
+
+        self.assertEqual(response.data, {'title': self.task.title, 'subtasks': [{'status': True}, {'status': False}]})
+        self.assertNotIn('"description"', self.selected_columns(queries.captured_queries, 'tasks_task'))
+        self.assertNotIn('"title"', self.selected_columns(queries.captured_queries, 'tasks_subtask'))
+
+        response = client.get(f'/tasks/items/{self.task.id}/')
+        self.assertEqual(list(response.data), ['id', 'title', 'description', 'column', 'subtasks', 'created_at', 'last_modified'])
+
+    def test_search_fields(self):
+        client = APIClient()
+        response = client.get('/tasks/items/search/', {'q': 'task', 'board': self.board.id, 'fields': 'id,relevance'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'relevance'})
+
+    def test_changes_fields(self):
+        client = APIClient()
+        response = client.get(f'/tasks/boards/{self.board.id}/changes/', {'fields': 'board.name,tasks.id,tasks.column'})
+
+        self.assertEqual(set(response.data), {'cursor', 'reset', 'board', 'tasks', 'deleted'})
+        self.assertEqual(response.data['board'], {'name': self.board.name})
+        self.assertEqual(set(response.data['tasks'][0]), {'id', 'column'})
+
+        response = client.get(f'/tasks/boards/{self.board.id}/changes/', {'fields': 'cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_async_fields_match_sync(self):
+        client = APIClient()
+        for sync_url, async_url in (
+            (f'/tasks/boards/{self.board.id}/', f'/tasks/async/boards/{self.board.id}/'),
+            (f'/tasks/boards/{self.board.id}/?view=summary', f'/tasks/async/boards/{self.board.id}/?view=summary'),
+            (f'/tasks/items/{self.task.id}/', f'/tasks/async/items/{self.task.id}/'),
+        ):
+            separator = '&' if '?' in sync_url else '?'
+            for fields in ('id,columns.tasks.title', 'columns.name', 'title,subtasks.status', 'bogus'):
+                expected = await sync_to_async(client.get)(f'{sync_url}{separator}fields={fields}', HTTP_ACCEPT='application/json')
+                response = await self.async_client.get(f'{async_url}{separator}fields={fields}')
+
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.content, expected.content)
+                self.assertEqual(response.get('ETag'), expected.get('ETag'))
+
+        response = await self.async_client.get('/tasks/async/boards/', {'fields': 'name'})
+        self.assertEqual(json.loads(response.content)['results'], [{'name': self.board.name}])
+
+
+class ColumnTaskWindowTests(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.board = seed_board(2, 5, 1)
+        self.first, self.second = Column.objects.filter(board=self.board).order_by('id')
+        window = mock.patch.object(ColumnTaskPagination, 'page_size', 2)
+        window.start()
+        self.addCleanup(window.stop)
+
+    def task_counts(self) -> list[int]:
+        return [column.task_count for column in Column.objects.filter(board=self.board).order_by('id')]
+
+    def test_board_windows_tasks(self):
+        client = APIClient()
+        response = client.get(f'/tasks/boards/{self.board.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        column = response.data['columns'][0]
+        self.assertEqual([task['title'] for task in column['tasks']], ['Task 0', 'Task 1'])
+        self.assertEqual(column['task_count'], 5)
+        self.assertIsNotNone(column['tasks_cursor'])
+
+        Task.objects.filter(column=self.first).exclude(title__in=['Task 0', 'Task 1']).delete()
+        caches['default'].clear()
+        response = client.get(f'/tasks/boards/{self.board.id}/')
+        self.assertEqual(len(response.data['columns'][0]['tasks']), 2)
+        self.assertIsNone(response.data['columns'][0]['tasks_cursor'])
+
+    def test_column_tasks_pages_past_window(self):
+        client = APIClient()
+        cursor = client.get(f'/tasks/boards/{self.board.id}/').data['columns'][0]['tasks_cursor']
+        url = f'/tasks/boards/{self.board.id}/columns/{self.first.id}/tasks/'
+
+        titles = []
+        params = {'cursor': cursor}
+        while url:
+            response = client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            titles += [task['title'] for task in response.data['results']]
+            url, params = response.data['next'], None
+        self.assertEqual(titles, ['Task 2', 'Task 3', 'Task 4'])
+
+        response = client.get(f'/tasks/boards/{self.board.id}/columns/{self.first.id}/tasks/', {'fields': 'title'})
+        self.assertEqual(response.data['results'], [{'title': 'Task 0'}, {'title': 'Task 1'}])
+
+    def test_column_tasks_not_found(self):
+        client = APIClient()
+        other = seed_board(1, 1, 0)
+        response = client.get(f'/tasks/boards/{other.id}/columns/{self.first.id}/tasks/')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], COLUMN_NOT_FOUND)
+
+    def test_windows_queries_dont_grow_with_columns(self):
+        client = APIClient()
+        seed_board(1, 1, 1)
+        # Board, columns, task windows, subtasks.
+        with self.assertNumQueries(4):
+            client.get(f'/tasks/boards/{self.board.id}/')
+
+    def test_snapshot_matches_windowed_serializer(self):
+        client = APIClient()
+        Column.objects.create(name='Empty Column', board=self.board)
+        response = client.get(f'/tasks/boards/{self.board.id}/', {'snapshot': 'true'})
+
+        board = Board.objects.get(pk=self.board.id)
+        prefetch_documents([board], BoardSerializer)
+        self.assertEqual(response.content, JSONRenderer().render(BoardSerializer(board).data))
+        self.assertIsNotNone(json.loads(response.content)['columns'][0]['tasks_cursor'])
+
+    def test_task_count_follows_writes(self):
+        client = APIClient()
+        self.assertEqual(self.task_counts(), [5, 5])
+
+        client.post('/tasks/items/', data={'title': 'New', 'column': self.first.id}, format='json')
+        self.assertEqual(self.task_counts(), [6, 5])
+
+        task = Task.objects.filter(column=self.first).first()
+        client.post(f'/tasks/items/{task.id}/move/', data={'column': self.second.id}, format='json')
+        self.assertEqual(self.task_counts(), [5, 6])
+
+        ids = list(Task.objects.filter(column=self.second).values_list('id', flat=True)[:3])
+        client.post('/tasks/items/bulk/', data={'op': 'move', 'ids': ids, 'column': self.first.id}, format='json')
+        self.assertEqual(self.task_counts(), [8, 3])
+
+        client.post('/tasks/items/bulk/', data={'op': 'delete', 'ids': ids}, format='json')
+        self.assertEqual(self.task_counts(), [5, 3])
+
+        response = client.post(f'/tasks/boards/{self.board.id}/clone/', format='json')
+        clone = Column.objects.filter(board_id=response.data['id']).order_by('id')
+        self.assertEqual([column.task_count for column in clone], [5, 3])
+
+
+class DeletionTests(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.board = seed_board(2, 3, 2)
+        self.first, self.second = Column.objects.filter(board=self.board).order_by('id')
+        self.task = Task.objects.filter(column=self.first).first()
+        self.cursor = encode_changes_cursor(timezone.now() - timedelta(seconds=1))
+
+    def test_delete_board_marks_it_deleted(self):
+        client = APIClient()
+        with mock.patch('tasks.views.schedule_purge') as schedule_purge:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.delete(f'/tasks/boards/{self.board.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        schedule_purge.assert_called_once_with(self.board.id)
+        # The columns, tasks and subtasks aren't read or written.
+        for table in ('tasks_column', 'tasks_task', 'tasks_subtask'):
+            self.assertFalse([query for query in queries.captured_queries if f'"{table}"' in query['sql']])
+        self.assertTrue(Board.all_objects.filter(pk=self.board.id, deleted_at__isnull=False).exists())
+        self.assertEqual(Task.all_objects.filter(column__board=self.board).count(), 6)
+
+    def test_deleted_board_is_hidden(self):
+        client = APIClient()
+        client.delete(f'/tasks/boards/{self.board.id}/')
+
+        for url in (
+            f'/tasks/boards/{self.board.id}/',
+            f'/tasks/boards/{self.board.id}/changes/',
+            f'/tasks/boards/{self.board.id}/columns/{self.first.id}/tasks/',
+            f'/tasks/items/{self.task.id}/',
+            f'/tasks/async/items/{self.task.id}/',
+        ):
+            self.assertEqual(client.get(url).status_code, status.HTTP_404_NOT_FOUND, url)
+        self.assertEqual(client.get('/tasks/boards/').data['results'], [])
+        self.assertEqual(client.get('/tasks/items/search/', {'q': 'task'}).data['results'], [])
+        response = client.post('/tasks/items/', data={'title': 'New', 'column': self.first.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        boards = Board.all_objects.count()
+        response = client.post(f'/tasks/boards/{self.board.id}/clone/', format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Board.all_objects.count(), boards)
+
+    def test_deleted_task_is_hidden(self):
+        client = APIClient()
+        subtask_ids = list(self.task.subtasks.values_list('id', flat=True))
+        response = client.delete(f'/tasks/items/{self.task.id}/')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertTrue(Task.all_objects.filter(pk=self.task.id).exists())
+        self.assertEqual(client.get(f'/tasks/items/{self.task.id}/').status_code, status.HTTP_404_NOT_FOUND)
+        for params in ({}, {'snapshot': 'true'}):
+            column = client.get(f'/tasks/boards/{self.board.id}/', params, HTTP_ACCEPT='application/json').json()['columns'][0]
+            self.assertNotIn(self.task.id, [task['id'] for task in column['tasks']])
+            self.assertEqual(column['task_count'], 2)
+        response = client.get(f'/tasks/boards/{self.board.id}/columns/{self.first.id}/tasks/')
+        self.assertNotIn(self.task.id, [task['id'] for task in response.data['results']])
+
+        changes = client.get(f'/tasks/boards/{self.board.id}/changes/', {'since': self.cursor}).data
+        self.assertEqual(changes['deleted']['tasks'], [self.task.id])
+        self.assertCountEqual(changes['deleted']['subtasks'], subtask_ids)
+
+        export = b''.join(client.get(f'/tasks/boards/{self.board.id}/export/').streaming_content)
+        lines = [json.loads(line) for line in export.splitlines()]
+        self.assertEqual(len([line for line in lines if line['type'] == 'task']), 5)
+        self.assertNotIn(self.task.id, [line.get('task') for line in lines])
+        clone = client.post(f'/tasks/boards/{self.board.id}/clone/', format='json').data
+        self.assertEqual(Task.objects.filter(column__board_id=clone['id']).count(), 5)
+
+    def test_bulk_delete_marks_tasks_deleted(self):
+        client = APIClient()
+        ids = list(Task.objects.filter(column=self.second).values_list('id', flat=True))
+        client.post('/tasks/items/bulk/', data={'op': 'delete', 'ids': ids}, format='json')
+
+        self.assertEqual(Task.all_objects.filter(pk__in=ids, deleted_at__isnull=False).count(), 3)
+        self.assertEqual(Column.objects.get(pk=self.second.id).task_count, 0)
+
+    def test_purge_board(self):
+        client = APIClient()
+        with mock.patch('tasks.views.schedule_purge'):
+            client.delete(f'/tasks/boards/{self.board.id}/')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(purge_board(self.board.id, batch_size=4), 6)
+        # Batches are taken in no particular order, so nothing sorts the board's tasks.
+        self.assertFalse([query for query in queries.captured_queries if 'ORDER BY' in query['sql']])
+        self.assertFalse(Board.all_objects.filter(pk=self.board.id).exists())
+        self.assertFalse(Column.all_objects.filter(board_id=self.board.id).exists())
+        self.assertFalse(Subtask.all_objects.filter(task_id=self.task.id).exists())
+        self.assertFalse(Tombstone.objects.filter(board_id=self.board.id).exists())
+
+    def test_purge_deleted_command(self):
+        client = APIClient()
+        other = seed_board(1, 2, 1)
+        with mock.patch('tasks.views.schedule_purge'):
+            client.delete(f'/tasks/boards/{other.id}/')
+        client.delete(f'/tasks/items/{self.task.id}/')
+
+        output = io.StringIO()
+        call_command('purge_deleted', batch_size=1, stdout=output)
+
+        self.assertEqual(output.getvalue().strip(), 'Purged 1 deleted boards and 3 tasks.')
+        self.assertFalse(Task.all_objects.filter(pk=self.task.id).exists())
+        self.assertFalse(Subtask.all_objects.filter(task_id=self.task.id).exists())
+        self.assertFalse(Board.all_objects.filter(pk=other.id).exists())
+        self.assertEqual(Task.objects.filter(column__board=self.board).count(), 5)
+        self.assertEqual(Column.objects.get(pk=self.first.id).task_count, 2)
+        # The task's tombstones were recorded when it was deleted, not again.
+        self.assertEqual(Tombstone.objects.filter(board_id=self.board.id, kind=Tombstone.TASK).count(), 1)
+
+    def test_database_cascades_deletes(self):
+        with self.assertNumQueries(1):
+            Board.all_objects.filter(pk=self.board.id).delete()
+
+        self.assertFalse(Column.all_objects.filter(board_id=self.board.id).exists())
+        self.assertFalse(Subtask.all_objects.filter(task_id=self.task.id).exists())
+
+
+class ArchiveTests(APITestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.board = seed_board(2, 3, 2)
+        self.first, self.second = Column.objects.filter(board=self.board).order_by('id')
+        self.task, self.recent, self.unfinished = Task.objects.filter(column=self.first)
+        self.subtask_ids = list(Subtask.objects.filter(task=self.task).values_list('id', flat=True))
+        self.finish(self.task, days=100)
+        self.finish(self.recent, days=10)
+        Task.all_objects.filter(pk=self.unfinished.id).update(last_modified=timezone.now() - timedelta(days=100))
+        self.cursor = encode_changes_cursor(timezone.now() - timedelta(seconds=1))
+
+    def finish(self, task, days):
+        Subtask.objects.filter(task=task).update(status=True)
+        Task.all_objects.filter(pk=task.id).update(
+            completed_subtasks=F('total_subtasks'), last_modified=timezone.now() - timedelta(days=days)
+        )
+
+    def test_command_archives_finished_tasks(self):
+        client = APIClient()
+        version = Board.objects.get(pk=self.board.id).version
+        output = io.StringIO()
+        call_command('archive_tasks', days=30, batch_size=1, stdout=output)
+
+        self.assertEqual(output.getvalue().strip(), 'Archived 1 tasks unmodified for 30 days.')
+        self.assertFalse(Task.all_objects.filter(pk=self.task.id).exists())
+        self.assertFalse(Subtask.all_objects.filter(pk__in=self.subtask_ids).exists())
+        archived = ArchivedTask.objects.get(pk=self.task.id)
+        self.assertEqual((archived.title, archived.column_id, archived.completed_subtasks), (self.task.title, self.first.id, 2))
+        self.assertEqual(list(archived.subtasks.values_list('id', flat=True)), self.subtask_ids)
+        self.assertEqual(Task.objects.filter(column=self.first).count(), 2)
+        self.assertEqual(Column.objects.get(pk=self.first.id).task_count, 2)
+        self.assertEqual(Board.objects.get(pk=self.board.id).version, version + 1)
+
+        changes = client.get(f'/tasks/boards/{self.board.id}/changes/', {'since': self.cursor}).data
+        self.assertEqual(changes['deleted']['tasks'], [self.task.id])
+        self.assertCountEqual(changes['deleted']['subtasks'], self.subtask_ids)
+
+    def test_board_reads_only_live_tasks(self):
+        client = APIClient()
+        client.get(f'/tasks/boards/{self.board.id}/')
+        archive([(self.task.id, self.board.id)])
+
+        for params in ({}, {'snapshot': 'true'}):
+            column = client.get(f'/tasks/boards/{self.board.id}/', params, HTTP_ACCEPT='application/json').json()['columns'][0]
+            self.assertNotIn(self.task.id, [task['id'] for task in column['tasks']])
+            self.assertEqual(column['task_count'], 2)
+        self.assertEqual(client.get(f'/tasks/items/{self.task.id}/').status_code, status.HTTP_404_NOT_FOUND)
+        results = client.get('/tasks/items/search/', {'q': self.task.title}).data['results']
+        self.assertNotIn(self.task.id, [task['id'] for task in results])
+
+    def test_archived_tasks_endpoints(self):
+        client = APIClient()
+        archive([(self.task.id, self.board.id), (self.recent.id, self.board.id)])
+        ArchivedTask.objects.filter(pk=self.recent.id).update(archived_at=timezone.now() + timedelta(seconds=1))
+
+        response = client.get(f'/tasks/boards/{self.board.id}/archive/', {'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.data['results']], [self.recent.id])
+        response = client.get(response.data['next'])
+        self.assertEqual([task['id'] for task in response.data['results']], [self.task.id])
+        self.assertEqual([subtask['id'] for subtask in response.data['results'][0]['subtasks']], self.subtask_ids)
+        self.assertIsNone(response.data['next'])
+
+        with self.assertNumQueries(2):
+            response = client.get(f'/tasks/archive/{self.task.id}/', {'fields': 'id,title,subtasks.status'})
+        self.assertEqual(response.data, {
+            'id': self.task.id, 'title': self.task.title, 'subtasks': [{'status': True}, {'status': True}],
+        })
+        response = client.get(f'/tasks/archive/{self.unfinished.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data, {'error': ARCHIVED_TASK_NOT_FOUND})
+
+    def test_restore_task(self):
+        client = APIClient()
+        archive([(self.task.id, self.board.id)])
+        response = client.post(f'/tasks/archive/{self.task.id}/restore/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.task.id)
+        self.assertEqual([subtask['id'] for subtask in response.data['subtasks']], self.subtask_ids)
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertFalse(ArchivedSubtask.objects.exists())
+        # Back at the end of its column, as a change.
+        self.assertEqual(list(Task.objects.filter(column=self.first).values_list('id', flat=True))[-1], self.task.id)
+        self.assertEqual(Column.objects.get(pk=self.first.id).task_count, 3)
+        changes = client.get(f'/tasks/boards/{self.board.id}/changes/', {'since': self.cursor}).data
+        self.assertIn(self.task.id, [task['id'] for task in changes['tasks']])
+
+        response = client.post(f'/tasks/archive/{self.task.id}/restore/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deleted_boards_archive_is_hidden_and_purged(self):
+        client = APIClient()
+        archive([(self.task.id, self.board.id)])
+        with mock.patch('tasks.views.schedule_purge'):
+            client.delete(f'/tasks/boards/{self.board.id}/')
+
+        for url in (f'/tasks/boards/{self.board.id}/archive/', f'/tasks/archive/{self.task.id}/'):
+            self.assertEqual(client.get(url).status_code, status.HTTP_404_NOT_FOUND, url)
+        self.assertEqual(purge_board(self.board.id), 6)
+        self.assertFalse(ArchivedTask.all_objects.exists())
+        self.assertFalse(ArchivedSubtask.objects.exists())
@@ -0,0 +1,250 @@
+"""
+Board export as newline-delimited JSON and the matching bulk import.
+
+An export is a `board` line followed by the board's `column`, `task` and
+`subtask` lines, each carrying its own id and its parent's id. An import
+takes fresh ids from the tables' sequences, remaps the parent ids to them
+and loads the rows with COPY.
+"""
+import io
+import json
+from datetime import datetime
+
+from django.db import connection, transaction
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.utils import timezone
+
+from .models import Board, Column, Task, Subtask
+from .ranking import is_rank, rank_after
+
+EXPORT_CHUNK_SIZE = 2_000
+IMPORT_CHUNK_SIZE = 5_000
+
+EXPORT_FIELDS = {
+    'column': ('id', 'board', 'name', 'created_at', 'last_modified'),
+    'task': ('id', 'column', 'title', 'description', 'rank', 'created_at', 'last_modified'),
+    'subtask': ('id', 'task', 'title', 'status', 'created_at', 'last_modified'),
+}
+
+# Written between the id and the timestamps of an imported row.
+IMPORT_FIELDS = {
+    'column': ('board', 'name'),
+    # Subtask counters and titles start empty and are filled in once the subtasks are in.
+    'task': ('column', 'title', 'description', 'rank', 'total_subtasks', 'completed_subtasks', 'subtask_titles'),
+    'subtask': ('task', 'title', 'status'),
+}
+
+
+class BoardImportError(ValueError):
+    """Raised for an import that can't be loaded, with the offending line if known."""
+
+    def __init__(self, line: int | None = None):
+        super().__init__(line)
+        self.line = line
+
+
+def encode_line(kind: str, row: dict) -> str:
+    return json.dumps({'type': kind, **row}, separators=(',', ':'), default=datetime.isoformat) + '\n'
+
+
+def board_lines(board_id: int):
+    """
+    Yield the export of a board in chunks of lines. Rows are read through
+    server-side cursors, so memory use doesn't grow with the board, and
+    all of them from one snapshot when not already inside a transaction.
+    """
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+
+        board = Board.objects.filter(pk=board_id).values('id', 'name', 'created_at', 'last_modified').first()
+        if board is None:
+            return
+        yield encode_line('board', board)
+
+        querysets = {
+            'column': Column.objects.filter(board_id=board_id).order_by('id'),
+            'task': Task.objects.filter(column__board_id=board_id).order_by('column_id', 'rank', 'id'),
+            'subtask': Subtask.objects.filter(task__column__board_id=board_id).order_by('task_id', 'id'),
+        }
+        for kind, queryset in querysets.items():
+            lines = []
+            for row in queryset.values(*EXPORT_FIELDS[kind]).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                lines.append(encode_line(kind, row))
+                if len(lines) == EXPORT_CHUNK_SIZE:
+                    yield ''.join(lines)
+                    lines = []
+            if lines:
+                yield ''.join(lines)
+
+
+def copy_rows(model, fields: tuple[str, ...], rows: list[tuple]):
+    """Load `rows` holding the values of `fields` into the model's table with COPY."""
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(field).column) for field in fields)
+    sql = f'COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN'
+
+    with connection.cursor() as cursor:
+        if is_psycopg3:
+            with cursor.cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            cursor.cursor.copy_expert(sql, io.StringIO(''.join(copy_text(row) for row in rows)))
+
+
+def copy_text(row: tuple) -> str:
+    """A row in COPY's text format, for psycopg2."""
+    def value(item):
+        if item is None:
+            return '\\N'
+        return str(item).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+    return '\t'.join(value(item) for item in row) + '\n'
+
+
+def reserve_ids(model, count: int) -> list[int]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            [model._meta.db_table, count],
+        )
+        return [id for id, in cursor.fetchall()]
+
+
+class BoardImport:
+    """
+    Loads the lines of a board export into a new board. Rows are buffered
+    and written in chunks; parents are always written before children, so
+    a row only needs its parent to appear somewhere before its own chunk
+    is written. Must run inside a transaction.
+    """
+
+    def __init__(self, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.board = None
+        self.pending = {'column': [], 'task': [], 'subtask': []}
+        self.pending_count = 0
+        # Ids from the export mapped to the ids of the inserted rows.
+        self.column_ids = {}
+        self.task_ids = {}
+        self.last_ranks = {}
+        self.counts = {'columns': 0, 'tasks': 0, 'subtasks': 0}
+
+    def load(self, lines) -> Board:
+        for number, line in enumerate(lines, start=1):
+            if line.strip():
+                self.add(number, line)
+        if self.board is None:
+            raise BoardImportError()
+        self.flush()
+        self.count_subtasks()
+        return self.board
+
+    def add(self, number: int, line):
+        try:
+            row = json.loads(line)
+            kind = row['type']
+        except (TypeError, ValueError, KeyError):
+            raise BoardImportError(number)
+
+        if kind == 'board':
+            if self.board is not None:
+                raise BoardImportError(number)
+            self.board = Board.objects.create(name=self.text(number, row, Board, 'name'))
+            return
+        if kind not in self.pending or self.board is None:
+            raise BoardImportError(number)
+
+        self.pending[kind].append((number, row))
+        self.pending_count += 1
+        if self.pending_count >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        now = timezone.now()
+        self.copy(Column, 'column', now, self.column_record, self.column_ids)
+        self.copy(Task, 'task', now, self.task_record, self.task_ids)
+        self.copy(Subtask, 'subtask', now, self.subtask_record)
+        self.pending_count = 0
+
+    def copy(self, model, kind: str, now, record, id_map=None):
+        rows = self.pending[kind]
+        if not rows:
+            return
+
+        records = []
+        for id, (number, row) in zip(reserve_ids(model, len(rows)), rows):
+            try:
+                values = record(number, row)
+                if id_map is not None:
+                    if row['id'] in id_map:
+                        raise BoardImportError(number)
+                    id_map[row['id']] = id
+            except (TypeError, KeyError):
+                raise BoardImportError(number)
+            records.append((id, *values, row.get('created_at', now), row.get('last_modified', now)))
+
+        copy_rows(model, ('id', *IMPORT_FIELDS[kind], 'created_at', 'last_modified'), records)
+        self.counts[f'{kind}s'] += len(records)
+        rows.clear()
+
+    def column_record(self, number: int, row: dict) -> tuple:
+        return self.board.id, self.text(number, row, Column, 'name')
+
+    def task_record(self, number: int, row: dict) -> tuple:
+        column_id = self.parent(number, self.column_ids, row['column'])
+        rank = row.get('rank') or rank_after(self.last_ranks.get(column_id))
+        # Later moves and appends compute ranks from the stored ones.
+        if not is_rank(rank):
+            raise BoardImportError(number)
+        self.last_ranks[column_id] = max(rank, self.last_ranks.get(column_id, ''))
+        return (
+            column_id,
+            self.text(number, row, Task, 'title'),
+            self.text(number, row, Task, 'description', ''),
+            rank,
+            0,
+            0,
+            '',
+        )
+
+    def subtask_record(self, number: int, row: dict) -> tuple:
+        status = row.get('status', False)
+        if not isinstance(status, bool):
+            raise BoardImportError(number)
+        return self.parent(number, self.task_ids, row['task']), self.text(number, row, Subtask, 'title'), status
+
+    def parent(self, number: int, id_map: dict, id) -> int:
+        if id not in id_map:
+            raise BoardImportError(number)
+        return id_map[id]
+
+    def text(self, number: int, row: dict, model, name: str, default=None) -> str:
+        value = row.get(name, default)
+        max_length = model._meta.get_field(name).max_length
+        if not isinstance(value, str) or (max_length and len(value) > max_length):
+            raise BoardImportError(number)
+        return value
+
+    def count_subtasks(self):
+        if not self.counts['subtasks']:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                UPDATE {Task._meta.db_table} t
+                SET total_subtasks = s.total, completed_subtasks = s.completed, subtask_titles = s.titles
+                FROM (
+                    SELECT
+                        s.task_id, count(*) AS total, count(*) FILTER (WHERE s.status) AS completed,
+                        string_agg(s.title, ' ' ORDER BY s.id) AS titles
+                    FROM {Subtask._meta.db_table} s
+                    JOIN {Task._meta.db_table} t ON t.id = s.task_id
+                    JOIN {Column._meta.db_table} c ON c.id = t.column_id
+                    WHERE c.board_id = %s
+                    GROUP BY s.task_id
+                ) s
+                WHERE s.task_id = t.id
+            """, [self.board.id])
@@ -1,9 +1,25 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path("boards/", views.boards, name="board-list"),
+    path("boards/import/", views.import_board, name="board-import"),
     path("boards/<int:id>/", views.board_detail, name="board-detail"),
-    path("items/", views.create_task, name="task-list"),
+    path("boards/<int:id>/changes/", views.board_changes, name="board-changes"),
+    path("boards/<int:id>/columns/<int:column_id>/tasks/", views.column_tasks, name="column-tasks"),
+    path("boards/<int:id>/clone/", views.clone_board, name="board-clone"),
+    path("boards/<int:id>/export/", views.export_board, name="board-export"),
+    path("boards/<int:id>/archive/", views.archived_tasks, name="board-archive"),
+    path("boards/<int:id>/events/", async_views.board_events, name="board-events"),
+    path("items/", views.tasks, name="task-list"),
+    path("items/bulk/", views.bulk_tasks, name="task-bulk"),
+    path("items/search/", views.task_search, name="task-search"),
     path("items/<int:id>/", views.task_detail, name="task-detail"),
+    path("items/<int:id>/move/", views.move_task, name="task-move"),
+    path("archive/<int:id>/", views.archived_task_detail, name="archived-task-detail"),
+    path("archive/<int:id>/restore/", views.restore_archived_task, name="archived-task-restore"),
+    path("batch/", views.batch, name="batch"),
+    path("async/boards/", async_views.boards, name="async-board-list"),
+    path("async/boards/<int:id>/", async_views.board_detail, name="async-board-detail"),
+    path("async/items/<int:id>/", async_views.task_detail, name="async-task-detail"),
 ]
\ No newline at end of file
@@ -1,42 +1,100 @@
-from django.db.models import Prefetch
+import re
+
+from django.db import DataError, IntegrityError, transaction
+from django.db.models import Case, Prefetch, Value, When
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 
-from .models import Board, Column, Task, Subtask
-from .serializers import BoardSerializer, ColumnSerializer, TaskSerializer, SubtaskSerializer
-from .constants import BOARD_NOT_FOUND, BOARD_DELETED, TASK_NOT_FOUND, TASK_DELETED
+from .cache import board_cache, task_cache
+from .changes import changes_since, decode_changes_cursor, requested_change_fields
+from .models import ArchivedTask, Board, Column, Task, Subtask, Tombstone
+from .pagination import ArchivedTaskPagination, ColumnTaskPagination, KeysetPagination
+from .ranking import append_rank, append_ranks, needs_rebalance, rank_between, schedule_rebalance
+from .serializers import (
+    ArchivedTaskSerializer, BatchSerializer, BoardCloneSerializer, BoardSerializer, BoardProgressSerializer, ColumnSerializer, TaskSerializer, TaskBulkSerializer, TaskMoveSerializer,
+    TaskSearchSerializer, TaskSearchResultSerializer, TaskSummarySerializer, SubtaskSerializer
+)
+from .archiving import restore_task
+from .cloning import copy_board
+from .deletion import schedule_purge
+from .events import publish, publish_row_changes
+from .fieldsets import (
+    cache_related, fields_key, fields_variant, loaded_fields, prefetch_documents, requested_fields, sparse_queryset
+)
+from .search import SearchPagination, search_tasks
+from .snapshots import board_snapshot
+from .transfer import BoardImport, BoardImportError, board_lines
+from .constants import (
+    BOARD_NOT_FOUND, BOARD_DELETED, INVALID_IMPORT, COLUMN_NOT_FOUND, TASK_NOT_FOUND, TASK_DELETED, TASK_RANK_CONFLICT,
+    ARCHIVED_TASK_NOT_FOUND,
+    BATCH_INVALID_OPERATION, BATCH_INVALID_REFERENCE, BATCH_OPERATION_FAILED
+)
 
 # Create your views here.
+def boards_changed(*board_ids: int):
+    """
+    Move the boards' version forward and drop their cached documents after
+    a write to any of their columns, tasks or subtasks.
+    """
+    Board.objects.filter(pk__in=board_ids).touch()
+    board_cache.invalidate(*board_ids)
+
+def conditional_get(request, etag: str, last_modified, get_response):
+    """
+    Answer with 304 Not Modified when the client's validators still match,
+    otherwise build the response with `get_response`. Both carry the
+    ETag and Last-Modified headers.
+    """
+    timestamp = int(last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp) or get_response()
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(timestamp)
+    return response
+
 @api_view(['GET', 'POST'])
 def boards(request):    
     if request.method == 'GET':
-        return get_boards()
+        return get_boards(request)
     return create_board(request.data)
 
-def get_boards():
-    boards = Board.objects.all()
-    serializer = BoardSerializer(boards, many=True, fields=('id', 'name'))
-    return Response(serializer.data)
+def get_boards(request):
+    fields = requested_fields(request.query_params, BoardSerializer) or dict.fromkeys(('id', 'name'))
+    paginator = KeysetPagination()
+    # last_modified is read by the cursors of its ordering.
+    queryset = sparse_queryset(Board.objects.all(), BoardSerializer, fields, required=('last_modified',))
+    boards = paginator.paginate_queryset(queryset, request)
+    prefetch_documents(boards, BoardSerializer, fields)
+    serializer = BoardSerializer(boards, many=True, fields=fields)
+    return paginator.get_paginated_response(serializer.data)
 
 def create_board(data):
     serializer = BoardSerializer(data=data)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    board = serializer.save()    
     columns_data = data.get('columns', [])
-    columns_serializer = ColumnSerializer(data=columns_data, many=True, context={'board': board})
-
+    columns_serializer = ColumnSerializer(data=columns_data, many=True)
     if not columns_serializer.is_valid():
-        board.delete()
         return Response(columns_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    columns_serializer.save()
 
-    board_with_columns = Board.objects.prefetch_related('columns').get(pk=board.id)
-    board_serializer = BoardSerializer(board_with_columns)
+    with transaction.atomic():
+        board = serializer.save()
+        # The columns' parent only exists once the board row is inserted.
+        columns_serializer.context['board'] = board
+        columns = columns_serializer.save()
+
+    # Build the response from the inserted rows instead of re-fetching them.
+    cache_related(board, 'columns', columns)
+    for column in columns:
+        cache_related(column, 'tasks', [])
+    board_serializer = BoardSerializer(board)
 
     return Response(board_serializer.data, status=status.HTTP_201_CREATED)
     
@@ -48,98 +106,467 @@ def board_detail(request, id: int):
         return Response(status=status.HTTP_404_NOT_FOUND, data={'error': BOARD_NOT_FOUND})    
     
     if request.method == 'GET':
-        return get_board(board)
+        # The board version covers every column, task and subtask, so a 304
+        # only needs the board lookup above.
+        if request.query_params.get('view') == 'summary':
+            fields = requested_fields(request.query_params, BoardProgressSerializer)
+            variant = fields_variant(f'summary-{request.accepted_renderer.format}', fields)
+            get_response = lambda: get_board_summary(board, fields)
+        else:
+            fields = requested_fields(request.query_params, BoardSerializer)
+            # The snapshot is the full document; a selection is served by the serializers.
+            if fields is None and request.query_params.get('snapshot') in ('1', 'true'):
+                variant, get_response = 'snapshot', lambda: get_board_snapshot(board.id)
+            else:
+                variant = fields_variant(request.accepted_renderer.format, fields)
+                get_response = lambda: get_board(board, fields)
+        etag = quote_etag(f'board-{board.id}-{board.version}-{variant}')
+        return conditional_get(request, etag, board.last_modified, get_response)
     if request.method == 'PATCH':
         return update_board(board, request.data)
     return delete_board(board)
 
-def get_board(board: Board):
-    detailed_board = Board.objects.prefetch_related('columns__tasks__subtasks').get(pk=board.id)
-    serializer = BoardSerializer(detailed_board)
+def get_board(board: Board, fields: dict | None = None):
+    def serialize():
+        # Loads only the columns the selected fields read, and a window of
+        # each column's tasks.
+        prefetch_documents([board], BoardSerializer, fields)
+        return BoardSerializer(board, fields=fields).data
+
+    variant = '' if fields is None else fields_key(fields)
+    return Response(board_cache.get_or_set(board.id, board.version, serialize, variant))
+
+def get_board_summary(board: Board, fields: dict | None = None):
+    # Task cards carry subtask counters, so the subtask table is never read.
+    prefetch_documents([board], BoardProgressSerializer, fields)
+    serializer = BoardProgressSerializer(board, fields=fields)
     return Response(serializer.data)
 
+def get_board_snapshot(id: int):
+    # The document is built by PostgreSQL; pass the JSON text through untouched.
+    snapshot = board_snapshot(id)
+    if snapshot is None:
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': BOARD_NOT_FOUND})
+    return HttpResponse(snapshot, content_type='application/json')
+
 def update_board(board: Board, data):
     serializer = BoardSerializer(board, data=data, partial=True)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    serializer.save()
 
     old_columns = Column.objects.filter(board=board.id)
     columns_data = data.get('columns', [])
     columns_serializer = ColumnSerializer(old_columns, data=columns_data, many=True, partial=True, context={'board': board})
-
-    if not columns_serializer.is_valid():        
+    if not columns_serializer.is_valid():
         return Response(columns_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # Nothing is written until the board and its columns are all valid.
+    with transaction.atomic():
+        serializer.save()
+        columns_serializer.save()
+        boards_changed(board.id)
+        publish(board.id, 'board.updated', name=board.name)
+        publish_row_changes(board.id, columns_serializer, 'column', {'name': 'column.renamed'})
     
-    columns_serializer.save()            
-    
-    board_with_columns = Board.objects.prefetch_related('columns').get(pk=board.id)
+    try:
+        board_with_columns = Board.objects.get(pk=board.id)
+    except Board.DoesNotExist:
+        # Deleted by another request in the meantime.
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': BOARD_NOT_FOUND})
+    prefetch_documents([board_with_columns], BoardSerializer)
     board_serializer = BoardSerializer(board_with_columns)
 
     return Response(board_serializer.data, status=status.HTTP_200_OK)
 
 def delete_board(board: Board):
-    board.delete()
+    board_id = board.id
+    with transaction.atomic():
+        # Hides the board with its columns and tasks; the rows are purged
+        # in the background.
+        Board.objects.filter(pk=board_id).update(deleted_at=timezone.now())
+        # Nobody syncs a deleted board.
+        Tombstone.objects.filter(board_id=board_id).delete()
+        schedule_purge(board_id)
+    board_cache.invalidate(board_id)
+    publish(board_id, 'board.deleted')
     return Response(data={'msg': BOARD_DELETED}, status=status.HTTP_204_NO_CONTENT)
 
+@api_view(['GET'])
+def board_changes(request, id: int):
+    try:
+        board = Board.objects.get(pk=id)
+    except Board.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': BOARD_NOT_FOUND})
+
+    since = request.query_params.get('since')
+    fields = requested_change_fields(request.query_params)
+    return Response(changes_since(board, decode_changes_cursor(since) if since else None, fields))
+
+@api_view(['GET'])
+def column_tasks(request, id: int, column_id: int):
+    if not Column.objects.filter(pk=column_id, board_id=id).exists():
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': COLUMN_NOT_FOUND})
+
+    # Pages through the tasks past the window of the board document.
+    fields = requested_fields(request.query_params, TaskSummarySerializer)
+    paginator = ColumnTaskPagination()
+    queryset = sparse_queryset(Task.objects.filter(column_id=column_id), TaskSummarySerializer, fields, required=('rank',))
+    tasks = paginator.paginate_queryset(queryset, request)
+    prefetch_documents(tasks, TaskSummarySerializer, fields)
+    return paginator.get_paginated_response(TaskSummarySerializer(tasks, many=True, fields=fields).data)
+
 @api_view(['POST'])
-def create_task(request):
-    serializer = TaskSerializer(data=request.data)
+def clone_board(request, id: int):
+    serializer = BoardCloneSerializer(data=request.data)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    task = serializer.save()
-    subtasks_data = request.data.get('subtasks', [])
-    subtasks_serializer = SubtaskSerializer(data=subtasks_data, many=True, context={'task': task})
 
+    # A single statement, so it is atomic on its own.
+    copy = copy_board(id, **serializer.validated_data)
+    if copy is None:
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': BOARD_NOT_FOUND})
+    return Response(copy, status=status.HTTP_201_CREATED)
+
+@api_view(['GET'])
+def export_board(request, id: int):
+    if not Board.objects.filter(pk=id).exists():
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': BOARD_NOT_FOUND})
+
+    response = StreamingHttpResponse(board_lines(id), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="board-{id}.ndjson"'
+    return response
+
+@api_view(['POST'])
+def import_board(request):
+    # Read the export line by line instead of parsing the whole body.
+    lines = request.stream or []
+    board_import = BoardImport()
+    try:
+        with transaction.atomic():
+            board = board_import.load(lines)
+    except BoardImportError as error:
+        return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': INVALID_IMPORT, 'line': error.line})
+    except (DataError, IntegrityError):
+        return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': INVALID_IMPORT, 'line': None})
+
+    return Response({'id': board.id, **board_import.counts}, status=status.HTTP_201_CREATED)
+
+@api_view(['POST'])
+def tasks(request):
+    return create_task(request.data)
+
+def create_task(data):
+    serializer = TaskSerializer(data=data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    subtasks_data = data.get('subtasks', [])
+    subtasks_serializer = SubtaskSerializer(data=subtasks_data, many=True)
     if not subtasks_serializer.is_valid():
-        task.delete()
         return Response(subtasks_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    subtasks_serializer.save()
 
-    task_with_subtasks = Task.objects.prefetch_related('subtasks').get(pk=task.id)
-    task_serializer = TaskSerializer(task_with_subtasks)
+    with transaction.atomic():
+        # Counters of a new task follow from the validated subtasks.
+        task = serializer.save(
+            rank=append_rank(serializer.validated_data['column'].id),
+            total_subtasks=len(subtasks_serializer.validated_data),
+            completed_subtasks=sum(item.get('status', False) for item in subtasks_serializer.validated_data),
+            subtask_titles=' '.join(item['title'] for item in subtasks_serializer.validated_data),
+        )
+        # The subtasks' parent only exists once the task row is inserted.
+        subtasks_serializer.context['task'] = task
+        subtasks = subtasks_serializer.save()
+        boards_changed(task.column.board_id)
+        publish(task.column.board_id, 'task.created', task=task.id, column=task.column_id)
+
+    cache_related(task, 'subtasks', subtasks)
+    task_serializer = TaskSerializer(task)
     return Response(data=task_serializer.data, status=status.HTTP_201_CREATED)
 
 @api_view(['GET', 'PATCH', 'DELETE'])
 def task_detail(request, id: int):
+    if request.method == 'GET':
+        fields = requested_fields(request.query_params, TaskSerializer)
+        # Only the columns the response reads, and last_modified for the validators.
+        queryset = Task.objects.only(*loaded_fields(TaskSerializer, fields), 'last_modified')
+    else:
+        queryset = Task.objects.select_related('column')
     try:                
-        task = Task.objects.get(pk=id)
+        task = queryset.get(pk=id)
     except Task.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND, data={'error': TASK_NOT_FOUND})
     
     if request.method == 'GET':
-        return get_task(task)
+        # Every task write saves the task row, so last_modified versions it.
+        variant = fields_variant(request.accepted_renderer.format, fields)
+        etag = quote_etag(f'task-{task.id}-{task_version(task)}-{variant}')
+        return conditional_get(request, etag, task.last_modified, lambda: get_task(task, fields))
     if request.method == 'PATCH':
         return update_task(task, request.data)
     return delete_task(task)
 
-def get_task(task: Task):    
-    serializer = TaskSerializer(task)
-    return Response(serializer.data)
+def task_version(task: Task) -> int:
+    return int(task.last_modified.timestamp() * 1_000_000)
+
+def get_task(task: Task, fields: dict | None = None):
+    def serialize():
+        prefetch_documents([task], TaskSerializer, fields)
+        return TaskSerializer(task, fields=fields).data
+
+    variant = '' if fields is None else fields_key(fields)
+    return Response(task_cache.get_or_set(task.id, task_version(task), serialize, variant))
 
 def update_task(task: Task, data):
+    old_board_id, old_column_id = task.column.board_id, task.column_id
     serializer = TaskSerializer(task, data=data, partial=True)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    serializer.save()
 
     old_subtasks = Subtask.objects.filter(task=task.id)
     subtasks_data = data.get('subtasks', [])
     subtasks_serializer = SubtaskSerializer(old_subtasks, data=subtasks_data, many=True, partial=True, context={'task': task})
-
-    if not subtasks_serializer.is_valid():        
+    if not subtasks_serializer.is_valid():
         return Response(subtasks_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # Nothing is written until the task and its subtasks are all valid.
+    with transaction.atomic():
+        column = serializer.validated_data.get('column')
+        if column is not None and column.id != task.column_id:
+            # Tasks moved through a plain update go to the end of their new column.
+            serializer.save(rank=append_rank(column.id))
+        else:
+            serializer.save()
+        subtasks_serializer.save()
+        # The task may have moved to a column of another board.
+        boards_changed(*{old_board_id, task.column.board_id})
+        publish_task_saved(task, old_board_id, old_column_id)
+        publish_row_changes(task.column.board_id, subtasks_serializer, 'subtask', {'status': 'subtask.toggled'}, task=task.id)
+    task_cache.invalidate(task.id)
     
-    subtasks_serializer.save()            
-    
-    task_with_subtasks = Task.objects.prefetch_related('subtasks').get(pk=task.id)
+    try:
+        task_with_subtasks = Task.objects.prefetch_related('subtasks').get(pk=task.id)
+    except Task.DoesNotExist:
+        # Deleted by another request in the meantime.
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': TASK_NOT_FOUND})
     task_serializer = TaskSerializer(task_with_subtasks)
     return Response(task_serializer.data, status=status.HTTP_200_OK)
 
+def publish_task_saved(task: Task, old_board_id: int, old_column_id: int):
+    if task.column_id == old_column_id:
+        publish(task.column.board_id, 'task.updated', task=task.id, column=task.column_id)
+        return
+    for board_id in {old_board_id, task.column.board_id}:
+        publish(board_id, 'task.moved', task=task.id, column=task.column_id, rank=task.rank)
+
 def delete_task(task: Task):
-    task.delete()
-    return Response(data={'msg': TASK_DELETED}, status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+    task_id, board_id = task.id, task.column.board_id
+    with transaction.atomic():
+        # Purged later by the purge_deleted command.
+        Task.all_objects.filter(pk=task_id).update(deleted_at=timezone.now())
+        boards_changed(board_id)
+        publish(board_id, 'task.deleted', task=task_id)
+    task_cache.invalidate(task_id)
+    return Response(data={'msg': TASK_DELETED}, status=status.HTTP_204_NO_CONTENT)
+
+@api_view(['POST'])
+def move_task(request, id: int):
+    try:
+        task = Task.objects.select_related('column').get(pk=id)
+    except Task.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': TASK_NOT_FOUND})
+
+    serializer = TaskMoveSerializer(data=request.data, context={'task': task})
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    column = serializer.validated_data.get('column', task.column)
+    lower, upper = serializer.neighbor_ranks()
+    if lower is not None and upper is not None and lower >= upper:
+        # Concurrent appends can leave equal ranks behind; spread them out first.
+        schedule_rebalance(column.id)
+        return Response(status=status.HTTP_409_CONFLICT, data={'error': TASK_RANK_CONFLICT})
+
+    rank = rank_between(lower, upper)
+    with transaction.atomic():
+        Task.all_objects.filter(pk=task.id).update(column=column, rank=rank, last_modified=timezone.now())
+        boards_changed(*{task.column.board_id, column.board_id})
+        for board_id in {task.column.board_id, column.board_id}:
+            publish(board_id, 'task.moved', task=task.id, column=column.id, rank=rank)
+        if needs_rebalance(rank):
+            schedule_rebalance(column.id)
+    task_cache.invalidate(task.id)
+
+    return Response({'id': task.id, 'column': column.id}, status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+def bulk_tasks(request):
+    serializer = TaskBulkSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    ids, board_id = serializer.validated_data['ids'], serializer.validated_data['board_id']
+    if serializer.validated_data['op'] == TaskBulkSerializer.DELETE:
+        return delete_tasks(ids, board_id)
+    return move_tasks(ids, board_id, serializer.validated_data['column'])
+
+def move_tasks(ids: list[int], board_id: int, column: Column):
+    with transaction.atomic():
+        # The tasks go to the end of the column in the order they were given.
+        ranks = append_ranks(column.id, len(ids), exclude=ids)
+        Task.all_objects.filter(pk__in=ids).update(
+            column=column,
+            rank=Case(*[When(pk=id, then=Value(rank)) for id, rank in zip(ids, ranks)]),
+            last_modified=timezone.now(),
+        )
+        boards_changed(*{board_id, column.board_id})
+        for changed_board_id in {board_id, column.board_id}:
+            publish(changed_board_id, 'tasks.moved', tasks=ids, column=column.id)
+        if needs_rebalance(ranks[-1]):
+            schedule_rebalance(column.id)
+    task_cache.invalidate(*ids)
+
+    return Response({'op': TaskBulkSerializer.MOVE, 'column': column.id, 'ids': ids}, status=status.HTTP_200_OK)
+
+def delete_tasks(ids: list[int], board_id: int):
+    with transaction.atomic():
+        Task.all_objects.filter(pk__in=ids).update(deleted_at=timezone.now())
+        boards_changed(board_id)
+        publish(board_id, 'tasks.deleted', tasks=ids)
+    task_cache.invalidate(*ids)
+
+    return Response({'op': TaskBulkSerializer.DELETE, 'ids': ids}, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def archived_tasks(request, id: int):
+    if not Board.objects.filter(pk=id).exists():
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': BOARD_NOT_FOUND})
+
+    fields = requested_fields(request.query_params, ArchivedTaskSerializer)
+    paginator = ArchivedTaskPagination()
+    # The board was found live, so its archive needs no checks of its own.
+    queryset = sparse_queryset(
+        ArchivedTask.all_objects.filter(column__board_id=id), ArchivedTaskSerializer, fields, required=('archived_at',)
+    )
+    tasks = paginator.paginate_queryset(queryset, request)
+    prefetch_documents(tasks, ArchivedTaskSerializer, fields)
+    return paginator.get_paginated_response(ArchivedTaskSerializer(tasks, many=True, fields=fields).data)
+
+@api_view(['GET'])
+def archived_task_detail(request, id: int):
+    fields = requested_fields(request.query_params, ArchivedTaskSerializer)
+    try:
+        task = sparse_queryset(ArchivedTask.objects, ArchivedTaskSerializer, fields).get(pk=id)
+    except ArchivedTask.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': ARCHIVED_TASK_NOT_FOUND})
+
+    prefetch_documents([task], ArchivedTaskSerializer, fields)
+    return Response(ArchivedTaskSerializer(task, fields=fields).data)
+
+@api_view(['POST'])
+def restore_archived_task(request, id: int):
+    try:
+        archived = ArchivedTask.objects.select_related('column').get(pk=id)
+    except ArchivedTask.DoesNotExist:
+        return Response(status=status.HTTP_404_NOT_FOUND, data={'error': ARCHIVED_TASK_NOT_FOUND})
+
+    board_id = archived.column.board_id
+    with transaction.atomic():
+        if not restore_task(archived):
+            # Restored by a concurrent request.
+            return Response(status=status.HTTP_404_NOT_FOUND, data={'error': ARCHIVED_TASK_NOT_FOUND})
+        boards_changed(board_id)
+        publish(board_id, 'task.restored', task=id, column=archived.column_id)
+    task_cache.invalidate(id)
+
+    task = Task.objects.prefetch_related('subtasks').get(pk=id)
+    return Response(TaskSerializer(task).data, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+def task_search(request):
+    serializer = TaskSearchSerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    fields = requested_fields(request.query_params, TaskSearchResultSerializer)
+    queryset = search_tasks(
+        serializer.validated_data['q'],
+        board_id=serializer.validated_data.get('board'),
+        column_id=serializer.validated_data.get('column'),
+    )
+    paginator = SearchPagination()
+    results = paginator.paginate_queryset(sparse_queryset(queryset, TaskSearchResultSerializer, fields), request)
+    return paginator.get_paginated_response(TaskSearchResultSerializer(results, many=True, fields=fields).data)
+
+# `$<index>.<key>[.<key>...]`, see BatchSerializer.
+BATCH_REFERENCE = re.compile(r'\$(\d+)((?:\.\w+)+)')
+
+@api_view(['POST'])
+def batch(request):
+    serializer = BatchSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    results = []
+    with transaction.atomic():
+        for index, operation in enumerate(serializer.validated_data['operations']):
+            response = run_batch_operation(operation, results)
+            if response.status_code >= 400:
+                # Undo the operations that already succeeded as well.
+                transaction.set_rollback(True)
+                return Response(
+                    status=response.status_code,
+                    data={'error': BATCH_OPERATION_FAILED, 'index': index, 'detail': response.data},
+                )
+            results.append({'status': response.status_code, 'data': response.data})
+
+    return Response({'results': results}, status=status.HTTP_200_OK)
+
+def run_batch_operation(operation, results: list):
+    try:
+        path = BATCH_REFERENCE.sub(lambda match: str(referenced_value(match, results)), operation['path'])
+        data = resolve_references(operation['body'], results)
+    except (LookupError, TypeError, ValueError):
+        return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': BATCH_INVALID_REFERENCE})
+
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': BATCH_INVALID_OPERATION})
+
+    method = operation['method']
+    if match.func is boards and method == 'POST':
+        return create_board(data)
+    if match.func is tasks and method == 'POST':
+        return create_task(data)
+    if match.func is board_detail and method in ('PATCH', 'DELETE'):
+        try:
+            board = Board.objects.get(pk=match.kwargs['id'])
+        except Board.DoesNotExist:
+            return Response(status=status.HTTP_404_NOT_FOUND, data={'error': BOARD_NOT_FOUND})
+        return update_board(board, data) if method == 'PATCH' else delete_board(board)
+    if match.func is task_detail and method in ('PATCH', 'DELETE'):
+        try:
+            task = Task.objects.select_related('column').get(pk=match.kwargs['id'])
+        except Task.DoesNotExist:
+            return Response(status=status.HTTP_404_NOT_FOUND, data={'error': TASK_NOT_FOUND})
+        return update_task(task, data) if method == 'PATCH' else delete_task(task)
+    return Response(status=status.HTTP_400_BAD_REQUEST, data={'error': BATCH_INVALID_OPERATION})
+
+def referenced_value(match, results: list):
+    index = int(match[1])
+    if index >= len(results):
+        raise IndexError(index)
+    value = results[index]['data']
+    for key in match[2].split('.')[1:]:
+        value = value[int(key)] if isinstance(value, list) else value[key]
+    return value
+
+def resolve_references(value, results: list):
+    if isinstance(value, str):
+        match = BATCH_REFERENCE.fullmatch(value)
+        return referenced_value(match, results) if match else value
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    return value